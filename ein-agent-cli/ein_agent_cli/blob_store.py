@@ -0,0 +1,128 @@
+"""Content-addressed blob store for claim-check payloads.
+
+Large workflow arguments (the alert list) are written to the blob store and only
+their SHA-256 reference is sent to Temporal.
+
+Keep in sync with ein_agent_worker/blob_store.py - the CLI and the workers must use
+the same store.
+"""
+
+import asyncio
+import hashlib
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from ein_agent_cli.models import ClaimCheckConfig
+
+
+def blob_key(data: bytes) -> str:
+    """Content address of a blob."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore(ABC):
+    """Content-addressed blob storage."""
+
+    @abstractmethod
+    def _put(self, key: str, data: bytes) -> None:
+        """Store a blob under its key (blocking)."""
+
+    @abstractmethod
+    def _get(self, key: str) -> bytes:
+        """Read a blob by key (blocking)."""
+
+    async def put(self, data: bytes) -> str:
+        """Store a blob and return its key."""
+        key = blob_key(data)
+        await asyncio.to_thread(self._put, key, data)
+        return key
+
+    async def get(self, key: str) -> bytes:
+        """Read a blob and verify its content address.
+
+        Raises:
+            ValueError: If the stored content does not match the key
+        """
+        data = await asyncio.to_thread(self._get, key)
+        if blob_key(data) != key:
+            raise ValueError(f"Blob {key} is corrupted (content hash mismatch)")
+        return data
+
+
+class FilesystemBlobStore(BlobStore):
+    """Blob store on a local or shared (e.g. NFS, PVC) filesystem."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _blob_path(self, key: str) -> str:
+        # Fan out into sub-directories to keep directory listings small
+        return os.path.join(self.path, key[:2], key)
+
+    def _put(self, key: str, data: bytes) -> None:
+        path = self._blob_path(key)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so readers never see a partial blob. Each write
+        # gets its own file: concurrent writes of the same key all end with the same content.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if os.path.exists(path):
+                # Another writer stored the same content
+                return
+            raise
+
+    def _get(self, key: str) -> bytes:
+        with open(self._blob_path(key), "rb") as f:
+            return f.read()
+
+
+class S3BlobStore(BlobStore):
+    """Blob store in an S3-compatible bucket."""
+
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None, prefix: str = "ein-agent/"):
+        try:
+            import boto3
+        except ImportError as e:
+            raise RuntimeError("The s3 claim-check backend requires the boto3 package") from e
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    def _put(self, key: str, data: bytes) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=f"{self.prefix}{key}", Body=data)
+
+    def _get(self, key: str) -> bytes:
+        response = self.client.get_object(Bucket=self.bucket, Key=f"{self.prefix}{key}")
+        return response["Body"].read()
+
+
+def create_blob_store(config: ClaimCheckConfig) -> Optional[BlobStore]:
+    """Create the blob store from claim-check configuration.
+
+    Args:
+        config: Claim-check configuration
+
+    Returns:
+        BlobStore instance, or None if claim-check is disabled
+
+    Raises:
+        ValueError: If the s3 backend is selected without a bucket
+    """
+    if config.backend == "filesystem":
+        return FilesystemBlobStore(config.path)
+    if config.backend == "s3":
+        if not config.s3_bucket:
+            raise ValueError("TEMPORAL_CLAIM_CHECK_S3_BUCKET is required for the s3 claim-check backend")
+        return S3BlobStore(config.s3_bucket, endpoint_url=config.s3_endpoint, prefix=config.s3_prefix)
+    return None
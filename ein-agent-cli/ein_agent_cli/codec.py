@@ -0,0 +1,177 @@
+"""Payload codecs for Temporal payloads.
+
+Keep in sync with ein_agent_worker/codec.py - both sides must agree on encodings.
+Compressed payloads are always decoded, so the CLI can read compressed workflow
+results even when compression is disabled locally.
+"""
+
+import time
+import zlib
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import PayloadCodec
+
+from ein_agent_cli.blob_store import BlobStore, create_blob_store
+from ein_agent_cli.models import TemporalConfig
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ENCODING_ZLIB = b"binary/zlib"
+ENCODING_ZSTD = b"binary/zstd"
+ENCODING_CLAIM_CHECK = b"claim-check/sha256"
+
+DEFAULT_MIN_BYTES = 4096
+
+
+@dataclass
+class CodecStats:
+    """Cumulative compression statistics."""
+
+    compressed: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    encode_seconds: float = 0.0
+    decoded: int = 0
+    decode_seconds: float = 0.0
+
+    @property
+    def ratio(self) -> float:
+        """Compression ratio (original size / compressed size)."""
+        return self.bytes_in / self.bytes_out if self.bytes_out else 1.0
+
+    def summary(self) -> str:
+        """Human readable summary of the statistics."""
+        return (
+            f"{self.compressed} payload(s) compressed {self.bytes_in} -> {self.bytes_out} bytes "
+            f"({self.ratio:.1f}x) in {self.encode_seconds * 1000:.1f} ms, "
+            f"{self.decoded} decompressed in {self.decode_seconds * 1000:.1f} ms"
+        )
+
+
+class CompressionCodec(PayloadCodec):
+    """Payload codec compressing payloads above a size threshold."""
+
+    def __init__(self, algorithm: str = "zlib", min_bytes: int = DEFAULT_MIN_BYTES):
+        """Initialize the codec.
+
+        Args:
+            algorithm: 'zlib', 'zstd' or 'none' (decode only). 'zstd' falls back to
+                zlib when the optional zstandard package is not installed.
+            min_bytes: Payloads smaller than this are left uncompressed
+        """
+        if algorithm == "zstd" and zstandard is None:
+            algorithm = "zlib"
+        self.algorithm = algorithm
+        self.min_bytes = min_bytes
+        self.stats = CodecStats()
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        return [self._encode_one(p) for p in payloads]
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        return [self._decode_one(p) for p in payloads]
+
+    def _encode_one(self, payload: Payload) -> Payload:
+        if self.algorithm == "none" or payload.ByteSize() < self.min_bytes:
+            return payload
+
+        start = time.perf_counter()
+        raw = payload.SerializeToString()
+        if self.algorithm == "zstd":
+            encoding, data = ENCODING_ZSTD, zstandard.ZstdCompressor().compress(raw)
+        else:
+            encoding, data = ENCODING_ZLIB, zlib.compress(raw)
+        elapsed = time.perf_counter() - start
+
+        if len(data) >= len(raw):
+            return payload
+
+        self.stats.compressed += 1
+        self.stats.bytes_in += len(raw)
+        self.stats.bytes_out += len(data)
+        self.stats.encode_seconds += elapsed
+        return Payload(metadata={"encoding": encoding}, data=data)
+
+    def _decode_one(self, payload: Payload) -> Payload:
+        encoding = payload.metadata.get("encoding")
+        if encoding not in (ENCODING_ZLIB, ENCODING_ZSTD):
+            return payload
+
+        start = time.perf_counter()
+        if encoding == ENCODING_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("Received a zstd compressed payload but zstandard is not installed")
+            raw = zstandard.ZstdDecompressor().decompress(payload.data)
+        else:
+            raw = zlib.decompress(payload.data)
+        self.stats.decoded += 1
+        self.stats.decode_seconds += time.perf_counter() - start
+        return Payload.FromString(raw)
+
+
+class ClaimCheckCodec(PayloadCodec):
+    """Payload codec offloading large payloads to a content-addressed blob store.
+
+    Payloads are first encoded by the inner codec (compression), so the size
+    threshold applies to the compressed payload.
+    """
+
+    def __init__(self, store: Optional[BlobStore], min_bytes: int, inner: Optional[PayloadCodec] = None):
+        """Initialize the codec.
+
+        Args:
+            store: Blob store, or None to only resolve references (decode only)
+            min_bytes: Payloads smaller than this stay inline in history
+            inner: Codec applied before offloading and after resolving
+        """
+        self.store = store
+        self.min_bytes = min_bytes
+        self.inner = inner
+        self.offloaded = 0
+        self.offloaded_bytes = 0
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        if self.inner:
+            payloads = await self.inner.encode(payloads)
+        return [await self._encode_one(p) for p in payloads]
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        resolved = [await self._decode_one(p) for p in payloads]
+        if self.inner:
+            resolved = await self.inner.decode(resolved)
+        return resolved
+
+    async def _encode_one(self, payload: Payload) -> Payload:
+        if self.store is None or payload.ByteSize() < self.min_bytes:
+            return payload
+        data = payload.SerializeToString()
+        key = await self.store.put(data)
+        self.offloaded += 1
+        self.offloaded_bytes += len(data)
+        return Payload(metadata={"encoding": ENCODING_CLAIM_CHECK}, data=key.encode())
+
+    async def _decode_one(self, payload: Payload) -> Payload:
+        if payload.metadata.get("encoding") != ENCODING_CLAIM_CHECK:
+            return payload
+        if self.store is None:
+            raise RuntimeError("Received a claim-check payload but no blob store is configured")
+        return Payload.FromString(await self.store.get(payload.data.decode()))
+
+
+def build_payload_codec(config: TemporalConfig) -> ClaimCheckCodec:
+    """Build the payload codec (compression, then claim-check) for the CLI's Temporal client.
+
+    Args:
+        config: Temporal configuration
+
+    Returns:
+        ClaimCheckCodec wrapping a CompressionCodec
+    """
+    compression = CompressionCodec(config.payload_compression, min_bytes=config.payload_compression_min_bytes)
+    store = create_blob_store(config.claim_check)
+    return ClaimCheckCodec(store, min_bytes=config.claim_check.min_bytes, inner=compression)
@@ -1,13 +1,14 @@
-"""Ein Agent CLI commands - entrypoint."""
+"""Ein Agent CLI commands - entrypoint.
+
+Each command imports its models and the orchestrator when it runs, so --help
+and shell completion load typer only, not Pydantic, the Alertmanager client or
+the Temporal SDK (see scripts/benchmark_startup.py).
+"""
 
-import asyncio
 from typing import List, Optional
 
 import typer
 
-from ein_agent_cli import orchestrator
-from ein_agent_cli.models import WorkflowConfig
-
 app = typer.Typer(help="Ein Agent CLI - Incident investigation and correlation")
 
 
@@ -51,6 +52,38 @@ def run_incident_workflow(
         "--workflow-id",
         help="Custom workflow ID",
     ),
+    add_to: Optional[str] = typer.Option(
+        None,
+        "--add-to",
+        help="Add the alerts to a running incident workflow instead of starting a new one",
+    ),
+    cluster: Optional[str] = typer.Option(
+        None,
+        "--cluster",
+        help="Cluster name recorded on the workflow (default: $EIN_AGENT_CLUSTER or the alerts' cluster label)",
+    ),
+    cluster_queues: Optional[List[str]] = typer.Option(
+        None,
+        "--cluster-queue",
+        "-Q",
+        help="Run the RCAs of alerts whose routing label has VALUE on QUEUE (VALUE=QUEUE, default: $TEMPORAL_CLUSTER_QUEUES)",
+    ),
+    routing_label: Optional[str] = typer.Option(
+        None,
+        "--routing-label",
+        help="Alert label matched by --cluster-queue (default: $TEMPORAL_ROUTING_LABEL or cluster)",
+    ),
+    group_by: Optional[str] = typer.Option(
+        None,
+        "--group-by",
+        "-g",
+        help="Start one incident workflow per value of this alert label (e.g. cluster)",
+    ),
+    concurrency: int = typer.Option(
+        10,
+        "--concurrency",
+        help="Maximum number of workflows started concurrently with --group-by",
+    ),
     status: str = typer.Option(
         "firing",
         "--status",
@@ -78,6 +111,18 @@ def run_incident_workflow(
         "-y",
         help="Skip confirmation prompt and trigger workflow automatically",
     ),
+    follow: bool = typer.Option(
+        False,
+        "--follow",
+        "-f",
+        help="Stream per-alert RCAs and the final report after triggering the workflow",
+    ),
+    output: str = typer.Option(
+        "table",
+        "--output",
+        "-o",
+        help="Output format: table, or json/ndjson records streamed to stdout (messages go to stderr)",
+    ),
 ):
     """Query Alertmanager and trigger incident correlation workflow.
 
@@ -116,22 +161,428 @@ def run_incident_workflow(
 
       # Skip confirmation prompt and trigger automatically
       ein-agent-cli run-incident-workflow -y
+
+      # Trigger and stream per-alert RCAs as they complete
+      ein-agent-cli run-incident-workflow -y --follow
+
+      # Add newly fired alerts to a running incident
+      ein-agent-cli run-incident-workflow --add-to incident-correlation-20250101-120000
+
+      # Investigate each alert on the worker pool of its cluster
+      ein-agent-cli run-incident-workflow -Q prod=ein-agent-prod -Q staging=ein-agent-staging
+
+      # One incident per cluster, started over a single Temporal connection
+      ein-agent-cli run-incident-workflow -y --group-by cluster
+
+      # Stream the filtered alerts as JSON lines, without a table
+      ein-agent-cli run-incident-workflow --dry-run -o ndjson | jq -r .fingerprint
     """
+    import asyncio
+
+    from rich.markup import escape
+
+    from ein_agent_cli import console, orchestrator
+    from ein_agent_cli.models import WorkflowConfig
+
     # Create workflow configuration from CLI arguments
-    config = WorkflowConfig.from_cli_args(
-        alertmanager_url=alertmanager_url,
-        include=include,
-        mcp_servers=mcp_servers,
+    try:
+        config = WorkflowConfig.from_cli_args(
+            alertmanager_url=alertmanager_url,
+            include=include,
+            mcp_servers=mcp_servers,
+            temporal_host=temporal_host,
+            temporal_namespace=temporal_namespace,
+            temporal_queue=temporal_queue,
+            workflow_id=workflow_id,
+            add_to_workflow=add_to,
+            status=status,
+            blacklist=blacklist,
+            dry_run=dry_run,
+            show_labels=show_labels,
+            no_prompt=no_prompt,
+            follow=follow,
+            cluster=cluster,
+            cluster_queues=cluster_queues,
+            routing_label=routing_label,
+            group_by=group_by,
+            concurrency=concurrency,
+            output=output,
+        )
+    except ValueError as e:
+        console.print_error(f"✗ Invalid configuration: {escape(str(e))}")
+        raise typer.Exit(1)
+
+    # Run orchestrator with validated configuration
+    asyncio.run(orchestrator.run_incident_workflow(config))
+
+
+@app.command()
+def watch_incident(
+    workflow_id: str = typer.Argument(
+        ...,
+        help="ID of the running incident workflow",
+    ),
+    alertmanager_url: str = typer.Option(
+        "http://localhost:9093",
+        "--alertmanager-url",
+        "-a",
+        help="Alertmanager URL",
+    ),
+    include: Optional[List[str]] = typer.Option(
+        None,
+        "--include",
+        "-i",
+        help="Alert names or fingerprints of newly firing alerts to add (whitelist)",
+    ),
+    blacklist: Optional[List[str]] = typer.Option(
+        None,
+        "--blacklist",
+        "-b",
+        help="Alert names to never add (default: Watchdog). Use --blacklist '' to disable",
+    ),
+    temporal_host: str = typer.Option(
+        None,
+        "--temporal-host",
+        help="Temporal server host:port",
+    ),
+    temporal_namespace: str = typer.Option(
+        None,
+        "--temporal-namespace",
+        help="Temporal namespace",
+    ),
+    interval: int = typer.Option(
+        30,
+        "--interval",
+        help="Seconds between Alertmanager polls",
+    ),
+    resolve_after: int = typer.Option(
+        2,
+        "--resolve-after",
+        help="Resolve an alert after it is missing from this many consecutive polls",
+    ),
+    add_new: bool = typer.Option(
+        True,
+        "--add-new/--no-add-new",
+        help="Add newly firing alerts to the incident",
+    ),
+):
+    """Keep a running incident workflow in sync with Alertmanager.
+
+    Alerts that resolve are signalled to the workflow, which cancels their
+    in-flight investigations and leaves them out of the correlation as transient.
+    An alert counts as resolved once it is missing from --resolve-after consecutive
+    polls, and an empty poll never resolves anything, so an Alertmanager restart or
+    an unsynced HA peer does not cancel the whole incident.
+    Newly firing alerts are added to the incident. Stops when the workflow completes.
+
+    Examples:
+
+      # Watch an incident started by run-incident-workflow
+      ein-agent-cli watch-incident incident-correlation-20250101-120000
+
+      # Only cancel resolved alerts, never add new ones
+      ein-agent-cli watch-incident incident-correlation-20250101-120000 --no-add-new
+    """
+    import asyncio
+
+    from rich.markup import escape
+
+    from ein_agent_cli import console, orchestrator
+    from ein_agent_cli.models import WatchConfig
+
+    try:
+        config = WatchConfig.from_cli_args(
+            workflow_id=workflow_id,
+            alertmanager_url=alertmanager_url,
+            include=include,
+            blacklist=blacklist,
+            temporal_host=temporal_host,
+            temporal_namespace=temporal_namespace,
+            interval=interval,
+            add_new=add_new,
+            resolve_after=resolve_after,
+        )
+    except ValueError as e:
+        console.print_error(f"✗ Invalid configuration: {escape(str(e))}")
+        raise typer.Exit(1)
+
+    asyncio.run(orchestrator.run_incident_watch(config))
+
+
+@app.command()
+def follow(
+    workflow_id: str = typer.Argument(
+        ...,
+        help="ID of the incident workflow",
+    ),
+    temporal_host: str = typer.Option(
+        None,
+        "--temporal-host",
+        help="Temporal server host:port",
+    ),
+    temporal_namespace: str = typer.Option(
+        None,
+        "--temporal-namespace",
+        help="Temporal namespace",
+    ),
+    interval: float = typer.Option(
+        5.0,
+        "--interval",
+        help="Seconds between progress queries",
+    ),
+    show_reports: bool = typer.Option(
+        False,
+        "--show-reports",
+        help="Print full RCA reports instead of one-line summaries",
+    ),
+    output: str = typer.Option(
+        "table",
+        "--output",
+        "-o",
+        help="Output format: table, or json/ndjson records streamed to stdout (messages go to stderr)",
+    ),
+):
+    """Stream the progress of an incident workflow until it completes.
+
+    Prints the current phase and alert statuses, each RCA as soon as it completes,
+    the token usage so far, and finally the correlation report.
+
+    Examples:
+
+      ein-agent-cli follow incident-correlation-20250101-120000
+
+      # Full RCA reports
+      ein-agent-cli follow incident-correlation-20250101-120000 --show-reports
+
+      # RCA results as JSON lines, as they complete
+      ein-agent-cli follow incident-correlation-20250101-120000 -o ndjson
+    """
+    import asyncio
+
+    from rich.markup import escape
+
+    from ein_agent_cli import console, orchestrator
+    from ein_agent_cli.models import FollowConfig, TemporalConfig
+
+    try:
+        temporal_config = TemporalConfig()
+        if temporal_host is not None:
+            temporal_config.host = temporal_host
+        if temporal_namespace is not None:
+            temporal_config.namespace = temporal_namespace
+
+        config = FollowConfig(
+            workflow_id=workflow_id,
+            interval=interval,
+            show_reports=show_reports,
+            output=output,
+            temporal=temporal_config,
+        )
+    except ValueError as e:
+        console.print_error(f"✗ Invalid configuration: {escape(str(e))}")
+        raise typer.Exit(1)
+
+    asyncio.run(orchestrator.run_incident_follow(config))
+
+
+@app.command("list")
+def list_incidents(
+    alertname: Optional[List[str]] = typer.Option(
+        None,
+        "--alertname",
+        "-n",
+        help="Only incidents with any of these alert names",
+    ),
+    fingerprint: Optional[List[str]] = typer.Option(
+        None,
+        "--fingerprint",
+        help="Only incidents with any of these alert fingerprints",
+    ),
+    severity: Optional[List[str]] = typer.Option(
+        None,
+        "--severity",
+        help="Only incidents whose most severe alert has any of these severities",
+    ),
+    cluster: Optional[str] = typer.Option(
+        None,
+        "--cluster",
+        help="Only incidents of this cluster",
+    ),
+    status: Optional[str] = typer.Option(
+        None,
+        "--status",
+        help="Only workflows with this status (running/completed/failed/canceled/terminated/timed_out)",
+    ),
+    since: Optional[float] = typer.Option(
+        None,
+        "--since",
+        help="Only incidents started in the last N hours",
+    ),
+    query: Optional[str] = typer.Option(
+        None,
+        "--query",
+        "-q",
+        help="Additional Temporal visibility query, AND-ed with the filters",
+    ),
+    limit: int = typer.Option(
+        100,
+        "--limit",
+        "-l",
+        help="Maximum number of incidents to list",
+    ),
+    page_size: int = typer.Option(
+        1000,
+        "--page-size",
+        help="Visibility page size",
+    ),
+    temporal_host: str = typer.Option(
+        None,
+        "--temporal-host",
+        help="Temporal server host:port",
+    ),
+    temporal_namespace: str = typer.Option(
+        None,
+        "--temporal-namespace",
+        help="Temporal namespace",
+    ),
+):
+    """List incident workflows by alert name, fingerprint, severity and cluster.
+
+    Reads the incidents' search attributes from Temporal visibility, page by page,
+    without fetching workflow histories.
+
+    Examples:
+
+      # Last 100 incidents
+      ein-agent-cli list
+
+      # Critical KubePodNotReady incidents of the last day in one cluster
+      ein-agent-cli list -n KubePodNotReady --severity critical --cluster prod --since 24
+
+      # Any visibility query
+      ein-agent-cli list -q "EinIncidentCount > 1"
+    """
+    import asyncio
+
+    from ein_agent_cli import orchestrator
+    from ein_agent_cli.models import IncidentQueryConfig
+
+    config = IncidentQueryConfig.from_cli_args(
+        alertnames=alertname,
+        fingerprints=fingerprint,
+        severities=severity,
+        cluster=cluster,
+        status=status,
+        since_hours=since,
+        query=query,
+        limit=limit,
+        page_size=page_size,
         temporal_host=temporal_host,
         temporal_namespace=temporal_namespace,
-        temporal_queue=temporal_queue,
-        workflow_id=workflow_id,
-        status=status,
-        blacklist=blacklist,
-        dry_run=dry_run,
-        show_labels=show_labels,
-        no_prompt=no_prompt,
     )
 
-    # Run orchestrator with validated configuration
-    asyncio.run(orchestrator.run_incident_workflow(config))
+    asyncio.run(orchestrator.run_incident_list(config))
+
+
+@app.command()
+def results(
+    workflow_ids: Optional[List[str]] = typer.Argument(
+        None,
+        help="Incident workflow IDs (default: completed incidents matching the filters)",
+    ),
+    alertname: Optional[List[str]] = typer.Option(
+        None,
+        "--alertname",
+        "-n",
+        help="Only incidents with any of these alert names",
+    ),
+    fingerprint: Optional[List[str]] = typer.Option(
+        None,
+        "--fingerprint",
+        help="Only incidents with any of these alert fingerprints",
+    ),
+    severity: Optional[List[str]] = typer.Option(
+        None,
+        "--severity",
+        help="Only incidents whose most severe alert has any of these severities",
+    ),
+    cluster: Optional[str] = typer.Option(
+        None,
+        "--cluster",
+        help="Only incidents of this cluster",
+    ),
+    since: Optional[float] = typer.Option(
+        None,
+        "--since",
+        help="Only incidents started in the last N hours",
+    ),
+    query: Optional[str] = typer.Option(
+        None,
+        "--query",
+        "-q",
+        help="Additional Temporal visibility query, AND-ed with the filters",
+    ),
+    limit: int = typer.Option(
+        20,
+        "--limit",
+        "-l",
+        help="Maximum number of incidents",
+    ),
+    concurrency: int = typer.Option(
+        20,
+        "--concurrency",
+        help="Maximum number of results fetched concurrently",
+    ),
+    show_reports: bool = typer.Option(
+        False,
+        "--show-reports",
+        help="Print full correlation reports instead of summaries",
+    ),
+    temporal_host: str = typer.Option(
+        None,
+        "--temporal-host",
+        help="Temporal server host:port",
+    ),
+    temporal_namespace: str = typer.Option(
+        None,
+        "--temporal-namespace",
+        help="Temporal namespace",
+    ),
+):
+    """Print the correlation reports of incident workflows.
+
+    Results are fetched concurrently. Running incidents given by ID are waited for.
+
+    Examples:
+
+      ein-agent-cli results incident-correlation-20250101-120000
+
+      # Reports of the last day's completed incidents involving an alert
+      ein-agent-cli results -n KubePodNotReady --since 24 --limit 50
+    """
+    import asyncio
+
+    from ein_agent_cli import orchestrator
+    from ein_agent_cli.models import IncidentQueryConfig, IncidentResultsConfig
+
+    selection = IncidentQueryConfig.from_cli_args(
+        alertnames=alertname,
+        fingerprints=fingerprint,
+        severities=severity,
+        cluster=cluster,
+        status="completed",
+        since_hours=since,
+        query=query,
+        limit=limit,
+        page_size=min(limit, 1000),
+        temporal_host=temporal_host,
+        temporal_namespace=temporal_namespace,
+    )
+    config = IncidentResultsConfig(
+        workflow_ids=workflow_ids or [],
+        selection=selection,
+        concurrency=concurrency,
+        show_reports=show_reports,
+    )
+
+    asyncio.run(orchestrator.run_incident_results(config))
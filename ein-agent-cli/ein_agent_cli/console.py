@@ -1,10 +1,68 @@
-"""Console output utilities with color formatting."""
+"""Console output utilities with color formatting.
 
-from typing import Optional
+Besides the default human-readable `table` output, commands can stream
+machine-readable records to stdout with `json` (one JSON array, written as
+records are produced) or `ndjson` (one JSON object per line). In those formats the
+human-readable messages go to stderr, so stdout can be piped into other tools.
+"""
+
+import json
+import sys
+from typing import Any, Optional
 from rich.console import Console
 
 # Global console instance
 _console = Console()
+_output_format = "table"
+_records_emitted = 0
+
+
+def set_output_format(output_format: str) -> None:
+    """Select the output format of the command.
+
+    Args:
+        output_format: 'table', 'json' or 'ndjson'
+    """
+    global _console, _output_format, _records_emitted
+    _output_format = output_format
+    _records_emitted = 0
+    _console = Console(stderr=output_format != "table")
+
+
+def is_machine_output() -> bool:
+    """Whether stdout carries json/ndjson records instead of messages."""
+    return _output_format != "table"
+
+
+def emit(record_type: str, **fields: Any) -> None:
+    """Write a record to stdout as soon as it is produced, in json/ndjson output.
+
+    Does nothing in table output.
+
+    Args:
+        record_type: Kind of record, stored under the "type" key
+        **fields: Fields of the record
+    """
+    global _records_emitted
+    if _output_format == "table":
+        return
+    line = json.dumps({"type": record_type, **fields}, default=str)
+    if _output_format == "json":
+        line = ("[\n" if _records_emitted == 0 else ",\n") + line
+    else:
+        line += "\n"
+    sys.stdout.write(line)
+    sys.stdout.flush()
+    _records_emitted += 1
+
+
+def end_output() -> None:
+    """Close the record stream, i.e. the JSON array of json output."""
+    global _records_emitted
+    if _output_format == "json":
+        sys.stdout.write("[]\n" if _records_emitted == 0 else "\n]\n")
+        sys.stdout.flush()
+    _records_emitted = 0
 
 
 def print_message(message: str, color: Optional[str] = None, style: Optional[str] = None) -> None:
@@ -124,6 +124,64 @@ class WorkflowAlert(BaseModel):
 
 # Configuration models
 
+class ClaimCheckConfig(BaseModel):
+    """Claim-check blob store configuration (must match the workers)."""
+
+    backend: str = Field(
+        default_factory=lambda: os.getenv("TEMPORAL_CLAIM_CHECK_BACKEND", "none"),
+        description="Blob store backend (none/filesystem/s3)"
+    )
+    min_bytes: int = Field(
+        default_factory=lambda: int(os.getenv("TEMPORAL_CLAIM_CHECK_MIN_BYTES", "65536")),
+        description="Only offload payloads larger than this many bytes",
+        ge=0
+    )
+    path: str = Field(
+        default_factory=lambda: os.getenv("TEMPORAL_CLAIM_CHECK_PATH", "/tmp/ein-agent-blobs"),
+        description="Directory of the filesystem blob store"
+    )
+    s3_bucket: Optional[str] = Field(
+        default_factory=lambda: os.getenv("TEMPORAL_CLAIM_CHECK_S3_BUCKET"),
+        description="Bucket of the S3 blob store"
+    )
+    s3_endpoint: Optional[str] = Field(
+        default_factory=lambda: os.getenv("TEMPORAL_CLAIM_CHECK_S3_ENDPOINT"),
+        description="Endpoint URL of an S3-compatible service"
+    )
+    s3_prefix: str = Field(
+        default_factory=lambda: os.getenv("TEMPORAL_CLAIM_CHECK_S3_PREFIX", "ein-agent/"),
+        description="Key prefix in the bucket"
+    )
+
+    @field_validator('backend')
+    @classmethod
+    def validate_backend(cls, v: str) -> str:
+        """Validate blob store backend."""
+        valid_backends = ['none', 'filesystem', 's3']
+        v = v.lower()
+        if v not in valid_backends:
+            raise ValueError(f"Claim-check backend must be one of {valid_backends}")
+        return v
+
+
+def parse_queue_mapping(entries: List[str]) -> Dict[str, str]:
+    """Parse `value=queue` entries into a mapping, ignoring empty entries.
+
+    Raises:
+        ValueError: If an entry is not of the form value=queue
+    """
+    mapping = {}
+    for entry in entries:
+        entry = entry.strip()
+        if not entry:
+            continue
+        value, sep, queue = entry.partition("=")
+        if not sep or not value.strip() or not queue.strip():
+            raise ValueError(f"Invalid cluster queue '{entry}', expected value=queue")
+        mapping[value.strip()] = queue.strip()
+    return mapping
+
+
 class TemporalConfig(BaseModel):
     """Temporal service configuration."""
 
@@ -139,6 +197,37 @@ class TemporalConfig(BaseModel):
         default_factory=lambda: os.getenv("TEMPORAL_QUEUE", "ein-agent-queue"),
         description="Temporal task queue name"
     )
+    mcp_queue: Optional[str] = Field(
+        default_factory=lambda: os.getenv("TEMPORAL_MCP_QUEUE") or None,
+        description="Task queue of the MCP workers, if split from the workflow queue"
+    )
+    payload_compression: str = Field(
+        default_factory=lambda: os.getenv("TEMPORAL_PAYLOAD_COMPRESSION", "none"),
+        description="Payload compression (none/zlib/zstd)"
+    )
+    payload_compression_min_bytes: int = Field(
+        default_factory=lambda: int(os.getenv("TEMPORAL_PAYLOAD_COMPRESSION_MIN_BYTES", "4096")),
+        description="Only compress payloads larger than this many bytes",
+        ge=0
+    )
+    claim_check: ClaimCheckConfig = Field(
+        default_factory=ClaimCheckConfig,
+        description="Claim-check blob store configuration"
+    )
+    search_attributes: bool = Field(
+        default_factory=lambda: os.getenv("TEMPORAL_SEARCH_ATTRIBUTES", "true").lower() in ("true", "1", "yes"),
+        description="Set incident search attributes on new workflows (they must be registered in the namespace)"
+    )
+    routing_label: str = Field(
+        default_factory=lambda: os.getenv("TEMPORAL_ROUTING_LABEL", "cluster"),
+        description="Alert label whose value selects the task queue of the alert's RCA"
+    )
+    # Parsed from $TEMPORAL_CLUSTER_QUEUES by WorkflowConfig.from_cli_args only, so a
+    # malformed value does not break the commands that never route alerts
+    cluster_queues: Dict[str, str] = Field(
+        default_factory=dict,
+        description="Task queue of the RCAs of each routing label value, e.g. {'prod': 'ein-agent-prod'}"
+    )
 
     @field_validator('host')
     @classmethod
@@ -148,6 +237,16 @@ class TemporalConfig(BaseModel):
             raise ValueError("Host must be in format 'host:port'")
         return v
 
+    @field_validator('payload_compression')
+    @classmethod
+    def validate_payload_compression(cls, v: str) -> str:
+        """Validate payload compression algorithm."""
+        valid_algorithms = ['none', 'zlib', 'zstd']
+        v = v.lower()
+        if v not in valid_algorithms:
+            raise ValueError(f"Payload compression must be one of {valid_algorithms}")
+        return v
+
 
 class AlertFilterConfig(BaseModel):
     """Alert filtering configuration."""
@@ -198,6 +297,23 @@ class WorkflowConfig(BaseModel):
         default=None,
         description="Custom workflow ID"
     )
+    add_to_workflow: Optional[str] = Field(
+        default=None,
+        description="ID of a running incident workflow to add the alerts to"
+    )
+    cluster: Optional[str] = Field(
+        default_factory=lambda: os.getenv("EIN_AGENT_CLUSTER"),
+        description="Cluster name recorded on the workflow, defaults to the alerts' `cluster` label"
+    )
+    group_by: Optional[str] = Field(
+        default=None,
+        description="Alert label to split the alerts by, starting one incident workflow per value"
+    )
+    concurrency: int = Field(
+        default=10,
+        description="Maximum number of workflows started concurrently when grouping",
+        ge=1
+    )
     dry_run: bool = Field(
         default=False,
         description="If True, don't trigger workflow"
@@ -210,6 +326,14 @@ class WorkflowConfig(BaseModel):
         default=False,
         description="If True, skip confirmation prompt"
     )
+    follow: bool = Field(
+        default=False,
+        description="If True, stream progress of the triggered workflow until it completes"
+    )
+    output: str = Field(
+        default="table",
+        description="Output format: table, or json/ndjson records streamed to stdout"
+    )
     temporal: TemporalConfig = Field(
         default_factory=TemporalConfig,
         description="Temporal configuration"
@@ -227,6 +351,15 @@ class WorkflowConfig(BaseModel):
             raise ValueError("Alertmanager URL must start with http:// or https://")
         return v
 
+    @field_validator('output')
+    @classmethod
+    def validate_output(cls, v: str) -> str:
+        """Validate output format."""
+        valid_formats = ['table', 'json', 'ndjson']
+        if v not in valid_formats:
+            raise ValueError(f"Output must be one of {valid_formats}")
+        return v
+
     @classmethod
     def from_cli_args(
         cls,
@@ -237,11 +370,19 @@ class WorkflowConfig(BaseModel):
         temporal_namespace: Optional[str],
         temporal_queue: Optional[str],
         workflow_id: Optional[str],
+        add_to_workflow: Optional[str],
         status: str,
         blacklist: Optional[List[str]],
         dry_run: bool,
         show_labels: bool,
         no_prompt: bool,
+        follow: bool = False,
+        cluster: Optional[str] = None,
+        cluster_queues: Optional[List[str]] = None,
+        routing_label: Optional[str] = None,
+        group_by: Optional[str] = None,
+        concurrency: int = 10,
+        output: str = "table",
     ) -> "WorkflowConfig":
         """Create WorkflowConfig from CLI arguments.
 
@@ -253,14 +394,26 @@ class WorkflowConfig(BaseModel):
             temporal_namespace: Temporal namespace
             temporal_queue: Temporal task queue
             workflow_id: Custom workflow ID
+            add_to_workflow: ID of a running incident workflow to add the alerts to
             status: Filter alerts by status
             blacklist: Alert names to exclude
             dry_run: If True, don't trigger workflow
             show_labels: If True, show labels in alert table
             no_prompt: If True, skip confirmation prompt
+            follow: If True, stream progress of the triggered workflow until it completes
+            cluster: Cluster name recorded on the workflow
+            cluster_queues: `value=queue` entries routing alerts to cluster task queues,
+                replacing $TEMPORAL_CLUSTER_QUEUES
+            routing_label: Alert label matched against the cluster queues
+            group_by: Alert label to split the alerts by, one incident workflow per value
+            concurrency: Maximum number of workflows started concurrently when grouping
+            output: Output format (table, json or ndjson)
 
         Returns:
             WorkflowConfig instance
+
+        Raises:
+            ValueError: If an argument, or $TEMPORAL_CLUSTER_QUEUES, is invalid
         """
         temporal_config = TemporalConfig()
         if temporal_host is not None:
@@ -269,6 +422,11 @@ class WorkflowConfig(BaseModel):
             temporal_config.namespace = temporal_namespace
         if temporal_queue is not None:
             temporal_config.queue = temporal_queue
+        temporal_config.cluster_queues = parse_queue_mapping(
+            cluster_queues or os.getenv("TEMPORAL_CLUSTER_QUEUES", "").split(",")
+        )
+        if routing_label is not None:
+            temporal_config.routing_label = routing_label
 
         filter_config = AlertFilterConfig(
             include=include,
@@ -276,16 +434,276 @@ class WorkflowConfig(BaseModel):
             status=status,
         )
 
-        return cls(
+        config = cls(
             alertmanager_url=alertmanager_url,
             mcp_servers=mcp_servers,
             workflow_id=workflow_id,
+            add_to_workflow=add_to_workflow,
             dry_run=dry_run,
             show_labels=show_labels,
             no_prompt=no_prompt,
+            follow=follow,
+            group_by=group_by,
+            concurrency=concurrency,
+            output=output,
             temporal=temporal_config,
             filters=filter_config,
         )
+        if cluster is not None:
+            config.cluster = cluster
+        return config
+
+
+class WatchConfig(BaseModel):
+    """Incident watch configuration."""
+
+    workflow_id: str = Field(
+        description="ID of the running incident workflow"
+    )
+    alertmanager_url: str = Field(
+        default="http://localhost:9093",
+        description="Alertmanager URL"
+    )
+    interval: int = Field(
+        default=30,
+        description="Seconds between Alertmanager polls",
+        ge=1
+    )
+    resolve_after: int = Field(
+        default=2,
+        description="Consecutive polls an alert must be missing from Alertmanager before it is resolved",
+        ge=1
+    )
+    add_new: bool = Field(
+        default=True,
+        description="If True, add newly firing alerts to the incident"
+    )
+    temporal: TemporalConfig = Field(
+        default_factory=TemporalConfig,
+        description="Temporal configuration"
+    )
+    filters: AlertFilterConfig = Field(
+        default_factory=AlertFilterConfig,
+        description="Filters applied to newly firing alerts"
+    )
+
+    @field_validator('alertmanager_url')
+    @classmethod
+    def validate_alertmanager_url(cls, v: str) -> str:
+        """Validate Alertmanager URL format."""
+        if not v.startswith(('http://', 'https://')):
+            raise ValueError("Alertmanager URL must start with http:// or https://")
+        return v
+
+    @classmethod
+    def from_cli_args(
+        cls,
+        workflow_id: str,
+        alertmanager_url: str,
+        include: Optional[List[str]],
+        blacklist: Optional[List[str]],
+        temporal_host: Optional[str],
+        temporal_namespace: Optional[str],
+        interval: int,
+        add_new: bool,
+        resolve_after: int = 2,
+    ) -> "WatchConfig":
+        """Create WatchConfig from CLI arguments.
+
+        Args:
+            workflow_id: ID of the running incident workflow
+            alertmanager_url: Alertmanager URL
+            include: Alert names or fingerprints of new alerts to add (whitelist)
+            blacklist: Alert names of new alerts to ignore
+            temporal_host: Temporal server host:port
+            temporal_namespace: Temporal namespace
+            interval: Seconds between Alertmanager polls
+            add_new: If True, add newly firing alerts to the incident
+            resolve_after: Consecutive polls an alert must be missing before it is resolved
+
+        Returns:
+            WatchConfig instance
+        """
+        temporal_config = TemporalConfig()
+        if temporal_host is not None:
+            temporal_config.host = temporal_host
+        if temporal_namespace is not None:
+            temporal_config.namespace = temporal_namespace
+
+        return cls(
+            workflow_id=workflow_id,
+            alertmanager_url=alertmanager_url,
+            interval=interval,
+            resolve_after=resolve_after,
+            add_new=add_new,
+            temporal=temporal_config,
+            filters=AlertFilterConfig(include=include, blacklist=blacklist),
+        )
+
+
+class FollowConfig(BaseModel):
+    """Incident progress streaming configuration."""
+
+    workflow_id: str = Field(
+        description="ID of the incident workflow"
+    )
+    interval: float = Field(
+        default=5.0,
+        description="Seconds between progress queries",
+        gt=0
+    )
+    show_reports: bool = Field(
+        default=False,
+        description="If True, print full RCA reports instead of summaries"
+    )
+    output: str = Field(
+        default="table",
+        description="Output format: table, or json/ndjson records streamed to stdout"
+    )
+    temporal: TemporalConfig = Field(
+        default_factory=TemporalConfig,
+        description="Temporal configuration"
+    )
+
+    @field_validator('output')
+    @classmethod
+    def validate_output(cls, v: str) -> str:
+        """Validate output format."""
+        valid_formats = ['table', 'json', 'ndjson']
+        if v not in valid_formats:
+            raise ValueError(f"Output must be one of {valid_formats}")
+        return v
+
+
+class IncidentQueryConfig(BaseModel):
+    """Selection of past incident workflows by their search attributes."""
+
+    alertnames: Optional[List[str]] = Field(
+        default=None,
+        description="Only incidents with any of these alert names"
+    )
+    fingerprints: Optional[List[str]] = Field(
+        default=None,
+        description="Only incidents with any of these alert fingerprints"
+    )
+    severities: Optional[List[str]] = Field(
+        default=None,
+        description="Only incidents with any of these highest alert severities"
+    )
+    cluster: Optional[str] = Field(
+        default=None,
+        description="Only incidents of this cluster"
+    )
+    status: Optional[str] = Field(
+        default=None,
+        description="Only workflows with this execution status"
+    )
+    since_hours: Optional[float] = Field(
+        default=None,
+        description="Only incidents started in the last N hours",
+        gt=0
+    )
+    query: Optional[str] = Field(
+        default=None,
+        description="Additional visibility query, AND-ed with the filters"
+    )
+    limit: int = Field(
+        default=100,
+        description="Maximum number of incidents",
+        ge=1
+    )
+    page_size: int = Field(
+        default=1000,
+        description="Visibility page size",
+        ge=1
+    )
+    temporal: TemporalConfig = Field(
+        default_factory=TemporalConfig,
+        description="Temporal configuration"
+    )
+
+    @field_validator('status')
+    @classmethod
+    def validate_status(cls, v: Optional[str]) -> Optional[str]:
+        """Validate execution status."""
+        valid_statuses = ['running', 'completed', 'failed', 'canceled', 'terminated', 'timed_out']
+        if v is not None and v not in valid_statuses:
+            raise ValueError(f"Status must be one of {valid_statuses}")
+        return v
+
+    @classmethod
+    def from_cli_args(
+        cls,
+        alertnames: Optional[List[str]],
+        fingerprints: Optional[List[str]],
+        severities: Optional[List[str]],
+        cluster: Optional[str],
+        status: Optional[str],
+        since_hours: Optional[float],
+        query: Optional[str],
+        limit: int,
+        page_size: int,
+        temporal_host: Optional[str],
+        temporal_namespace: Optional[str],
+    ) -> "IncidentQueryConfig":
+        """Create IncidentQueryConfig from CLI arguments.
+
+        Args:
+            alertnames: Only incidents with any of these alert names
+            fingerprints: Only incidents with any of these alert fingerprints
+            severities: Only incidents with any of these highest alert severities
+            cluster: Only incidents of this cluster
+            status: Only workflows with this execution status
+            since_hours: Only incidents started in the last N hours
+            query: Additional visibility query
+            limit: Maximum number of incidents
+            page_size: Visibility page size
+            temporal_host: Temporal server host:port
+            temporal_namespace: Temporal namespace
+
+        Returns:
+            IncidentQueryConfig instance
+        """
+        temporal_config = TemporalConfig()
+        if temporal_host is not None:
+            temporal_config.host = temporal_host
+        if temporal_namespace is not None:
+            temporal_config.namespace = temporal_namespace
+
+        return cls(
+            alertnames=alertnames or None,
+            fingerprints=fingerprints or None,
+            severities=severities or None,
+            cluster=cluster,
+            status=status,
+            since_hours=since_hours,
+            query=query,
+            limit=limit,
+            page_size=page_size,
+            temporal=temporal_config,
+        )
+
+
+class IncidentResultsConfig(BaseModel):
+    """Configuration for fetching the results of past incident workflows."""
+
+    workflow_ids: List[str] = Field(
+        default_factory=list,
+        description="Incident workflow IDs, or empty to select completed incidents with the query"
+    )
+    selection: IncidentQueryConfig = Field(
+        default_factory=IncidentQueryConfig,
+        description="Incident selection used when no workflow IDs are given"
+    )
+    concurrency: int = Field(
+        default=20,
+        description="Maximum number of results fetched concurrently",
+        ge=1
+    )
+    show_reports: bool = Field(
+        default=False,
+        description="If True, print full correlation reports instead of summaries"
+    )
 
 
 class AlertmanagerQueryParams(BaseModel):
@@ -346,3 +764,7 @@ class TemporalWorkflowParams(BaseModel):
         default=None,
         description="Custom workflow ID"
     )
+    cluster: Optional[str] = Field(
+        default=None,
+        description="Cluster name recorded on the workflow"
+    )
@@ -1,19 +1,89 @@
-"""Orchestrates incident workflow execution."""
+"""Orchestrates incident workflow execution.
+
+The Temporal SDK is imported by the commands that talk to Temporal only, so
+--help, shell completion and --dry-run start without it.
+"""
+
+from typing import Dict, List
 
 import typer
 from rich.table import Table
 
 from ein_agent_cli import console
 from ein_agent_cli.alertmanager import query_alertmanager, filter_alerts
-from ein_agent_cli.temporal import trigger_incident_workflow
 from ein_agent_cli.models import (
+    FollowConfig,
+    IncidentQueryConfig,
+    IncidentResultsConfig,
+    WatchConfig,
     WorkflowConfig,
     AlertmanagerQueryParams,
     AlertFilterParams,
+    AlertmanagerAlert,
     TemporalWorkflowParams,
 )
 
 
+# Rows per alert table, see _print_alert_tables
+TABLE_CHUNK_ROWS = 200
+
+
+def _group_alerts(alerts: List[AlertmanagerAlert], label: str) -> Dict[str, List[AlertmanagerAlert]]:
+    """Alerts by the value of a label; alerts without it are grouped as 'unlabeled'."""
+    groups: Dict[str, List[AlertmanagerAlert]] = {}
+    for alert in alerts:
+        groups.setdefault(alert.labels.get(label) or "unlabeled", []).append(alert)
+    return groups
+
+
+def _print_alert_tables(alerts: List[AlertmanagerAlert], show_labels: bool) -> None:
+    """Print alerts in tables of at most TABLE_CHUNK_ROWS rows.
+
+    Rich lays out a table once all its rows are known, so a single table of
+    thousands of alerts prints nothing until it is complete. Chunks keep the output
+    incremental and the memory bounded.
+    """
+    table = None
+    for idx, alert in enumerate(alerts, 1):
+        if table is None:
+            table = Table(show_header=True, header_style="bold magenta")
+            table.add_column("#", style="dim", width=4)
+            table.add_column("Alert Name")
+            table.add_column("Status")
+            table.add_column("Severity")
+            table.add_column("Namespace", style="dim")
+            table.add_column("Fingerprint", style="cyan")
+            if show_labels:
+                table.add_column("Labels", style="dim")
+
+        # Extract from Pydantic model
+        alert_name = alert.labels.get("alertname", "unknown")
+        alert_status = alert.status.state
+        severity = alert.labels.get("severity", "unknown")
+        namespace = alert.labels.get("namespace", "-")
+        fingerprint = alert.fingerprint if alert.fingerprint else "-"
+
+        status_color = "red" if alert_status == "firing" else "green"
+        row_data = [
+            str(idx),
+            alert_name,
+            f"[{status_color}]{alert_status}[/{status_color}]",
+            severity,
+            namespace,
+            fingerprint,
+        ]
+
+        if show_labels:
+            # Format labels as key=value pairs
+            labels_str = ", ".join([f"{k}={v}" for k, v in sorted(alert.labels.items())])
+            row_data.append(labels_str)
+
+        table.add_row(*row_data)
+        if table.row_count == TABLE_CHUNK_ROWS or idx == len(alerts):
+            console.print_table(table)
+            table = None
+
+
 async def run_incident_workflow(config: WorkflowConfig) -> None:
     """Orchestrate incident correlation workflow execution.
 
@@ -23,9 +93,14 @@ async def run_incident_workflow(config: WorkflowConfig) -> None:
     Raises:
         typer.Exit: On error or early exit
     """
+    console.set_output_format(config.output)
     try:
         console.print_header("Ein Agent - Incident Workflow Trigger\n")
 
+        if config.group_by and config.add_to_workflow:
+            console.print_error("✗ --group-by starts new workflows and cannot be used with --add-to")
+            raise typer.Exit(1)
+
         # Display filter configuration
         if config.filters.include:
             console.print_info(f"Including only alerts (by name or fingerprint): {config.filters.include}")
@@ -68,49 +143,33 @@ async def run_incident_workflow(config: WorkflowConfig) -> None:
             console.print_dim(f"Whitelist: {config.filters.include if config.filters.include else 'disabled'}")
             raise typer.Exit(0)
 
-        # Display filtered alerts in a table
-        console.print_message("\n[bold]Filtered Alerts:[/bold]")
-        table = Table(show_header=True, header_style="bold magenta")
-        table.add_column("#", style="dim", width=4)
-        table.add_column("Alert Name")
-        table.add_column("Status")
-        table.add_column("Severity")
-        table.add_column("Namespace", style="dim")
-        table.add_column("Fingerprint", style="cyan")
-        if config.show_labels:
-            table.add_column("Labels", style="dim")
-
-        for idx, alert in enumerate(filtered_alerts, 1):
-            # Extract from Pydantic model
-            alert_name = alert.labels.get("alertname", "unknown")
-            alert_status = alert.status.state
-            severity = alert.labels.get("severity", "unknown")
-            namespace = alert.labels.get("namespace", "-")
-            fingerprint = alert.fingerprint if alert.fingerprint else "-"
-
-            status_color = "red" if alert_status == "firing" else "green"
-            row_data = [
-                str(idx),
-                alert_name,
-                f"[{status_color}]{alert_status}[/{status_color}]",
-                severity,
-                namespace,
-                fingerprint,
-            ]
-
-            if config.show_labels:
-                # Format labels as key=value pairs
-                labels_str = ", ".join([f"{k}={v}" for k, v in sorted(alert.labels.items())])
-                row_data.append(labels_str)
-
-            table.add_row(*row_data)
+        # Stream filtered alerts as records, or display them in tables
+        if console.is_machine_output():
+            for alert in filtered_alerts:
+                console.emit(
+                    "alert",
+                    fingerprint=alert.fingerprint,
+                    alertname=alert.labels.get("alertname"),
+                    status=alert.status.state,
+                    starts_at=alert.startsAt,
+                    labels=alert.labels,
+                )
+        else:
+            console.print_message("\n[bold]Filtered Alerts:[/bold]")
+            _print_alert_tables(filtered_alerts, config.show_labels)
+            console.print_newline()
 
-        console.print_table(table)
-        console.print_newline()
+        groups = _group_alerts(filtered_alerts, config.group_by) if config.group_by else {}
+        for value, group in groups.items():
+            console.print_dim(f"{config.group_by}={value}: {len(group)} alert(s)")
+            console.emit("group", label=config.group_by, value=value, alerts=len(group))
 
         if config.dry_run:
             console.print_warning("DRY RUN - Not triggering workflow")
-            console.print_dim(f"Would trigger workflow with {len(filtered_alerts)} alerts")
+            if groups:
+                console.print_dim(f"Would trigger {len(groups)} workflows with {len(filtered_alerts)} alerts")
+            else:
+                console.print_dim(f"Would trigger workflow with {len(filtered_alerts)} alerts")
             console.print_dim(f"MCP servers: {config.mcp_servers}")
             console.print_dim(f"Temporal: {config.temporal.host}/{config.temporal.namespace}/{config.temporal.queue}")
             return
@@ -121,22 +180,69 @@ async def run_incident_workflow(config: WorkflowConfig) -> None:
         console.print_newline()
 
         if not config.no_prompt:
-            confirmed = typer.confirm(
-                f"Do you want to trigger the workflow with {len(filtered_alerts)} alert(s)?",
-                default=False
-            )
+            if config.add_to_workflow:
+                question = f"Do you want to add {len(filtered_alerts)} alert(s) to workflow {config.add_to_workflow}?"
+            elif groups:
+                question = (
+                    f"Do you want to trigger {len(groups)} workflows with {len(filtered_alerts)} alert(s), "
+                    f"one per {config.group_by}?"
+                )
+            else:
+                question = f"Do you want to trigger the workflow with {len(filtered_alerts)} alert(s)?"
+            # With json/ndjson output, stdout carries records only
+            confirmed = typer.confirm(question, default=False, err=console.is_machine_output())
 
             if not confirmed:
                 console.print_warning("Workflow trigger cancelled by user")
                 raise typer.Exit(0)
 
         # Trigger workflow
+        from ein_agent_cli.temporal import (
+            add_alerts_to_workflow,
+            follow_incident_workflow,
+            trigger_incident_workflow,
+            trigger_incident_workflows,
+        )
+
+        if groups:
+            batch = [
+                TemporalWorkflowParams(
+                    alerts=group,
+                    config=config.temporal,
+                    mcp_servers=config.mcp_servers,
+                    workflow_id=f"{config.workflow_id}-{value}" if config.workflow_id else None,
+                    cluster=config.cluster,
+                )
+                for value, group in groups.items()
+            ]
+            results = await trigger_incident_workflows(batch, config.concurrency)
+            failed = [workflow_id for workflow_id, error in results if error is not None]
+
+            console.print_newline()
+            if failed:
+                console.print_warning(f"{len(failed)} of {len(results)} workflow(s) could not be started")
+            else:
+                console.print_bold_success(f"✓ {len(results)} workflows triggered successfully!")
+            if config.follow:
+                console.print_warning("--follow follows a single workflow, skipped with --group-by")
+            for workflow_id, error in results:
+                if error is None:
+                    console.print_dim(f"Follow progress: ein-agent-cli follow {workflow_id}")
+            if failed:
+                raise typer.Exit(1)
+            return
+
         workflow_params = TemporalWorkflowParams(
             alerts=filtered_alerts,
             config=config.temporal,
             mcp_servers=config.mcp_servers,
             workflow_id=config.workflow_id,
+            cluster=config.cluster,
         )
+        if config.add_to_workflow:
+            await add_alerts_to_workflow(workflow_params, config.add_to_workflow)
+            return
+
         wf_id = await trigger_incident_workflow(workflow_params)
 
         console.print_newline()
@@ -145,6 +251,163 @@ async def run_incident_workflow(config: WorkflowConfig) -> None:
         ui_host = config.temporal.host.split(':')[0]
         console.print_dim(f"View in Temporal UI: http://{ui_host}:8080/namespaces/{config.temporal.namespace}/workflows/{wf_id}")
 
+        if config.follow:
+            console.print_newline()
+            await follow_incident_workflow(FollowConfig(workflow_id=wf_id, temporal=config.temporal))
+        else:
+            console.print_dim(f"Follow progress: ein-agent-cli follow {wf_id}")
+
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print_error(f"✗ Error: {e}")
+        raise typer.Exit(1)
+    finally:
+        console.end_output()
+
+
+async def run_incident_watch(config: WatchConfig) -> None:
+    """Watch a running incident workflow and keep its alerts in sync with Alertmanager.
+
+    Args:
+        config: Watch configuration
+
+    Raises:
+        typer.Exit: On error
+    """
+    try:
+        from ein_agent_cli.temporal import watch_incident_workflow
+
+        console.print_header("Ein Agent - Incident Watch\n")
+        await watch_incident_workflow(config)
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print_error(f"✗ Error: {e}")
+        raise typer.Exit(1)
+
+
+async def run_incident_follow(config: FollowConfig) -> None:
+    """Stream the progress and results of an incident workflow.
+
+    Args:
+        config: Follow configuration
+
+    Raises:
+        typer.Exit: On error, or with code 1 if the workflow did not complete successfully
+    """
+    console.set_output_format(config.output)
+    try:
+        from ein_agent_cli.temporal import follow_incident_workflow
+
+        console.print_header("Ein Agent - Incident Progress\n")
+        result = await follow_incident_workflow(config)
+        if result is None:
+            raise typer.Exit(1)
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print_error(f"✗ Error: {e}")
+        raise typer.Exit(1)
+    finally:
+        console.end_output()
+
+
+async def run_incident_list(config: IncidentQueryConfig) -> None:
+    """List past and running incident workflows by their search attributes.
+
+    Args:
+        config: Incident query configuration
+
+    Raises:
+        typer.Exit: On error
+    """
+    try:
+        from ein_agent_cli.search_attributes import ALERT_COUNT, ALERT_NAMES, CLUSTER, INCIDENT_COUNT, SEVERITY
+        from ein_agent_cli.temporal import list_incident_workflows
+
+        console.print_header("Ein Agent - Incidents\n")
+        executions = await list_incident_workflows(config)
+        if not executions:
+            console.print_warning("No incidents found")
+            return
+
+        table = Table(show_header=True, header_style="bold magenta")
+        table.add_column("Workflow ID", style="cyan")
+        table.add_column("Status")
+        table.add_column("Started", style="dim")
+        table.add_column("Cluster")
+        table.add_column("Severity")
+        table.add_column("Alerts", justify="right")
+        table.add_column("Incidents", justify="right")
+        table.add_column("Alert Names", style="dim")
+
+        for execution in executions:
+            attributes = execution.typed_search_attributes
+            incident_count = attributes.get(INCIDENT_COUNT)
+            alert_count = attributes.get(ALERT_COUNT)
+            table.add_row(
+                execution.id,
+                execution.status.name.lower() if execution.status else "-",
+                execution.start_time.strftime("%Y-%m-%d %H:%M:%S"),
+                attributes.get(CLUSTER) or "-",
+                attributes.get(SEVERITY) or "-",
+                str(alert_count) if alert_count is not None else "-",
+                str(incident_count) if incident_count is not None else "-",
+                ", ".join(attributes.get(ALERT_NAMES) or []) or "-",
+            )
+
+        console.print_table(table)
+        console.print_dim(f"{len(executions)} incident(s)" + (" (limit reached)" if len(executions) >= config.limit else ""))
+    except typer.Exit:
+        raise
+    except Exception as e:
+        console.print_error(f"✗ Error: {e}")
+        raise typer.Exit(1)
+
+
+async def run_incident_results(config: IncidentResultsConfig) -> None:
+    """Print the correlation reports of past incident workflows.
+
+    Args:
+        config: Results configuration
+
+    Raises:
+        typer.Exit: On error, or with code 1 if any result could not be fetched
+    """
+    try:
+        from ein_agent_cli.temporal import fetch_incident_results, parse_report
+
+        console.print_header("Ein Agent - Incident Results\n")
+        results = await fetch_incident_results(config)
+        if not results:
+            console.print_warning("No completed incidents found")
+            return
+
+        failed = 0
+        for workflow_id, report, error in results:
+            if error is not None:
+                failed += 1
+                console.print_error(f"✗ {workflow_id}: {error}")
+                continue
+            parsed = parse_report(report)
+            if config.show_reports or parsed is None:
+                console.print_success(f"✓ {workflow_id}")
+                console.print_message(report)
+                continue
+            console.print_success(
+                f"✓ {workflow_id}: {parsed.get('total_incidents', '?')} incident(s) "
+                f"from {parsed.get('total_alerts', '?')} alert(s)"
+            )
+            for incident in parsed.get("incidents", []):
+                console.print_dim(
+                    f"  #{incident.get('incident_id', '?')} {incident.get('primary_alert', '-')}: "
+                    f"{incident.get('common_root_cause', '-')}"
+                )
+
+        if failed:
+            console.print_warning(f"{failed} of {len(results)} result(s) could not be fetched")
+            raise typer.Exit(1)
     except typer.Exit:
         raise
     except Exception as e:
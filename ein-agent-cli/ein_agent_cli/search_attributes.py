@@ -0,0 +1,110 @@
+"""Search attributes of incident workflows and visibility queries over them.
+
+Keep in sync with ein_agent_worker/workflows/search_attributes.py. The attributes
+must be registered in the Temporal namespace (see README).
+"""
+
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+from temporalio.common import SearchAttributeKey, SearchAttributePair, TypedSearchAttributes
+
+from ein_agent_cli.models import IncidentQueryConfig
+
+WORKFLOW_TYPE = "IncidentCorrelationWorkflow"
+
+ALERT_NAMES = SearchAttributeKey.for_keyword_list("EinAlertNames")
+FINGERPRINTS = SearchAttributeKey.for_keyword_list("EinFingerprints")
+SEVERITY = SearchAttributeKey.for_keyword("EinSeverity")
+CLUSTER = SearchAttributeKey.for_keyword("EinCluster")
+ALERT_COUNT = SearchAttributeKey.for_int("EinAlertCount")
+INCIDENT_COUNT = SearchAttributeKey.for_int("EinIncidentCount")
+
+# Most severe first
+SEVERITY_ORDER = ("critical", "error", "warning", "info", "none")
+
+# Visibility names of the workflow execution statuses
+EXECUTION_STATUSES = {
+    "running": "Running",
+    "completed": "Completed",
+    "failed": "Failed",
+    "canceled": "Canceled",
+    "terminated": "Terminated",
+    "timed_out": "TimedOut",
+}
+
+
+def highest_severity(alerts: Sequence[Dict[str, Any]]) -> str:
+    """Most severe `severity` label of the alerts ('none' if no alert has a known one)."""
+    severities = {alert.get("labels", {}).get("severity", "none").lower() for alert in alerts}
+    return next((s for s in SEVERITY_ORDER if s in severities), "none")
+
+
+def incident_cluster(alerts: Sequence[Dict[str, Any]]) -> Optional[str]:
+    """The `cluster` label shared by all alerts, if any."""
+    clusters = {alert.get("labels", {}).get("cluster") for alert in alerts}
+    if len(clusters) == 1:
+        return clusters.pop()
+    return None
+
+
+def incident_search_attributes(alerts: Sequence[Dict[str, Any]], cluster: Optional[str] = None) -> TypedSearchAttributes:
+    """Search attributes of a new incident workflow.
+
+    Args:
+        alerts: Alerts in workflow format
+        cluster: Cluster name, defaults to the `cluster` label shared by all alerts
+
+    Returns:
+        TypedSearchAttributes to start the workflow with
+    """
+    pairs = [
+        SearchAttributePair(ALERT_NAMES, sorted({alert.get("alertname", "unknown") for alert in alerts})),
+        SearchAttributePair(FINGERPRINTS, sorted({alert["fingerprint"] for alert in alerts if alert.get("fingerprint")})),
+        SearchAttributePair(SEVERITY, highest_severity(alerts)),
+        SearchAttributePair(ALERT_COUNT, len(alerts)),
+    ]
+    cluster = cluster or incident_cluster(alerts)
+    if cluster:
+        pairs.append(SearchAttributePair(CLUSTER, cluster))
+    return TypedSearchAttributes(pairs)
+
+
+def _quote(value: str) -> str:
+    return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def _any_of(name: str, values: List[str]) -> str:
+    return f"{name} IN ({', '.join(_quote(v) for v in values)})"
+
+
+def build_incident_query(config: IncidentQueryConfig) -> str:
+    """Build the visibility query selecting incident workflows.
+
+    Runs that continued as new are left out, so each incident is listed once.
+
+    Args:
+        config: Incident query configuration
+
+    Returns:
+        Visibility query string
+    """
+    clauses = [f"WorkflowType = {_quote(WORKFLOW_TYPE)}"]
+    if config.status:
+        clauses.append(f"ExecutionStatus = {_quote(EXECUTION_STATUSES[config.status])}")
+    else:
+        clauses.append("ExecutionStatus != 'ContinuedAsNew'")
+    if config.alertnames:
+        clauses.append(_any_of(ALERT_NAMES.name, config.alertnames))
+    if config.fingerprints:
+        clauses.append(_any_of(FINGERPRINTS.name, config.fingerprints))
+    if config.severities:
+        clauses.append(_any_of(SEVERITY.name, config.severities))
+    if config.cluster:
+        clauses.append(f"{CLUSTER.name} = {_quote(config.cluster)}")
+    if config.since_hours:
+        since = datetime.now(timezone.utc) - timedelta(hours=config.since_hours)
+        clauses.append(f"StartTime > {_quote(since.strftime('%Y-%m-%dT%H:%M:%SZ'))}")
+    if config.query:
+        clauses.append(f"({config.query})")
+    return " AND ".join(clauses)
@@ -1,12 +1,113 @@
 """Temporal workflow integration."""
 
+import asyncio
+import json
 from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 
-from temporalio.client import Client as TemporalClient
+from temporalio.client import Client as TemporalClient, WorkflowExecution, WorkflowExecutionStatus
+from temporalio.converter import DataConverter
+from temporalio.service import RPCError, RPCStatusCode
 
 from ein_agent_cli import console
-from ein_agent_cli.alertmanager import convert_alertmanager_alert
-from ein_agent_cli.models import TemporalWorkflowParams
+from ein_agent_cli.codec import ClaimCheckCodec, build_payload_codec
+from ein_agent_cli.alertmanager import convert_alertmanager_alert, filter_alerts, query_alertmanager
+from ein_agent_cli.search_attributes import build_incident_query, incident_search_attributes
+from ein_agent_cli.models import (
+    AlertFilterParams,
+    AlertmanagerQueryParams,
+    FollowConfig,
+    IncidentQueryConfig,
+    IncidentResultsConfig,
+    TemporalConfig,
+    TemporalWorkflowParams,
+    WatchConfig,
+)
+
+
+# Clients of this CLI process by connection settings, see _connect
+_clients: Dict[str, Tuple[TemporalClient, ClaimCheckCodec]] = {}
+_clients_lock = asyncio.Lock()
+
+
+async def _connect(config: TemporalConfig) -> Tuple[TemporalClient, ClaimCheckCodec]:
+    """Connect to Temporal with the configured payload codec.
+
+    The client is kept for the lifetime of the CLI process, so commands that start,
+    signal or follow several workflows share one connection instead of repeating
+    the gRPC (and TLS) handshake for each.
+    """
+    key = config.model_dump_json(
+        include={"host", "namespace", "payload_compression", "payload_compression_min_bytes", "claim_check"}
+    )
+    async with _clients_lock:
+        if key not in _clients:
+            console.print_dim(f"Connecting to Temporal: {config.host}, namespace={config.namespace}")
+            codec = build_payload_codec(config)
+            client = await TemporalClient.connect(
+                config.host,
+                namespace=config.namespace,
+                data_converter=DataConverter(payload_codec=codec),
+            )
+            _clients[key] = client, codec
+        return _clients[key]
+
+
+def _print_codec_stats(codec: ClaimCheckCodec) -> None:
+    if codec.inner.stats.compressed:
+        console.print_dim(f"Payload compression ({codec.inner.algorithm}): {codec.inner.stats.summary()}")
+    if codec.offloaded:
+        console.print_dim(f"Claim-check: {codec.offloaded} payload(s), {codec.offloaded_bytes} bytes offloaded to blob store")
+
+
+def alert_queues(alerts: List[Dict[str, Any]], config: TemporalConfig) -> Dict[str, int]:
+    """Number of alerts whose RCA runs on each task queue under the cluster queue routing.
+
+    Alerts without a mapped routing label value run on the incident's own queue.
+    """
+    counts: Dict[str, int] = {}
+    for alert in alerts:
+        value = alert.get("labels", {}).get(config.routing_label)
+        queue = config.cluster_queues.get(value, config.queue) if value else config.queue
+        counts[queue] = counts.get(queue, 0) + 1
+    return counts
+
+
+def _new_workflow_id(suffix: Optional[str] = None) -> str:
+    timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return f"incident-correlation-{timestamp}-{suffix}" if suffix else f"incident-correlation-{timestamp}"
+
+
+async def _start_incident_workflow(client: TemporalClient, params: TemporalWorkflowParams, workflow_id: str) -> None:
+    """Start IncidentCorrelationWorkflow on a connected client."""
+    # Convert alerts to workflow format
+    workflow_alerts = [convert_alertmanager_alert(alert) for alert in params.alerts]
+
+    memo: Dict[str, Any] = {"mcp_servers": params.mcp_servers}
+    if params.config.mcp_queue:
+        # The workflow schedules its MCP activities on this queue
+        memo["mcp_queue"] = params.config.mcp_queue
+    if params.config.cluster_queues:
+        # The workflow starts each alert's RCA on the queue of its cluster
+        memo["cluster_queues"] = {"label": params.config.routing_label, "queues": params.config.cluster_queues}
+
+    start_args: Dict[str, Any] = dict(
+        id=workflow_id,
+        task_queue=params.config.queue,
+        memo=memo,
+    )
+    if params.config.search_attributes:
+        start_args["search_attributes"] = incident_search_attributes(workflow_alerts, params.cluster)
+    try:
+        await client.start_workflow("IncidentCorrelationWorkflow", workflow_alerts, **start_args)
+    except RPCError as e:
+        if "search_attributes" not in start_args or e.status != RPCStatusCode.INVALID_ARGUMENT:
+            raise
+        # The namespace does not have the incident search attributes registered
+        console.print_warning(f"Search attributes rejected ({e.message}), starting without them")
+        console.print_dim("Register them to list past incidents, or set TEMPORAL_SEARCH_ATTRIBUTES=false")
+        del start_args["search_attributes"]
+        await client.start_workflow("IncidentCorrelationWorkflow", workflow_alerts, **start_args)
 
 
 async def trigger_incident_workflow(params: TemporalWorkflowParams) -> str:
@@ -21,34 +122,328 @@ async def trigger_incident_workflow(params: TemporalWorkflowParams) -> str:
     Raises:
         Exception: If workflow trigger fails
     """
-    console.print_dim(f"Connecting to Temporal: {params.config.host}, namespace={params.config.namespace}")
-
-    client = await TemporalClient.connect(
-        params.config.host,
-        namespace=params.config.namespace,
-    )
-
-    # Convert alerts to workflow format
-    workflow_alerts = [convert_alertmanager_alert(alert) for alert in params.alerts]
+    client, codec = await _connect(params.config)
 
     # Generate workflow ID if not provided
-    workflow_id = params.workflow_id
-    if not workflow_id:
-        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        workflow_id = f"incident-correlation-{timestamp}"
+    workflow_id = params.workflow_id or _new_workflow_id()
 
     console.print_info(f"Starting workflow: {workflow_id}")
-    console.print_dim(f"Alerts: {len(workflow_alerts)}")
+    console.print_dim(f"Alerts: {len(params.alerts)}")
     console.print_dim(f"MCP servers: {params.mcp_servers}")
+    if params.config.cluster_queues:
+        workflow_alerts = [convert_alertmanager_alert(alert) for alert in params.alerts]
+        for queue, count in alert_queues(workflow_alerts, params.config).items():
+            console.print_dim(f"RCA queue {queue}: {count} alert(s)")
 
-    # Start workflow
-    handle = await client.start_workflow(
-        "IncidentCorrelationWorkflow",
-        workflow_alerts,
-        id=workflow_id,
-        task_queue=params.config.queue,
-        memo={"mcp_servers": params.mcp_servers},
-    )
+    await _start_incident_workflow(client, params, workflow_id)
 
     console.print_success(f"✓ Workflow started: {workflow_id}")
+    console.emit("workflow", workflow_id=workflow_id, alerts=len(params.alerts), error=None)
+    _print_codec_stats(codec)
     return workflow_id
+
+
+async def trigger_incident_workflows(
+    batch: List[TemporalWorkflowParams],
+    concurrency: int,
+) -> List[Tuple[str, Optional[str]]]:
+    """Trigger one IncidentCorrelationWorkflow per entry of a batch over one connection.
+
+    Starts run concurrently, at most `concurrency` at a time. A failed start does
+    not stop the others. Entries without a workflow ID get a generated one,
+    numbered by their position in the batch.
+
+    Args:
+        batch: Temporal workflow parameters per workflow, sharing one Temporal configuration
+        concurrency: Maximum number of concurrent starts
+
+    Returns:
+        (workflow ID, error) per entry, in the order of the batch; error is None if started
+
+    Raises:
+        Exception: If Temporal cannot be reached
+    """
+    if not batch:
+        return []
+    client, codec = await _connect(batch[0].config)
+    console.print_info(f"Starting {len(batch)} workflow(s), {concurrency} at a time")
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def start(index: int, params: TemporalWorkflowParams) -> Tuple[str, Optional[str]]:
+        workflow_id = params.workflow_id or _new_workflow_id(str(index + 1))
+        async with semaphore:
+            try:
+                await _start_incident_workflow(client, params, workflow_id)
+            except Exception as e:
+                console.print_error(f"✗ {workflow_id}: {e}")
+                console.emit("workflow", workflow_id=workflow_id, alerts=len(params.alerts), error=str(e))
+                return workflow_id, str(e)
+        console.print_success(f"✓ Workflow started: {workflow_id} ({len(params.alerts)} alert(s))")
+        console.emit("workflow", workflow_id=workflow_id, alerts=len(params.alerts), error=None)
+        return workflow_id, None
+
+    results = list(await asyncio.gather(*(start(index, params) for index, params in enumerate(batch))))
+    _print_codec_stats(codec)
+    return results
+
+
+async def add_alerts_to_workflow(params: TemporalWorkflowParams, workflow_id: str) -> None:
+    """Send alerts to a running IncidentCorrelationWorkflow with the `add_alerts` signal.
+
+    The workflow ignores alerts it already investigates (by fingerprint).
+
+    Args:
+        params: Temporal workflow parameters
+        workflow_id: ID of the running incident workflow
+
+    Raises:
+        Exception: If the signal fails (e.g. the workflow already completed)
+    """
+    client, codec = await _connect(params.config)
+
+    workflow_alerts = [convert_alertmanager_alert(alert) for alert in params.alerts]
+
+    console.print_info(f"Adding {len(workflow_alerts)} alerts to workflow: {workflow_id}")
+    handle = client.get_workflow_handle(workflow_id)
+    await handle.signal("add_alerts", workflow_alerts)
+
+    console.print_success(f"✓ Alerts sent to workflow: {workflow_id}")
+    console.emit("alerts_added", workflow_id=workflow_id, alerts=len(workflow_alerts))
+    _print_codec_stats(codec)
+
+
+async def watch_incident_workflow(config: WatchConfig) -> None:
+    """Keep a running incident workflow in sync with Alertmanager until it completes.
+
+    Alerts of the incident that are no longer active in Alertmanager are sent with the
+    `resolve_alerts` signal, which cancels their in-flight RCAs. An alert is resolved
+    only after it is missing from `resolve_after` consecutive polls, and a poll without
+    any alert is ignored while the incident has unresolved alerts: Alertmanager
+    returns partial or empty lists after a restart (until Prometheus resends its
+    alerts) or from an HA peer that has not synced yet. Newly firing alerts
+    matching the filters are sent with the `add_alerts` signal (unless disabled).
+
+    Args:
+        config: Watch configuration
+
+    Raises:
+        Exception: If Temporal or Alertmanager cannot be reached
+    """
+    client, _ = await _connect(config.temporal)
+    handle = client.get_workflow_handle(config.workflow_id)
+    query_params = AlertmanagerQueryParams(url=config.alertmanager_url)
+
+    console.print_info(f"Watching workflow {config.workflow_id} every {config.interval}s")
+    # Consecutive polls each unresolved alert of the incident has been missing from
+    missing: Dict[str, int] = {}
+    while True:
+        description = await handle.describe()
+        if description.status != WorkflowExecutionStatus.RUNNING:
+            console.print_info(f"Workflow {config.workflow_id} is {description.status.name.lower()}, stopping watch")
+            return
+
+        fingerprints = await handle.query("alert_fingerprints")
+        known = set(fingerprints["alerts"])
+        resolved = set(fingerprints["resolved"])
+
+        # Alertmanager only returns active (firing or suppressed) alerts
+        alerts = await query_alertmanager(query_params)
+        active = {alert.fingerprint for alert in alerts}
+
+        unresolved = known - resolved
+        if not active and unresolved:
+            console.print_warning(
+                f"Alertmanager returned no alerts while {len(unresolved)} alert(s) of the incident are unresolved, "
+                "not resolving any this poll"
+            )
+        else:
+            missing = {fingerprint: missing.get(fingerprint, 0) + 1 for fingerprint in unresolved - active}
+            newly_resolved = sorted(fingerprint for fingerprint, polls in missing.items() if polls >= config.resolve_after)
+            pending = len(missing) - len(newly_resolved)
+            if pending:
+                console.print_dim(f"{pending} alert(s) missing from Alertmanager, resolving if still missing")
+            if newly_resolved:
+                console.print_warning(f"{len(newly_resolved)} alert(s) resolved: {newly_resolved}")
+                await handle.signal("resolve_alerts", newly_resolved)
+
+        if config.add_new:
+            firing = filter_alerts(AlertFilterParams(
+                alerts=alerts,
+                whitelist=config.filters.include,
+                blacklist=config.filters.blacklist,
+                status_filter="firing",
+            ))
+            new_alerts = [alert for alert in firing if alert.fingerprint and alert.fingerprint not in known]
+            if new_alerts:
+                console.print_info(f"Adding {len(new_alerts)} newly firing alert(s)")
+                await handle.signal("add_alerts", [convert_alertmanager_alert(alert) for alert in new_alerts])
+
+        await asyncio.sleep(config.interval)
+
+
+def parse_report(report: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Parse a JSON report from agent output, tolerating markdown code fences."""
+    if not report:
+        return None
+    start, end = report.find("{"), report.rfind("}")
+    if start == -1 or end < start:
+        return None
+    try:
+        parsed = json.loads(report[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+    return parsed if isinstance(parsed, dict) else None
+
+
+def _print_completed_rca(completed: Dict[str, Any], show_reports: bool) -> None:
+    pass_name = "Pass 1" if completed["phase"] == "pass1" else "Pass 2"
+    title = f"{pass_name} RCA #{completed['index'] + 1} {completed['alertname']} ({completed['fingerprint'] or '-'})"
+    report = completed.get("report") or ""
+    parsed = parse_report(report)
+    if show_reports or parsed is None:
+        console.print_success(f"✓ {title}")
+        console.print_message(report)
+        return
+    summary = parsed.get("root_cause_summary", "-")
+    if parsed.get("is_symptom") or parsed.get("is_likely_symptom"):
+        summary = f"{summary} (symptom of {parsed.get('caused_by_alert') or parsed.get('caused_by_resource') or 'another alert'})"
+    console.print_success(f"✓ {title}: {summary}")
+
+
+def _format_usage(usage: Dict[str, int]) -> str:
+    return (
+        f"{usage.get('requests', 0)} model requests, "
+        f"{usage.get('input_tokens', 0)} input / {usage.get('output_tokens', 0)} output tokens"
+    )
+
+
+async def follow_incident_workflow(config: FollowConfig) -> Optional[str]:
+    """Stream the progress of an incident workflow until it completes.
+
+    Polls the workflow's `progress` query with an event cursor, so each completed RCA
+    is transferred and printed once, as soon as its child workflow finishes.
+
+    Args:
+        config: Follow configuration
+
+    Returns:
+        The final correlation report, or None if the workflow did not complete successfully
+    """
+    client, _ = await _connect(config.temporal)
+    handle = client.get_workflow_handle(config.workflow_id)
+
+    console.print_info(f"Following workflow: {config.workflow_id}")
+    cursor = 0
+    last_phase = None
+    while True:
+        description = await handle.describe()
+        running = description.status == WorkflowExecutionStatus.RUNNING
+        if running or description.status == WorkflowExecutionStatus.COMPLETED:
+            progress = await handle.query("progress", cursor)
+
+            phase = (progress["phase"], progress["round"])
+            if phase != last_phase:
+                statuses: Dict[str, int] = {}
+                for alert in progress["alerts"]:
+                    statuses[alert["status"]] = statuses.get(alert["status"], 0) + 1
+                round_note = f" (round {progress['round']})" if progress["round"] else ""
+                console.print_header(f"Phase: {progress['phase']}{round_note}")
+                console.print_dim(", ".join(f"{count} {status}" for status, count in sorted(statuses.items())))
+                console.emit(
+                    "phase",
+                    workflow_id=config.workflow_id,
+                    phase=progress["phase"],
+                    round=progress["round"],
+                    alerts=statuses,
+                )
+                last_phase = phase
+
+            for completed in progress["completed"]:
+                _print_completed_rca(completed, config.show_reports)
+                console.emit(
+                    "rca",
+                    workflow_id=config.workflow_id,
+                    phase=completed["phase"],
+                    index=completed["index"],
+                    alertname=completed["alertname"],
+                    fingerprint=completed["fingerprint"],
+                    report=parse_report(completed.get("report")) or completed.get("report"),
+                    usage=progress["usage"],
+                )
+            if progress["completed"]:
+                console.print_dim(f"Usage so far: {_format_usage(progress['usage'])}")
+            cursor = progress["next"]
+
+        if not running:
+            break
+        await asyncio.sleep(config.interval)
+
+    if description.status != WorkflowExecutionStatus.COMPLETED:
+        console.print_warning(f"Workflow {config.workflow_id} is {description.status.name.lower()}")
+        console.emit("result", workflow_id=config.workflow_id, status=description.status.name.lower(), report=None)
+        return None
+
+    result = await handle.result()
+    console.emit("result", workflow_id=config.workflow_id, status="completed", report=parse_report(result) or result)
+    console.print_newline()
+    console.print_bold_success("✓ Incident correlation complete")
+    console.print_message(result)
+    return result
+
+
+async def _list_incidents(client: TemporalClient, config: IncidentQueryConfig) -> List[WorkflowExecution]:
+    query = build_incident_query(config)
+    console.print_dim(f"Query: {query}")
+    # The iterator fetches further pages on demand, stopping at the limit
+    return [
+        execution
+        async for execution in client.list_workflows(query, limit=config.limit, page_size=config.page_size)
+    ]
+
+
+async def list_incident_workflows(config: IncidentQueryConfig) -> List[WorkflowExecution]:
+    """List incident workflows matching the query, newest first.
+
+    Only visibility records are read, so listing does not touch workflow histories.
+
+    Args:
+        config: Incident query configuration
+
+    Returns:
+        Workflow executions with their search attributes
+
+    Raises:
+        Exception: If the query fails (e.g. unregistered search attributes)
+    """
+    client, _ = await _connect(config.temporal)
+    return await _list_incidents(client, config)
+
+
+async def fetch_incident_results(config: IncidentResultsConfig) -> List[Tuple[str, Optional[str], Optional[str]]]:
+    """Fetch the correlation reports of incident workflows concurrently.
+
+    Args:
+        config: Results configuration. Without workflow IDs, the completed incidents
+            matching the selection are fetched.
+
+    Returns:
+        (workflow ID, report, error) per incident, in the order of the IDs
+    """
+    client, _ = await _connect(config.selection.temporal)
+    workflow_ids = config.workflow_ids
+    if not workflow_ids:
+        selection = config.selection.model_copy(update={"status": "completed"})
+        workflow_ids = [execution.id for execution in await _list_incidents(client, selection)]
+    console.print_dim(f"Fetching {len(workflow_ids)} result(s), {config.concurrency} at a time")
+
+    semaphore = asyncio.Semaphore(config.concurrency)
+
+    async def fetch(workflow_id: str) -> Tuple[str, Optional[str], Optional[str]]:
+        async with semaphore:
+            try:
+                return workflow_id, await client.get_workflow_handle(workflow_id).result(), None
+            except Exception as e:
+                return workflow_id, None, str(e)
+
+    return list(await asyncio.gather(*(fetch(workflow_id) for workflow_id in workflow_ids)))
@@ -0,0 +1,91 @@
+"""Startup benchmark of the Ein Agent CLI.
+
+Reports, for the paths that must stay fast in cron/watch loops and shell
+completion:
+
+- help: wall time of `python -m ein_agent_cli --help`, median of several runs.
+- imports: heavy packages loaded by `--help` and by the dry-run path (the
+  orchestrator up to the Alertmanager query and alert table).
+
+Exits with code 1 if a path imports a package it must not (e.g. the Temporal SDK),
+or if --max-seconds is given and the median help time exceeds it.
+
+Usage (from ein-agent-cli):
+    python scripts/benchmark_startup.py [--runs 10] [--max-seconds 0.5]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+HEAVY_PACKAGES = ("temporalio", "pydantic", "httpx", "google", "nexusrpc")
+
+# Code path -> (statement run, packages it must not import)
+PATHS: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "help": (
+        "from ein_agent_cli.command import app\n"
+        "try:\n"
+        "    app(['--help'])\n"
+        "except SystemExit:\n"
+        "    pass",
+        ("temporalio", "pydantic", "httpx"),
+    ),
+    "dry-run": ("import ein_agent_cli.orchestrator", ("temporalio",)),
+}
+
+
+def time_help(runs: int) -> float:
+    """Median wall time of `python -m ein_agent_cli --help`, in seconds."""
+    timings: List[float] = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "ein_agent_cli", "--help"],
+            stdout=subprocess.DEVNULL,
+            check=True,
+        )
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def loaded_packages(statement: str) -> List[str]:
+    """Heavy packages imported by a statement, in a fresh interpreter."""
+    check = f"{statement}\nimport sys\nprint(' '.join(p for p in {HEAVY_PACKAGES!r} if p in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", check],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.splitlines()[-1].split() if result.stdout.strip() else []
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=10, help="Runs of --help to time")
+    parser.add_argument("--max-seconds", type=float, default=None, help="Fail if the median help time is above this")
+    args = parser.parse_args()
+
+    failed = False
+    for name, (statement, forbidden) in PATHS.items():
+        loaded = loaded_packages(statement)
+        unexpected = sorted(set(loaded) & set(forbidden))
+        print(f"{name}: imports {', '.join(loaded) or 'no heavy packages'}")
+        if unexpected:
+            print(f"  FAIL: must not import {', '.join(unexpected)}")
+            failed = True
+
+    median = time_help(args.runs)
+    print(f"help: {median * 1000:.0f}ms (median of {args.runs} runs)")
+    if args.max_seconds is not None and median > args.max_seconds:
+        print(f"  FAIL: above {args.max_seconds * 1000:.0f}ms")
+        failed = True
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""Content-addressed blob store for claim-check payloads.
+
+Large payloads (alert lists, draft RCAs, Pass 2 context) are written to the blob
+store once and only their SHA-256 reference is kept in workflow history. Identical
+payloads share one blob, so repeating the same data across child workflows costs
+nothing in history or storage.
+
+Keep in sync with ein_agent_cli/blob_store.py - the CLI and the workers must use
+the same store.
+
+Configuration Format:
+    TEMPORAL_CLAIM_CHECK_BACKEND: 'none', 'filesystem' or 's3' (default: none)
+    TEMPORAL_CLAIM_CHECK_MIN_BYTES: Only offload larger payloads (default: 65536)
+    TEMPORAL_CLAIM_CHECK_PATH: Directory of the filesystem store (default: /tmp/ein-agent-blobs)
+    TEMPORAL_CLAIM_CHECK_S3_BUCKET: Bucket of the S3 store
+    TEMPORAL_CLAIM_CHECK_S3_ENDPOINT: Endpoint URL of an S3-compatible service (e.g. MinIO, Ceph RGW)
+    TEMPORAL_CLAIM_CHECK_S3_PREFIX: Key prefix in the bucket (default: ein-agent/)
+
+The s3 backend requires the optional `boto3` package and reads credentials from
+the standard AWS environment variables.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATH = "/tmp/ein-agent-blobs"
+DEFAULT_S3_PREFIX = "ein-agent/"
+
+
+def blob_key(data: bytes) -> str:
+    """Content address of a blob."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore(ABC):
+    """Content-addressed blob storage."""
+
+    @abstractmethod
+    def _put(self, key: str, data: bytes) -> None:
+        """Store a blob under its key (blocking)."""
+
+    @abstractmethod
+    def _get(self, key: str) -> bytes:
+        """Read a blob by key (blocking)."""
+
+    async def put(self, data: bytes) -> str:
+        """Store a blob and return its key."""
+        key = blob_key(data)
+        await asyncio.to_thread(self._put, key, data)
+        return key
+
+    async def get(self, key: str) -> bytes:
+        """Read a blob and verify its content address.
+
+        Raises:
+            ValueError: If the stored content does not match the key
+        """
+        data = await asyncio.to_thread(self._get, key)
+        if blob_key(data) != key:
+            raise ValueError(f"Blob {key} is corrupted (content hash mismatch)")
+        return data
+
+
+class FilesystemBlobStore(BlobStore):
+    """Blob store on a local or shared (e.g. NFS, PVC) filesystem."""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _blob_path(self, key: str) -> str:
+        # Fan out into sub-directories to keep directory listings small
+        return os.path.join(self.path, key[:2], key)
+
+    def _put(self, key: str, data: bytes) -> None:
+        path = self._blob_path(key)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a temporary file first so readers never see a partial blob. Each write
+        # gets its own file: concurrent writes of the same key all end with the same content.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f".{key}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            if os.path.exists(path):
+                # Another writer stored the same content
+                return
+            raise
+
+    def _get(self, key: str) -> bytes:
+        with open(self._blob_path(key), "rb") as f:
+            return f.read()
+
+
+class S3BlobStore(BlobStore):
+    """Blob store in an S3-compatible bucket."""
+
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None, prefix: str = DEFAULT_S3_PREFIX):
+        try:
+            import boto3
+        except ImportError as e:
+            raise RuntimeError("The s3 claim-check backend requires the boto3 package") from e
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+
+    def _put(self, key: str, data: bytes) -> None:
+        self.client.put_object(Bucket=self.bucket, Key=f"{self.prefix}{key}", Body=data)
+
+    def _get(self, key: str) -> bytes:
+        response = self.client.get_object(Bucket=self.bucket, Key=f"{self.prefix}{key}")
+        return response["Body"].read()
+
+
+def load_blob_store() -> Optional[BlobStore]:
+    """Create the blob store from TEMPORAL_CLAIM_CHECK_* environment variables.
+
+    Returns:
+        BlobStore instance, or None if claim-check is disabled
+    """
+    backend = os.getenv("TEMPORAL_CLAIM_CHECK_BACKEND", "none").lower()
+    if backend == "none":
+        return None
+    if backend == "filesystem":
+        path = os.getenv("TEMPORAL_CLAIM_CHECK_PATH", DEFAULT_PATH)
+        logger.info("Claim-check blob store: filesystem at %s", path)
+        return FilesystemBlobStore(path)
+    if backend == "s3":
+        bucket = os.getenv("TEMPORAL_CLAIM_CHECK_S3_BUCKET")
+        if not bucket:
+            raise ValueError("TEMPORAL_CLAIM_CHECK_S3_BUCKET is required for the s3 claim-check backend")
+        endpoint_url = os.getenv("TEMPORAL_CLAIM_CHECK_S3_ENDPOINT")
+        prefix = os.getenv("TEMPORAL_CLAIM_CHECK_S3_PREFIX", DEFAULT_S3_PREFIX)
+        logger.info("Claim-check blob store: s3://%s/%s (endpoint: %s)", bucket, prefix, endpoint_url or "default")
+        return S3BlobStore(bucket, endpoint_url=endpoint_url, prefix=prefix)
+    raise ValueError(f"Invalid TEMPORAL_CLAIM_CHECK_BACKEND '{backend}' (must be none, filesystem or s3)")
@@ -0,0 +1,209 @@
+"""Payload codecs for Temporal workflow and activity payloads.
+
+Alert lists, MCP tool outputs, draft RCAs and model transcripts are stored in
+workflow history as JSON. Payloads above a size threshold are compressed before
+they are sent to Temporal. Compressed payloads are always decoded, whatever the
+local setting, so workers and CLIs can enable compression independently.
+
+Keep in sync with ein_agent_cli/codec.py - both sides must agree on encodings.
+
+Configuration Format:
+    TEMPORAL_PAYLOAD_COMPRESSION: 'none', 'zlib' or 'zstd' (default: none)
+    TEMPORAL_PAYLOAD_COMPRESSION_MIN_BYTES: Only compress larger payloads (default: 4096)
+
+'zstd' requires the optional `zstandard` package and falls back to zlib without it.
+
+Payloads that are still large after compression can be offloaded to a blob store
+(claim-check, see ein_agent_worker.blob_store) so history only keeps a reference.
+"""
+
+import logging
+import os
+import time
+import zlib
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+from temporalio.api.common.v1 import Payload
+from temporalio.converter import PayloadCodec
+
+from ein_agent_worker.blob_store import BlobStore, load_blob_store
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+ENCODING_ZLIB = b"binary/zlib"
+ENCODING_ZSTD = b"binary/zstd"
+ENCODING_CLAIM_CHECK = b"claim-check/sha256"
+
+DEFAULT_MIN_BYTES = 4096
+DEFAULT_CLAIM_CHECK_MIN_BYTES = 64 * 1024
+
+# Log a compression summary every this many compressed payloads
+SUMMARY_INTERVAL = 100
+
+
+@dataclass
+class CodecStats:
+    """Cumulative compression statistics."""
+
+    compressed: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    encode_seconds: float = 0.0
+    decoded: int = 0
+    decode_seconds: float = 0.0
+
+    @property
+    def ratio(self) -> float:
+        """Compression ratio (original size / compressed size)."""
+        return self.bytes_in / self.bytes_out if self.bytes_out else 1.0
+
+    def summary(self) -> str:
+        """Human readable summary of the statistics."""
+        return (
+            f"{self.compressed} payload(s) compressed {self.bytes_in} -> {self.bytes_out} bytes "
+            f"({self.ratio:.1f}x) in {self.encode_seconds * 1000:.1f} ms, "
+            f"{self.decoded} decompressed in {self.decode_seconds * 1000:.1f} ms"
+        )
+
+
+class CompressionCodec(PayloadCodec):
+    """Payload codec compressing payloads above a size threshold."""
+
+    def __init__(self, algorithm: str = "zlib", min_bytes: int = DEFAULT_MIN_BYTES):
+        """Initialize the codec.
+
+        Args:
+            algorithm: 'zlib', 'zstd' or 'none' (decode only)
+            min_bytes: Payloads smaller than this are left uncompressed
+        """
+        if algorithm == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed, using zlib payload compression")
+            algorithm = "zlib"
+        self.algorithm = algorithm
+        self.min_bytes = min_bytes
+        self.stats = CodecStats()
+
+    @classmethod
+    def from_env(cls) -> "CompressionCodec":
+        """Create the codec from TEMPORAL_PAYLOAD_COMPRESSION* environment variables."""
+        algorithm = os.getenv("TEMPORAL_PAYLOAD_COMPRESSION", "none").lower()
+        if algorithm not in ("none", "zlib", "zstd"):
+            logger.error("Invalid TEMPORAL_PAYLOAD_COMPRESSION '%s' (must be none, zlib or zstd), disabling", algorithm)
+            algorithm = "none"
+        min_bytes = int(os.getenv("TEMPORAL_PAYLOAD_COMPRESSION_MIN_BYTES", str(DEFAULT_MIN_BYTES)))
+        logger.info("Payload compression: %s (min %d bytes)", algorithm, min_bytes)
+        return cls(algorithm, min_bytes)
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        return [self._encode_one(p) for p in payloads]
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        return [self._decode_one(p) for p in payloads]
+
+    def _encode_one(self, payload: Payload) -> Payload:
+        if self.algorithm == "none" or payload.ByteSize() < self.min_bytes:
+            return payload
+
+        start = time.perf_counter()
+        raw = payload.SerializeToString()
+        if self.algorithm == "zstd":
+            encoding, data = ENCODING_ZSTD, zstandard.ZstdCompressor().compress(raw)
+        else:
+            encoding, data = ENCODING_ZLIB, zlib.compress(raw)
+        elapsed = time.perf_counter() - start
+
+        if len(data) >= len(raw):
+            return payload
+
+        self.stats.compressed += 1
+        self.stats.bytes_in += len(raw)
+        self.stats.bytes_out += len(data)
+        self.stats.encode_seconds += elapsed
+        logger.debug(
+            "Compressed payload %d -> %d bytes (%.1fx) in %.2f ms",
+            len(raw), len(data), len(raw) / len(data), elapsed * 1000,
+        )
+        if self.stats.compressed % SUMMARY_INTERVAL == 0:
+            logger.info("Payload compression: %s", self.stats.summary())
+        return Payload(metadata={"encoding": encoding}, data=data)
+
+    def _decode_one(self, payload: Payload) -> Payload:
+        encoding = payload.metadata.get("encoding")
+        if encoding not in (ENCODING_ZLIB, ENCODING_ZSTD):
+            return payload
+
+        start = time.perf_counter()
+        if encoding == ENCODING_ZSTD:
+            if zstandard is None:
+                raise RuntimeError("Received a zstd compressed payload but zstandard is not installed")
+            raw = zstandard.ZstdDecompressor().decompress(payload.data)
+        else:
+            raw = zlib.decompress(payload.data)
+        self.stats.decoded += 1
+        self.stats.decode_seconds += time.perf_counter() - start
+        return Payload.FromString(raw)
+
+
+class ClaimCheckCodec(PayloadCodec):
+    """Payload codec offloading large payloads to a content-addressed blob store.
+
+    Payloads are first encoded by the inner codec (compression), so the size
+    threshold applies to the compressed payload.
+    """
+
+    def __init__(
+        self,
+        store: Optional[BlobStore],
+        min_bytes: int = DEFAULT_CLAIM_CHECK_MIN_BYTES,
+        inner: Optional[PayloadCodec] = None,
+    ):
+        """Initialize the codec.
+
+        Args:
+            store: Blob store, or None to only resolve references (decode only)
+            min_bytes: Payloads smaller than this stay inline in history
+            inner: Codec applied before offloading and after resolving
+        """
+        self.store = store
+        self.min_bytes = min_bytes
+        self.inner = inner
+
+    async def encode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        if self.inner:
+            payloads = await self.inner.encode(payloads)
+        return [await self._encode_one(p) for p in payloads]
+
+    async def decode(self, payloads: Sequence[Payload]) -> List[Payload]:
+        resolved = [await self._decode_one(p) for p in payloads]
+        if self.inner:
+            resolved = await self.inner.decode(resolved)
+        return resolved
+
+    async def _encode_one(self, payload: Payload) -> Payload:
+        if self.store is None or payload.ByteSize() < self.min_bytes:
+            return payload
+        data = payload.SerializeToString()
+        key = await self.store.put(data)
+        logger.debug("Offloaded %d byte payload to blob %s", len(data), key)
+        return Payload(metadata={"encoding": ENCODING_CLAIM_CHECK}, data=key.encode())
+
+    async def _decode_one(self, payload: Payload) -> Payload:
+        if payload.metadata.get("encoding") != ENCODING_CLAIM_CHECK:
+            return payload
+        if self.store is None:
+            raise RuntimeError("Received a claim-check payload but no blob store is configured")
+        return Payload.FromString(await self.store.get(payload.data.decode()))
+
+
+def build_payload_codec() -> Optional[PayloadCodec]:
+    """Build the payload codec used by the worker's Temporal client."""
+    codec = CompressionCodec.from_env()
+    store = load_blob_store()
+    min_bytes = int(os.getenv("TEMPORAL_CLAIM_CHECK_MIN_BYTES", str(DEFAULT_CLAIM_CHECK_MIN_BYTES)))
+    return ClaimCheckCodec(store, min_bytes=min_bytes, inner=codec)
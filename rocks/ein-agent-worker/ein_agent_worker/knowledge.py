@@ -0,0 +1,360 @@
+"""Persistent RCA knowledge index for Ein Agent workers.
+
+Accepted final RCA reports are stored in an embedded SQLite database, keyed by
+alert name, resource and root cause category, with an FTS5 full-text index over
+the alert and the root cause. Pass 1 agents get the top-k similar past RCAs as
+context; when a past RCA of the same alert and resource is close enough, recent
+and not a symptom of another failure, it is reused as the Pass 1 answer without
+calling the model.
+
+Similarity is lexical (token overlap of the alerts) by default. With an embedding
+model configured, it is the cosine similarity of local sentence embeddings.
+
+Configuration Format:
+    RCA_KNOWLEDGE_BACKEND: 'none' or 'sqlite' (default: none)
+    RCA_KNOWLEDGE_SQLITE_PATH: Database path (default: /tmp/ein-agent-knowledge.db)
+    RCA_KNOWLEDGE_TOP_K: Past RCAs given to the agent as context (default: 3)
+    RCA_KNOWLEDGE_MIN_SCORE: Minimum similarity of a past RCA given as context (default: 0.3)
+    RCA_KNOWLEDGE_CACHE_THRESHOLD: Minimum similarity to reuse a past RCA as the answer (default: 0.9, >1 disables)
+    RCA_KNOWLEDGE_CACHE_MAX_AGE: Max age in hours of a reused past RCA (default: 24)
+    RCA_KNOWLEDGE_MAX_ENTRIES: Oldest RCAs beyond this many are pruned (default: 10000)
+    RCA_KNOWLEDGE_EMBEDDING_MODEL: sentence-transformers model for vector similarity (default: none)
+
+The embedding model requires the optional `sentence-transformers` package. Mount
+the database on a shared volume to share the knowledge between worker replicas.
+
+Example:
+    export RCA_KNOWLEDGE_BACKEND="sqlite"
+    export RCA_KNOWLEDGE_SQLITE_PATH="/var/lib/ein-agent/knowledge.db"
+    export RCA_KNOWLEDGE_EMBEDDING_MODEL="all-MiniLM-L6-v2"
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import time
+from array import array
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from temporalio import activity
+
+from ein_agent_worker.workflows.knowledge import (
+    LOOKUP_ACTIVITY,
+    RECORD_ACTIVITY,
+    KnowledgeLookup,
+    KnowledgeMatch,
+)
+from ein_agent_worker.workflows.routing import parse_report
+
+logger = logging.getLogger(__name__)
+
+# Resource labels from the most to the least stable; pods are replaced on restart
+_RESOURCE_LABELS = (
+    "deployment",
+    "statefulset",
+    "daemonset",
+    "job",
+    "service",
+    "persistentvolumeclaim",
+    "node",
+    "persistentvolume",
+    "instance",
+    "pod",
+)
+_CLUSTER_RESOURCE_LABELS = ("node", "persistentvolume", "instance")
+
+# Labels that change on every occurrence of the same failure
+_VOLATILE_LABELS = ("pod", "uid", "container_id", "image_id", "endpoint", "prometheus", "receive")
+
+# Replica suffixes of pods owned by a Deployment (hash + id) or DaemonSet/Job (id)
+_POD_SUFFIX = re.compile(r"(-[0-9a-f]{6,10})?-[0-9a-z]{5}$")
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Candidates scored per lookup, from full-text search and from the same alert name
+_CANDIDATES = 50
+
+# Weight of text similarity and of matching keys in the score of a past RCA
+_TEXT_WEIGHT = 0.5
+_ALERTNAME_WEIGHT = 0.3
+_RESOURCE_WEIGHT = 0.2
+
+
+class KnowledgeConfig:
+    """RCA knowledge index configuration loaded from environment variables."""
+
+    def __init__(self):
+        """Initialize knowledge index configuration from environment."""
+        self.backend: str = os.getenv("RCA_KNOWLEDGE_BACKEND", "none").lower()
+        self.sqlite_path: str = os.getenv("RCA_KNOWLEDGE_SQLITE_PATH", "/tmp/ein-agent-knowledge.db")
+        self.top_k: int = int(os.getenv("RCA_KNOWLEDGE_TOP_K", "3"))
+        self.min_score: float = float(os.getenv("RCA_KNOWLEDGE_MIN_SCORE", "0.3"))
+        self.cache_threshold: float = float(os.getenv("RCA_KNOWLEDGE_CACHE_THRESHOLD", "0.9"))
+        self.cache_max_age: float = float(os.getenv("RCA_KNOWLEDGE_CACHE_MAX_AGE", "24"))
+        self.max_entries: int = int(os.getenv("RCA_KNOWLEDGE_MAX_ENTRIES", "10000"))
+        self.embedding_model: Optional[str] = os.getenv("RCA_KNOWLEDGE_EMBEDDING_MODEL") or None
+
+        if self.backend not in ("none", "sqlite"):
+            logger.error("Invalid RCA_KNOWLEDGE_BACKEND '%s' (must be 'none' or 'sqlite'), disabling", self.backend)
+            self.backend = "none"
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the knowledge index is enabled."""
+        return self.backend == "sqlite"
+
+
+def resource_key(alert: Dict[str, Any]) -> str:
+    """Most stable resource an alert refers to, as 'kind:namespace/name' (or 'kind:name')."""
+    labels = alert.get("labels", {})
+    for kind in _RESOURCE_LABELS:
+        name = labels.get(kind)
+        if not name:
+            continue
+        if kind == "pod":
+            name = _POD_SUFFIX.sub("", name)
+        if kind in _CLUSTER_RESOURCE_LABELS:
+            return f"{kind}:{name}"
+        return f"{kind}:{labels.get('namespace', '')}/{name}"
+    return ""
+
+
+def alert_text(alert: Dict[str, Any]) -> str:
+    """Text describing an alert for similarity, without labels that change per occurrence."""
+    labels = alert.get("labels", {})
+    annotations = alert.get("annotations", {})
+    parts = [alert.get("alertname", "")]
+    parts += [f"{key} {value}" for key, value in sorted(labels.items()) if key not in _VOLATILE_LABELS]
+    parts += [annotations.get("summary", ""), annotations.get("description", "")]
+    parts.append(resource_key(alert))
+    return " ".join(part for part in parts if part)
+
+
+def _tokens(text: str) -> Set[str]:
+    return set(_TOKEN.findall(text.lower()))
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    return len(a & b) / len(a | b) if a and b else 0.0
+
+
+def _cosine(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return max(0.0, dot / norm) if norm else 0.0
+
+
+class Embedder:
+    """Local sentence embeddings (sentence-transformers)."""
+
+    def __init__(self, model_name: str):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise RuntimeError("RCA_KNOWLEDGE_EMBEDDING_MODEL requires the sentence-transformers package") from e
+        self.model = SentenceTransformer(model_name)
+
+    def embed(self, text: str) -> List[float]:
+        return [float(x) for x in self.model.encode(text)]
+
+
+class RcaKnowledgeIndex:
+    """SQLite index of past final RCA reports."""
+
+    def __init__(self, path: str, embedder: Optional[Embedder] = None, max_entries: int = 10000):
+        self._path = path
+        self._embedder = embedder
+        self._max_entries = max_entries
+        conn = self._connect()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rca_reports ("
+                "id INTEGER PRIMARY KEY, alertname TEXT NOT NULL, resource TEXT NOT NULL, "
+                "category TEXT NOT NULL, fingerprint TEXT NOT NULL, alert_text TEXT NOT NULL, "
+                "summary TEXT NOT NULL, report TEXT NOT NULL, is_symptom INTEGER NOT NULL, "
+                "created_at REAL NOT NULL, embedding BLOB)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS rca_reports_key ON rca_reports (alertname, resource, category)"
+            )
+            try:
+                conn.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS rca_reports_fts USING fts5(alert_text, summary, category)"
+                )
+                self._fts = True
+            except sqlite3.OperationalError:
+                logger.warning("SQLite has no FTS5 support, RCA knowledge lookups only match by alert name")
+                self._fts = False
+        finally:
+            conn.close()
+
+    @classmethod
+    def from_config(cls, config: KnowledgeConfig) -> Optional["RcaKnowledgeIndex"]:
+        """Create the index, or None if it is disabled."""
+        if not config.enabled:
+            logger.info("RCA knowledge index disabled")
+            return None
+        embedder = Embedder(config.embedding_model) if config.embedding_model else None
+        logger.info(
+            "RCA knowledge index: %s (similarity: %s)",
+            config.sqlite_path,
+            config.embedding_model or "lexical",
+        )
+        return cls(config.sqlite_path, embedder=embedder, max_entries=config.max_entries)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=10, isolation_level=None)
+
+    def add(self, alert: Dict[str, Any], report: Dict[str, Any]) -> None:
+        """Store a final RCA report (blocking)."""
+        text = alert_text(alert)
+        summary = str(report.get("root_cause_summary") or "")
+        category = str(report.get("root_cause_category") or "")
+        embedding = None
+        if self._embedder is not None:
+            embedding = array("f", self._embedder.embed(f"{text} {summary}")).tobytes()
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            cursor = conn.execute(
+                "INSERT INTO rca_reports (alertname, resource, category, fingerprint, alert_text, summary, "
+                "report, is_symptom, created_at, embedding) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    alert.get("alertname", "unknown"),
+                    resource_key(alert),
+                    category,
+                    alert.get("fingerprint", ""),
+                    text,
+                    summary,
+                    json.dumps(report, indent=2),
+                    int(bool(report.get("is_symptom"))),
+                    time.time(),
+                    embedding,
+                ),
+            )
+            if self._fts:
+                conn.execute(
+                    "INSERT INTO rca_reports_fts (rowid, alert_text, summary, category) VALUES (?, ?, ?, ?)",
+                    (cursor.lastrowid, text, summary, category),
+                )
+            self._prune(conn)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        row = conn.execute("SELECT id FROM rca_reports ORDER BY id DESC LIMIT 1 OFFSET ?", (self._max_entries,)).fetchone()
+        if row is None:
+            return
+        conn.execute("DELETE FROM rca_reports WHERE id <= ?", (row[0],))
+        if self._fts:
+            conn.execute("DELETE FROM rca_reports_fts WHERE rowid <= ?", (row[0],))
+
+    def search(self, alert: Dict[str, Any], top_k: int) -> List[Tuple[KnowledgeMatch, bool]]:
+        """Find the past RCAs most similar to an alert (blocking).
+
+        Returns:
+            (match, is_symptom) for up to top_k past RCAs, most similar first
+        """
+        alertname = alert.get("alertname", "unknown")
+        resource = resource_key(alert)
+        text = alert_text(alert)
+        tokens = _tokens(text)
+        query_embedding = self._embedder.embed(text) if self._embedder is not None else None
+
+        columns = "r.id, r.alertname, r.resource, r.category, r.alert_text, r.summary, r.report, r.is_symptom, r.created_at, r.embedding"
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                f"SELECT {columns} FROM rca_reports r WHERE r.alertname = ? ORDER BY r.id DESC LIMIT ?",
+                (alertname, _CANDIDATES),
+            ).fetchall()
+            if self._fts and tokens:
+                match_query = " OR ".join(f'"{token}"' for token in sorted(tokens))
+                rows += conn.execute(
+                    f"SELECT {columns} FROM rca_reports_fts f JOIN rca_reports r ON r.id = f.rowid "
+                    "WHERE rca_reports_fts MATCH ? ORDER BY bm25(rca_reports_fts) LIMIT ?",
+                    (match_query, _CANDIDATES),
+                ).fetchall()
+        finally:
+            conn.close()
+
+        now = time.time()
+        scored: Dict[int, Tuple[KnowledgeMatch, bool]] = {}
+        for row_id, r_alertname, r_resource, category, r_text, summary, report, is_symptom, created_at, embedding in rows:
+            if row_id in scored:
+                continue
+            if query_embedding is not None and embedding is not None:
+                similarity = _cosine(query_embedding, array("f", embedding))
+            else:
+                similarity = _jaccard(tokens, _tokens(r_text))
+            score = (
+                _TEXT_WEIGHT * similarity
+                + _ALERTNAME_WEIGHT * (r_alertname == alertname)
+                + _RESOURCE_WEIGHT * (bool(resource) and r_resource == resource)
+            )
+            match = KnowledgeMatch(
+                alertname=r_alertname,
+                resource=r_resource,
+                category=category,
+                summary=summary,
+                report=report,
+                score=round(score, 3),
+                age_hours=(now - created_at) / 3600,
+            )
+            scored[row_id] = (match, bool(is_symptom))
+
+        ranked = sorted(scored.values(), key=lambda item: (item[0].score, -item[0].age_hours), reverse=True)
+        return ranked[:top_k]
+
+
+class KnowledgeActivities:
+    """Local activities giving workflows access to the worker's RCA knowledge index."""
+
+    def __init__(self, config: KnowledgeConfig, index: Optional[RcaKnowledgeIndex]):
+        self._config = config
+        self._index = index
+
+    @activity.defn(name=LOOKUP_ACTIVITY)
+    async def lookup_similar_rcas(self, alert: Dict[str, Any]) -> KnowledgeLookup:
+        """Top-k similar past RCAs of an alert, and the one to reuse as the answer if any."""
+        if self._index is None:
+            return KnowledgeLookup()
+        ranked = await asyncio.to_thread(self._index.search, alert, self._config.top_k)
+        matches = [match for match, _ in ranked if match.score >= self._config.min_score]
+
+        cached = None
+        if ranked:
+            best, is_symptom = ranked[0]
+            # Symptoms depend on the other failures of their incident, so only root causes are reused
+            if (
+                best.score >= self._config.cache_threshold
+                and best.age_hours <= self._config.cache_max_age
+                and not is_symptom
+            ):
+                cached = best
+        logger.info(
+            "RCA knowledge lookup for %s: %d similar past RCAs%s",
+            alert.get("alertname", "unknown"),
+            len(matches),
+            f", reusing one with similarity {cached.score}" if cached else "",
+        )
+        return KnowledgeLookup(matches=matches, cached=cached)
+
+    @activity.defn(name=RECORD_ACTIVITY)
+    async def record_rca(self, alert: Dict[str, Any], report: str) -> None:
+        """Store a final RCA report of an alert."""
+        if self._index is None:
+            return
+        parsed = parse_report(report)
+        if parsed is None:
+            logger.debug("Not recording RCA for %s: not a JSON report", alert.get("alertname", "unknown"))
+            return
+        await asyncio.to_thread(self._index.add, alert, parsed)
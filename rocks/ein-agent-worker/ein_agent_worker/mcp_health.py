@@ -0,0 +1,147 @@
+"""Health tracking and circuit breakers for MCP servers.
+
+Every MCP tool call made by the worker is timed and recorded per server. When a
+server fails repeatedly (or is consistently too slow), its circuit breaker opens:
+new agents no longer see the server's tools and calls already planned by running
+agents fail immediately instead of waiting for timeouts. A background probe
+retries the server and closes the breaker once it answers again.
+
+Configuration Format:
+    MCP_BREAKER_ENABLED: Enable circuit breakers (default: true)
+    MCP_BREAKER_FAILURES: Consecutive failures that open the breaker (default: 5)
+    MCP_BREAKER_ERROR_RATE: Error rate over the window that opens the breaker (default: 0.5)
+    MCP_BREAKER_WINDOW: Number of recent calls the error rate and latency cover (default: 20)
+    MCP_BREAKER_SLOW_CALL_SECONDS: Calls slower than this count as failures (default: 30)
+    MCP_BREAKER_PROBE_INTERVAL: Seconds between probes of an open server (default: 30)
+
+Example:
+    export MCP_BREAKER_FAILURES="3"
+    export MCP_BREAKER_PROBE_INTERVAL="60"
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# The error rate is only meaningful once the window holds a few calls
+MIN_CALLS_FOR_ERROR_RATE = 10
+
+
+class CircuitBreakerConfig:
+    """MCP circuit breaker configuration loaded from environment variables."""
+
+    def __init__(self):
+        """Initialize circuit breaker configuration from environment."""
+        self.enabled: bool = os.getenv("MCP_BREAKER_ENABLED", "true").lower() == "true"
+        self.failure_threshold: int = int(os.getenv("MCP_BREAKER_FAILURES", "5"))
+        self.error_rate: float = float(os.getenv("MCP_BREAKER_ERROR_RATE", "0.5"))
+        self.window: int = int(os.getenv("MCP_BREAKER_WINDOW", "20"))
+        self.slow_call_seconds: float = float(os.getenv("MCP_BREAKER_SLOW_CALL_SECONDS", "30"))
+        self.probe_interval: float = float(os.getenv("MCP_BREAKER_PROBE_INTERVAL", "30"))
+
+
+class CircuitBreaker:
+    """Latency and error tracking for one MCP server, with a circuit breaker.
+
+    The breaker is shared by all clients of the server within the worker. While it
+    is open, a single background task probes the server every probe_interval.
+    """
+
+    def __init__(
+        self,
+        server_name: str,
+        config: CircuitBreakerConfig,
+        probe: Callable[[], Awaitable[Any]],
+    ):
+        self._server_name = server_name
+        self._config = config
+        self._probe = probe
+        self._outcomes: Deque[bool] = deque(maxlen=max(1, config.window))
+        self._latencies: Deque[float] = deque(maxlen=max(1, config.window))
+        self._consecutive_failures = 0
+        self._opened_at: Optional[float] = None
+        self._probe_task: Optional[asyncio.Task] = None
+
+    @property
+    def is_open(self) -> bool:
+        """Whether calls to the server are currently rejected."""
+        return self._opened_at is not None
+
+    def record_success(self, latency: float) -> None:
+        """Record a completed call. Calls slower than slow_call_seconds count as failures."""
+        if latency > self._config.slow_call_seconds:
+            self.record_failure(latency, f"slow call ({latency:.1f}s)")
+            return
+        self._consecutive_failures = 0
+        self._outcomes.append(True)
+        self._latencies.append(latency)
+
+    def record_failure(self, latency: float, error: Any) -> None:
+        """Record a failed call and open the breaker when the thresholds are exceeded."""
+        self._consecutive_failures += 1
+        self._outcomes.append(False)
+        self._latencies.append(latency)
+        logger.debug("MCP server %s call failed after %.2fs: %s", self._server_name, latency, error)
+
+        if not self._config.enabled or self.is_open:
+            return
+        if self._consecutive_failures >= self._config.failure_threshold or (
+            len(self._outcomes) >= min(MIN_CALLS_FOR_ERROR_RATE, self._outcomes.maxlen)
+            and self.error_rate >= self._config.error_rate
+        ):
+            self._open(error)
+
+    @property
+    def error_rate(self) -> float:
+        """Share of failed calls in the window."""
+        if not self._outcomes:
+            return 0.0
+        return self._outcomes.count(False) / len(self._outcomes)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current health of the server, for logging."""
+        latencies = sorted(self._latencies)
+        return {
+            "state": "open" if self.is_open else "closed",
+            "calls": len(self._outcomes),
+            "error_rate": round(self.error_rate, 2),
+            "avg_latency": round(sum(latencies) / len(latencies), 3) if latencies else None,
+            "p95_latency": round(latencies[int(0.95 * (len(latencies) - 1))], 3) if latencies else None,
+        }
+
+    def _open(self, error: Any) -> None:
+        self._opened_at = time.monotonic()
+        logger.warning(
+            "Opening circuit breaker of MCP server %s, its tools are hidden from agents until it recovers "
+            "(last error: %s, health: %s)",
+            self._server_name,
+            error,
+            self.stats(),
+        )
+        if self._probe_task is None or self._probe_task.done():
+            self._probe_task = asyncio.get_running_loop().create_task(self._probe_until_healthy())
+
+    def _close(self) -> None:
+        downtime = time.monotonic() - self._opened_at if self._opened_at is not None else 0.0
+        self._opened_at = None
+        self._consecutive_failures = 0
+        self._outcomes.clear()
+        self._latencies.clear()
+        logger.info("Closing circuit breaker of MCP server %s after %.0fs", self._server_name, downtime)
+
+    async def _probe_until_healthy(self) -> None:
+        while self.is_open:
+            await asyncio.sleep(self._config.probe_interval)
+            started = time.monotonic()
+            try:
+                await asyncio.wait_for(self._probe(), timeout=self._config.slow_call_seconds)
+            except Exception as e:
+                logger.info("Probe of MCP server %s failed: %s", self._server_name, e)
+                continue
+            logger.info("Probe of MCP server %s succeeded in %.2fs", self._server_name, time.monotonic() - started)
+            self._close()
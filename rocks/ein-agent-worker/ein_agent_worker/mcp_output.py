@@ -0,0 +1,176 @@
+"""Output size policies applied to MCP tool results at the worker boundary.
+
+A single Loki query or pod list can return megabytes. Tool results are reduced
+inside the MCP activity, before they become Temporal payloads or model context.
+
+Configuration Format (per server, with optional per tool overrides):
+    MCP_{SERVER}_OUTPUT_MAX_BYTES: Max UTF-8 bytes of text per result (default: 262144)
+    MCP_{SERVER}_OUTPUT_MAX_LINES: Max lines of text per result (default: unlimited)
+    MCP_{SERVER}_OUTPUT_SAMPLING: Which part to keep - 'head', 'tail' or 'head_tail' (default: head_tail)
+    MCP_{SERVER}_OUTPUT_DEDUPE: Collapse consecutive repeated lines with counts (default: false)
+    MCP_{SERVER}_TOOL_{TOOL}_OUTPUT_*: Same settings for a single tool, overriding the server's
+
+Example:
+    export MCP_GRAFANA_OUTPUT_MAX_BYTES="65536"
+    export MCP_GRAFANA_TOOL_QUERY_LOKI_LOGS_OUTPUT_DEDUPE="true"
+    export MCP_GRAFANA_TOOL_QUERY_LOKI_LOGS_OUTPUT_SAMPLING="tail"
+"""
+
+import dataclasses
+import logging
+import os
+import re
+from dataclasses import dataclass
+from typing import List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 256 * 1024
+
+SAMPLING_MODES = ("head", "tail", "head_tail")
+
+# Timestamps, hex ids and numbers are ignored when comparing log lines for dedupe
+_VOLATILE_PATTERN = re.compile(
+    r"\d{4}-\d{2}-\d{2}[T ][\d:.,]+(Z|[+-]\d{2}:?\d{2})?|\b0x[0-9a-f]+\b|\b[0-9a-f]{8,}\b|\d+",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class OutputPolicy:
+    """Size policy for the text of an MCP tool result.
+
+    Attributes:
+        max_bytes: Max UTF-8 bytes of text kept (None for unlimited)
+        max_lines: Max lines of text kept (None for unlimited)
+        sampling: Which part of oversized text to keep ('head', 'tail' or 'head_tail')
+        dedupe: Whether to collapse consecutive repeated lines with counts
+    """
+
+    max_bytes: Optional[int] = DEFAULT_MAX_BYTES
+    max_lines: Optional[int] = None
+    sampling: str = "head_tail"
+    dedupe: bool = False
+
+    def apply(self, text: str) -> str:
+        """Apply the policy to a block of text."""
+        if self.dedupe:
+            text = dedupe_lines(text)
+        if self.max_lines is not None:
+            text = _sample_lines(text, self.max_lines, self.sampling)
+        if self.max_bytes is not None:
+            text = _sample_bytes(text, self.max_bytes, self.sampling)
+        return text
+
+
+def load_output_policy(
+    prefix: str,
+    base: Optional[OutputPolicy] = None,
+    env: Optional[Mapping[str, str]] = None,
+) -> Optional[OutputPolicy]:
+    """Load an output policy from `{prefix}OUTPUT_*` environment variables.
+
+    Args:
+        prefix: Environment prefix, e.g. 'MCP_GRAFANA_' or 'MCP_GRAFANA_TOOL_QUERY_LOKI_LOGS_'
+        base: Policy providing the values that are not set. When given, None is returned
+            if no variable overrides it.
+        env: Variables to read instead of the process environment
+
+    Returns:
+        OutputPolicy instance, or None if `base` is given and nothing is overridden
+    """
+    env = os.environ if env is None else env
+    values = {
+        "max_bytes": env.get(f"{prefix}OUTPUT_MAX_BYTES"),
+        "max_lines": env.get(f"{prefix}OUTPUT_MAX_LINES"),
+        "sampling": env.get(f"{prefix}OUTPUT_SAMPLING"),
+        "dedupe": env.get(f"{prefix}OUTPUT_DEDUPE"),
+    }
+    if base is not None and all(value is None for value in values.values()):
+        return None
+
+    policy = dataclasses.replace(base) if base is not None else OutputPolicy()
+    for key in ("max_bytes", "max_lines"):
+        value = values[key]
+        if value is None:
+            continue
+        # 0 or a negative value disables the limit
+        try:
+            setattr(policy, key, int(value) if int(value) > 0 else None)
+        except ValueError:
+            logger.error("Invalid %sOUTPUT_%s '%s' (must be an integer), ignoring", prefix, key.upper(), value)
+
+    if values["sampling"] is not None:
+        sampling = values["sampling"].lower()
+        if sampling in SAMPLING_MODES:
+            policy.sampling = sampling
+        else:
+            logger.error("Invalid %sOUTPUT_SAMPLING '%s' (must be one of %s), ignoring", prefix, sampling, SAMPLING_MODES)
+
+    if values["dedupe"] is not None:
+        policy.dedupe = values["dedupe"].lower() == "true"
+
+    return policy
+
+
+def dedupe_lines(text: str) -> str:
+    """Collapse runs of lines that only differ by timestamps, ids or numbers."""
+    lines = text.splitlines()
+    if len(lines) < 2:
+        return text
+
+    result: List[str] = []
+    run_key = None
+    run_count = 0
+    for line in lines:
+        key = _VOLATILE_PATTERN.sub("#", line)
+        if key == run_key:
+            run_count += 1
+            continue
+        if run_count > 1:
+            result.append(f"[previous line repeated {run_count - 1} more times]")
+        result.append(line)
+        run_key = key
+        run_count = 1
+    if run_count > 1:
+        result.append(f"[previous line repeated {run_count - 1} more times]")
+    return "\n".join(result)
+
+
+def _sample_lines(text: str, max_lines: int, sampling: str) -> str:
+    lines = text.splitlines()
+    if len(lines) <= max_lines:
+        return text
+
+    omitted = len(lines) - max_lines
+    marker = f"[... {omitted} of {len(lines)} lines omitted ...]"
+    if sampling == "head":
+        kept = lines[:max_lines] + [marker]
+    elif sampling == "tail":
+        kept = [marker] + lines[-max_lines:]
+    else:
+        head = (max_lines + 1) // 2
+        tail = max_lines - head
+        kept = lines[:head] + [marker] + (lines[-tail:] if tail else [])
+    return "\n".join(kept)
+
+
+def _sample_bytes(text: str, max_bytes: int, sampling: str) -> str:
+    data = text.encode("utf-8")
+    if len(data) <= max_bytes:
+        return text
+
+    omitted = len(data) - max_bytes
+    marker = f"\n[... {omitted} of {len(data)} bytes omitted ...]\n"
+    # errors="ignore" drops a multi-byte character cut at the boundary
+    if sampling == "head":
+        return data[:max_bytes].decode("utf-8", errors="ignore") + marker
+    if sampling == "tail":
+        return marker + data[-max_bytes:].decode("utf-8", errors="ignore")
+    head = max_bytes // 2
+    tail = max_bytes - head
+    return (
+        data[:head].decode("utf-8", errors="ignore")
+        + marker
+        + data[-tail:].decode("utf-8", errors="ignore")
+    )
@@ -2,6 +2,8 @@
 
 This module provides a configuration-driven approach for registering MCP servers.
 MCP servers are configured entirely via environment variables - no code changes needed.
+The same variables can instead be kept in a config file that the worker reloads while
+running (see ein_agent_worker.mcp_reload).
 
 Configuration Format:
     MCP_SERVERS: Comma-separated list of server names (e.g., "kubernetes,grafana")
@@ -9,6 +11,14 @@ Configuration Format:
     MCP_{SERVER}_ENABLED: Enable/disable the server (default: true)
     MCP_{SERVER}_TRANSPORT: Transport type - 'http' or 'sse' (default: http)
     MCP_{SERVER}_ALLOWED_TOOLS: Comma-separated list of allowed tools (optional)
+    MCP_{SERVER}_PROFILE_{CATEGORY}_TOOLS: Comma-separated tools exposed to agents investigating
+        alerts of CATEGORY (pod, node, storage, general). Unprofiled categories get all allowed tools.
+    MCP_{SERVER}_OUTPUT_* / MCP_{SERVER}_TOOL_{TOOL}_OUTPUT_*: Tool result size policy
+        (see ein_agent_worker.mcp_output)
+    MCP_{SERVER}_MAX_CONCURRENCY: Maximum concurrent tool calls to the server from this
+        worker (default: 8). Agents issue the tool calls of a turn in parallel; calls
+        beyond the limit wait for a free slot.
+    MCP_BREAKER_*: Circuit breaker thresholds shared by all servers (see ein_agent_worker.mcp_health)
 
 Example:
     export MCP_SERVERS="kubernetes,grafana"
@@ -16,20 +26,40 @@ Example:
     export MCP_KUBERNETES_ENABLED="true"
     export MCP_KUBERNETES_TRANSPORT="http"
     export MCP_KUBERNETES_ALLOWED_TOOLS="get_pods,create_deployment"
+    export MCP_KUBERNETES_PROFILE_NODE_TOOLS="nodes_top,nodes_log,resources_get,events_list"
+    export MCP_KUBERNETES_MAX_CONCURRENCY="4"
     export MCP_GRAFANA_URL="http://grafana-mcp:8000/sse"
     export MCP_GRAFANA_TRANSPORT="sse"
 """
 
+import asyncio
 import logging
 import os
-from dataclasses import dataclass
-from typing import List, Optional
-
-from agents.mcp import MCPServerStreamableHttp, MCPServerSse, create_static_tool_filter
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+import json
+
+from agents.mcp import MCPServer, MCPServerStreamableHttp, MCPServerSse
+from mcp.types import CallToolResult, TextContent
+from temporalio import activity
+from temporalio.common import RawValue
 from temporalio.contrib.openai_agents import StatelessMCPServerProvider
+from temporalio.exceptions import ApplicationError
+
+from ein_agent_worker.mcp_health import CircuitBreaker, CircuitBreakerConfig
+from ein_agent_worker.mcp_output import OutputPolicy, load_output_policy
+
+try:
+    import yaml
+except ImportError:  # pragma: no cover - JSON config files still work
+    yaml = None
 
 logger = logging.getLogger(__name__)
 
+# Activity name suffixes of the stateless MCP provider, see StatelessMCPServerProvider
+_STATELESS_SUFFIX = "-stateless-"
+
 
 @dataclass
 class MCPServerConfig:
@@ -41,6 +71,11 @@ class MCPServerConfig:
         enabled: Whether the server is enabled
         allowed_tools: Optional list of allowed tool names
         transport: Transport type to use ('http' or 'sse')
+        tool_profiles: Tools exposed per alert category, keyed by lowercase category
+        output_policy: Size policy applied to tool results
+        tool_output_policies: Per tool overrides of output_policy, keyed by tool name
+        max_concurrency: Maximum concurrent tool calls to the server from this worker
+        breaker_config: Circuit breaker thresholds
     """
 
     name: str
@@ -48,22 +83,107 @@ class MCPServerConfig:
     enabled: bool = True
     allowed_tools: Optional[List[str]] = None
     transport: str = "http"
+    tool_profiles: Dict[str, List[str]] = field(default_factory=dict)
+    output_policy: OutputPolicy = field(default_factory=OutputPolicy)
+    tool_output_policies: Dict[str, OutputPolicy] = field(default_factory=dict)
+    max_concurrency: int = 8
+    breaker_config: CircuitBreakerConfig = field(default_factory=CircuitBreakerConfig, repr=False, compare=False)
+    _call_slots: Optional[asyncio.Semaphore] = field(default=None, init=False, repr=False, compare=False)
+    _breaker: Optional[CircuitBreaker] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def call_slots(self) -> asyncio.Semaphore:
+        """Semaphore bounding concurrent tool calls, shared by all clients of the server."""
+        if self._call_slots is None:
+            self._call_slots = asyncio.Semaphore(self.max_concurrency)
+        return self._call_slots
+
+    @property
+    def breaker(self) -> CircuitBreaker:
+        """Health tracker and circuit breaker, shared by all clients of the server."""
+        if self._breaker is None:
+            self._breaker = CircuitBreaker(self.name, self.breaker_config, probe=lambda: probe_mcp_server(self))
+        return self._breaker
+
+    def output_policy_for(self, tool_name: str) -> OutputPolicy:
+        """Get the output policy for a tool, falling back to the server policy."""
+        key = tool_name.upper().replace("-", "_")
+        return self.tool_output_policies.get(key, self.output_policy)
+
+    def tools_for_profile(self, profile: Optional[str]) -> Optional[List[str]]:
+        """Get the tools exposed for an alert category profile.
+
+        Profiles are restricted to allowed_tools when both are configured.
+        Returns None when no filtering applies.
+        """
+        profile_tools = self.tool_profiles.get(profile.lower()) if profile else None
+        if profile_tools is None:
+            return self.allowed_tools
+        if self.allowed_tools is None:
+            return profile_tools
+        return [tool for tool in profile_tools if tool in self.allowed_tools]
 
 
 class MCPConfig:
     """Global MCP configuration loaded from environment variables.
 
-    This object is created once and can be passed to workers and workflows.
+    This object is created once and can be passed to workers and workflows. Its
+    servers can be replaced at runtime (see update), so look servers up by name
+    when they are used instead of keeping a server config around.
     """
 
-    def __init__(self):
-        """Initialize MCP configuration from environment."""
+    def __init__(self, env: Optional[Mapping[str, str]] = None):
+        """Initialize MCP configuration from environment.
+
+        Args:
+            env: Variables to read instead of the process environment
+        """
+        self._env = os.environ if env is None else env
         self.servers: List[MCPServerConfig] = []
+        self.breaker_config = CircuitBreakerConfig()
         self._load_from_env()
 
+    @classmethod
+    def from_file(cls, path: str) -> "MCPConfig":
+        """Load MCP configuration from a file shaped like example-environment.yaml.
+
+        The file holds an ``env`` list of ``name``/``value`` entries. Its values
+        override the process environment.
+
+        Raises:
+            ValueError: If the file cannot be parsed
+            OSError: If the file cannot be read
+        """
+        return cls(env={**os.environ, **load_env_file(path)})
+
+    def update(self, other: "MCPConfig") -> Dict[str, List[str]]:
+        """Replace the servers with those of another config in one step.
+
+        Unchanged servers keep their config object, and with it their concurrency
+        slots and circuit breaker. Calls in flight finish on the config they started with.
+
+        Returns:
+            Names of the 'added', 'removed' and 'changed' servers
+        """
+        current = {server.name: server for server in self.servers}
+        servers = []
+        changes: Dict[str, List[str]] = {"added": [], "removed": [], "changed": []}
+        for server in other.servers:
+            previous = current.pop(server.name, None)
+            if previous is None:
+                changes["added"].append(server.name)
+            elif previous != server:
+                changes["changed"].append(server.name)
+            else:
+                server = previous
+            servers.append(server)
+        changes["removed"] = list(current)
+        self.servers = servers
+        return changes
+
     def _load_from_env(self) -> None:
         """Load MCP server configurations from environment variables."""
-        servers_config = os.getenv("MCP_SERVERS", "")
+        servers_config = self._env.get("MCP_SERVERS", "")
         if not servers_config:
             logger.info("MCP_SERVERS not set, no MCP servers configured")
             return
@@ -88,11 +208,11 @@ class MCPConfig:
 
         # Check if enabled
         enabled_key = f"MCP_{server_key}_ENABLED"
-        enabled = os.getenv(enabled_key, "true").lower() == "true"
+        enabled = self._env.get(enabled_key, "true").lower() == "true"
 
         # Get URL (required)
         url_key = f"MCP_{server_key}_URL"
-        url = os.getenv(url_key)
+        url = self._env.get(url_key)
 
         if not url:
             logger.warning("MCP server '%s' missing required %s, skipping", server_name, url_key)
@@ -105,7 +225,7 @@ class MCPConfig:
 
         # Get transport type (default: http)
         transport_key = f"MCP_{server_key}_TRANSPORT"
-        transport = os.getenv(transport_key, "http").lower()
+        transport = self._env.get(transport_key, "http").lower()
 
         # Validate transport type
         if transport not in ("http", "sse"):
@@ -114,18 +234,55 @@ class MCPConfig:
 
         # Get optional tool filtering
         allowed_tools_key = f"MCP_{server_key}_ALLOWED_TOOLS"
-        allowed_tools_str = os.getenv(allowed_tools_key)
+        allowed_tools_str = self._env.get(allowed_tools_key)
         allowed_tools = None
 
         if allowed_tools_str:
             allowed_tools = [tool.strip() for tool in allowed_tools_str.split(",") if tool.strip()]
 
+        # Get optional per alert category tool profiles
+        profile_prefix = f"MCP_{server_key}_PROFILE_"
+        tool_profiles = {}
+        for key, value in self._env.items():
+            if key.startswith(profile_prefix) and key.endswith("_TOOLS"):
+                category = key[len(profile_prefix):-len("_TOOLS")].lower()
+                tool_profiles[category] = [tool.strip() for tool in value.split(",") if tool.strip()]
+
+        if tool_profiles:
+            logger.info("MCP server '%s' tool profiles: %s", server_name, ", ".join(sorted(tool_profiles)))
+
+        # Get tool result size policy, with optional per tool overrides
+        output_policy = load_output_policy(f"MCP_{server_key}_", env=self._env)
+        tool_prefix = f"MCP_{server_key}_TOOL_"
+        tool_output_policies = {}
+        for key in self._env:
+            if key.startswith(tool_prefix) and "_OUTPUT_" in key:
+                tool_key = key[len(tool_prefix):key.rindex("_OUTPUT_")]
+                if tool_key not in tool_output_policies:
+                    tool_output_policies[tool_key] = load_output_policy(f"{tool_prefix}{tool_key}_", base=output_policy, env=self._env)
+
+        # Get the concurrent tool call limit
+        max_concurrency_key = f"MCP_{server_key}_MAX_CONCURRENCY"
+        try:
+            max_concurrency = int(self._env.get(max_concurrency_key, "8"))
+        except ValueError:
+            logger.error("MCP server '%s' has invalid %s, using 8", server_name, max_concurrency_key)
+            max_concurrency = 8
+        if max_concurrency < 1:
+            logger.error("MCP server '%s' has %s below 1, using 1", server_name, max_concurrency_key)
+            max_concurrency = 1
+
         return MCPServerConfig(
             name=server_name,
             url=url,
             enabled=enabled,
             allowed_tools=allowed_tools,
             transport=transport,
+            tool_profiles=tool_profiles,
+            output_policy=output_policy,
+            tool_output_policies=tool_output_policies,
+            max_concurrency=max_concurrency,
+            breaker_config=self.breaker_config,
         )
 
     @property
@@ -141,6 +298,250 @@ class MCPConfig:
         return None
 
 
+class _ManagedMCPServer(MCPServer):
+    """Worker-side wrapper around an MCP server connection.
+
+    Applies the tool allowlist itself: the agents SDK only filters tools when a run
+    context is available, which is never the case inside MCP activities. Tool results
+    are reduced by the configured output policy before they leave the activity.
+
+    Parallel tool calls of an agent turn arrive as concurrent activities, so calls
+    are bounded by the server's max_concurrency across all clients of the worker.
+
+    Connections and calls are recorded by the server's circuit breaker. While it is
+    open, the client does not connect: it lists no tools, so new agents run without
+    the server, and tool calls fail immediately with an error result the agent sees.
+    """
+
+    def __init__(self, server: MCPServer, server_config: MCPServerConfig, allowed_tools: Optional[List[str]] = None):
+        super().__init__()
+        self._server = server
+        self._server_config = server_config
+        self._allowed_tools = set(allowed_tools) if allowed_tools is not None else None
+        self._connected = False
+
+    @property
+    def name(self) -> str:
+        return self._server.name
+
+    async def connect(self):
+        breaker = self._server_config.breaker
+        if breaker.is_open:
+            return
+        started = time.monotonic()
+        try:
+            await self._server.connect()
+        except Exception as e:
+            breaker.record_failure(time.monotonic() - started, e)
+            raise
+        self._connected = True
+
+    async def cleanup(self):
+        if self._connected:
+            self._connected = False
+            await self._server.cleanup()
+
+    async def list_tools(self, run_context=None, agent=None):
+        if not self._connected:
+            logger.info("MCP server %s is unavailable (circuit open), exposing no tools", self._server_config.name)
+            return []
+        breaker = self._server_config.breaker
+        started = time.monotonic()
+        try:
+            tools = await self._server.list_tools(run_context, agent)
+        except Exception as e:
+            breaker.record_failure(time.monotonic() - started, e)
+            raise
+        breaker.record_success(time.monotonic() - started)
+        if self._allowed_tools is None:
+            return tools
+        return [tool for tool in tools if tool.name in self._allowed_tools]
+
+    async def call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]]):
+        if not self._connected:
+            return unavailable_result(self._server_config.name, "circuit breaker open")
+
+        call_slots = self._server_config.call_slots
+        if call_slots.locked():
+            logger.debug(
+                "MCP server %s at max concurrency (%d), tool %s waits for a slot",
+                self._server_config.name,
+                self._server_config.max_concurrency,
+                tool_name,
+            )
+        breaker = self._server_config.breaker
+        async with call_slots:
+            started = time.monotonic()
+            try:
+                result = await self._server.call_tool(tool_name, arguments)
+            except Exception as e:
+                breaker.record_failure(time.monotonic() - started, e)
+                raise
+            breaker.record_success(time.monotonic() - started)
+        return self._limit_output(tool_name, result)
+
+    def _limit_output(self, tool_name: str, result):
+        policy = self._server_config.output_policy_for(tool_name)
+        content = []
+        size_before = size_after = 0
+        for item in result.content:
+            if getattr(item, "type", None) == "text":
+                text = policy.apply(item.text)
+                size_before += len(item.text)
+                size_after += len(text)
+                item = item.model_copy(update={"text": text})
+            content.append(item)
+
+        if size_after == size_before:
+            return result
+
+        logger.info(
+            "Limited output of MCP tool %s/%s from %d to %d characters",
+            self._server_config.name,
+            tool_name,
+            size_before,
+            size_after,
+        )
+        # Structured content duplicates the full text, drop it so the payload stays small
+        return result.model_copy(update={"content": content, "structuredContent": None})
+
+    async def list_prompts(self):
+        return await self._server.list_prompts()
+
+    async def get_prompt(self, name: str, arguments: Optional[Dict[str, Any]] = None):
+        return await self._server.get_prompt(name, arguments)
+
+
+def load_env_file(path: str) -> Dict[str, str]:
+    """Read the ``env`` list of ``name``/``value`` entries of a YAML (or JSON) file."""
+    with open(path) as f:
+        text = f.read()
+    try:
+        data = yaml.safe_load(text) if yaml is not None else json.loads(text)
+    except (ValueError, getattr(yaml, "YAMLError", ValueError)) as e:
+        raise ValueError(f"Invalid MCP config file {path}: {e}") from e
+
+    entries = (data or {}).get("env", []) if isinstance(data, dict) else None
+    if not isinstance(entries, list):
+        raise ValueError(f"Invalid MCP config file {path}: expected an 'env' list")
+    env = {}
+    for entry in entries:
+        if not isinstance(entry, dict) or not entry.get("name"):
+            raise ValueError(f"Invalid MCP config file {path}: entry without a name: {entry!r}")
+        value = entry.get("value")
+        env[str(entry["name"])] = "" if value is None else str(value)
+    return env
+
+
+def unavailable_result(server_name: str, reason: str) -> CallToolResult:
+    """Tool error result returned instead of calling an unavailable MCP server."""
+    return CallToolResult(
+        content=[TextContent(
+            type="text",
+            text=(
+                f"MCP server '{server_name}' is currently unavailable ({reason}). "
+                "Do not call its tools again; continue with the other tools and note the gap in limitations."
+            ),
+        )],
+        isError=True,
+    )
+
+
+class _UnavailableMCPServer(MCPServer):
+    """Stand-in for a server that was removed or disabled while workflows still reference it."""
+
+    def __init__(self, name: str, reason: str):
+        super().__init__()
+        self._name = name
+        self._reason = reason
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def connect(self):
+        pass
+
+    async def cleanup(self):
+        pass
+
+    async def list_tools(self, run_context=None, agent=None):
+        logger.info("MCP server %s is unavailable (%s), exposing no tools", self._name, self._reason)
+        return []
+
+    async def call_tool(self, tool_name: str, arguments: Optional[Dict[str, Any]]):
+        return unavailable_result(self._name, self._reason)
+
+    async def list_prompts(self):
+        raise ApplicationError(f"MCP server '{self._name}' is unavailable ({self._reason})", non_retryable=True)
+
+    async def get_prompt(self, name: str, arguments: Optional[Dict[str, Any]] = None):
+        raise ApplicationError(f"MCP server '{self._name}' is unavailable ({self._reason})", non_retryable=True)
+
+
+def build_mcp_server(server_config: MCPServerConfig, allowed_tools: Optional[List[str]] = None) -> MCPServer:
+    """Create a (not yet connected) MCP server client for a configured server.
+
+    Args:
+        server_config: MCPServerConfig instance
+        allowed_tools: Tools exposed by the client (default: the server's allowed tools)
+
+    Returns:
+        MCP server client applying the tool allowlist and output policy
+    """
+    if allowed_tools is None:
+        allowed_tools = server_config.allowed_tools
+    return _ManagedMCPServer(_create_mcp_client(server_config), server_config, allowed_tools=allowed_tools)
+
+
+def _create_mcp_client(server_config: MCPServerConfig) -> MCPServer:
+    if server_config.transport == "sse":
+        return MCPServerSse(
+            params={"url": server_config.url},
+            name=server_config.name,
+        )
+    # default to http
+    return MCPServerStreamableHttp(
+        params={"url": server_config.url},
+        name=server_config.name,
+    )
+
+
+async def probe_mcp_server(server_config: MCPServerConfig) -> None:
+    """Connect to an MCP server and list its tools, bypassing the circuit breaker.
+
+    Raises:
+        Exception: If the server cannot be reached
+    """
+    server = _create_mcp_client(server_config)
+    try:
+        await server.connect()
+        await server.list_tools()
+    finally:
+        await server.cleanup()
+
+
+def create_profiled_mcp_server(config: MCPConfig, name: str, factory_argument: Optional[Dict[str, Any]] = None) -> MCPServer:
+    """Create the MCP server client serving a workflow's stateless server reference.
+
+    The server is looked up in the current config, so configuration reloads apply to
+    the next call. Servers removed or disabled since expose no tools.
+
+    Args:
+        config: MCPConfig instance
+        name: Name of the MCP server
+        factory_argument: Factory argument of the workflow reference, with the alert category
+    """
+    server_config = config.get_server(name)
+    if server_config is None:
+        return _UnavailableMCPServer(name, "removed from the worker configuration")
+    if not server_config.enabled:
+        return _UnavailableMCPServer(name, "disabled in the worker configuration")
+    # Workflows pass the alert category so agents only see that profile's tools
+    profile = (factory_argument or {}).get("tool_profile")
+    return build_mcp_server(server_config, allowed_tools=server_config.tools_for_profile(profile))
+
+
 class MCPProviderRegistry:
     """Registry for creating Temporal MCP providers from MCPConfig."""
 
@@ -166,7 +567,7 @@ class MCPProviderRegistry:
 
         for server_config in enabled_servers:
             try:
-                provider = cls._create_provider(server_config)
+                provider = cls._create_provider(config, server_config)
                 if provider:
                     providers.append(provider)
                     logger.info("Successfully registered MCP provider: %s", server_config.name)
@@ -182,43 +583,27 @@ class MCPProviderRegistry:
         return providers
 
     @classmethod
-    def _create_provider(cls, server_config: MCPServerConfig) -> Optional[StatelessMCPServerProvider]:
+    def _create_provider(cls, config: MCPConfig, server_config: MCPServerConfig) -> Optional[StatelessMCPServerProvider]:
         """Create a Temporal MCP provider from server configuration.
 
         Args:
+            config: MCPConfig the provider looks the server up in on every call
             server_config: MCPServerConfig instance
 
         Returns:
             StatelessMCPServerProvider instance
         """
-        # Create tool filter if allowed_tools specified
-        tool_filter = None
         if server_config.allowed_tools:
-            tool_filter = create_static_tool_filter(allowed_tool_names=server_config.allowed_tools)
             logger.info(
                 "MCP server '%s' using tool filter with allowed tools: %s",
                 server_config.name,
                 ", ".join(server_config.allowed_tools)
             )
 
-        def create_mcp_server(
-            name: str = server_config.name,
-            server_url: str = server_config.url,
-            transport: str = server_config.transport,
-            filter_tools=tool_filter
-        ):
-            if transport == "sse":
-                return MCPServerSse(
-                    params={"url": server_url},
-                    name=name,
-                    tool_filter=filter_tools,
-                )
-            else:  # default to http
-                return MCPServerStreamableHttp(
-                    params={"url": server_url},
-                    name=name,
-                    tool_filter=filter_tools,
-                )
+        name = server_config.name
+
+        def create_mcp_server(factory_argument: Optional[Dict[str, Any]] = None):
+            return create_profiled_mcp_server(config, name, factory_argument)
 
         provider = StatelessMCPServerProvider(
             server_config.name,
@@ -227,3 +612,44 @@ class MCPProviderRegistry:
 
         logger.info("Created MCP provider '%s' at %s (transport=%s)", server_config.name, server_config.url, server_config.transport)
         return provider
+
+    @classmethod
+    def get_dynamic_activity(cls, config: MCPConfig):
+        """Create a dynamic activity serving MCP servers added to the config at runtime.
+
+        A worker's activities are fixed when it starts, so the stateless MCP activities
+        of servers added by a config reload are not registered. This activity receives
+        them and serves them like the registered ones.
+
+        Args:
+            config: MCPConfig instance, updated by config reloads
+
+        Returns:
+            Dynamic activity function to register with the worker
+        """
+
+        @activity.defn(dynamic=True)
+        async def mcp_dynamic_activity(args: Sequence[RawValue]) -> Any:
+            activity_type = activity.info().activity_type
+            name, found, operation = activity_type.rpartition(_STATELESS_SUFFIX)
+            if not found or not name:
+                raise ApplicationError(f"Unknown activity type '{activity_type}'", non_retryable=True)
+
+            payload = activity.payload_converter().from_payload(args[0].payload, dict) if args else {}
+            payload = payload or {}
+            server = create_profiled_mcp_server(config, name, payload.get("factory_argument"))
+            await server.connect()
+            try:
+                if operation == "list-tools":
+                    return await server.list_tools()
+                if operation == "call-tool-v2":
+                    return await server.call_tool(payload["tool_name"], payload.get("arguments"))
+                if operation == "list-prompts":
+                    return await server.list_prompts()
+                if operation == "get-prompt-v2":
+                    return await server.get_prompt(payload["name"], payload.get("arguments"))
+            finally:
+                await server.cleanup()
+            raise ApplicationError(f"Unknown MCP operation '{operation}' for server '{name}'", non_retryable=True)
+
+        return mcp_dynamic_activity
@@ -0,0 +1,100 @@
+"""Hot reload of the MCP configuration from a file.
+
+Instead of MCP_* environment variables, the worker can read its MCP configuration
+from a file in the same shape as example-environment.yaml (an ``env`` list of
+``name``/``value`` entries, e.g. a mounted ConfigMap). The worker polls the file and
+applies a changed configuration in one step, without a restart:
+
+- Changed servers (URL, transport, allowed tools, profiles, output policy,
+  concurrency) apply to the next tool call. Calls in flight finish unchanged.
+- Added servers are served through a dynamic activity.
+- Removed or disabled servers expose no tools to new agents, and calls from
+  running agents return an error result.
+
+An invalid file is logged and ignored; the previous configuration stays active.
+Circuit breaker settings (MCP_BREAKER_*) are read once at startup.
+
+Configuration Format:
+    MCP_CONFIG_FILE: Path of the MCP config file (default: unset, use the environment)
+    MCP_CONFIG_RELOAD_INTERVAL: Seconds between checks of the file (default: 10)
+
+Example:
+    export MCP_CONFIG_FILE="/etc/ein-agent/mcp.yaml"
+    export MCP_CONFIG_RELOAD_INTERVAL="30"
+"""
+
+import asyncio
+import logging
+import os
+from typing import Optional, Tuple
+
+from ein_agent_worker.mcp_providers import MCPConfig
+
+logger = logging.getLogger(__name__)
+
+
+class MCPReloadConfig:
+    """MCP config file settings loaded from environment variables."""
+
+    def __init__(self):
+        """Initialize MCP config file settings from environment."""
+        self.path: Optional[str] = os.getenv("MCP_CONFIG_FILE") or None
+        self.interval: float = float(os.getenv("MCP_CONFIG_RELOAD_INTERVAL", "10"))
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the MCP configuration comes from a file."""
+        return self.path is not None
+
+
+class MCPConfigWatcher:
+    """Polls the MCP config file and applies changes to a live MCPConfig."""
+
+    def __init__(self, path: str, config: MCPConfig, interval: float = 10.0):
+        self._path = path
+        self._config = config
+        self._interval = interval
+        self._signature = self._file_signature()
+
+    def _file_signature(self) -> Optional[Tuple[float, int]]:
+        try:
+            stat = os.stat(self._path)
+        except OSError:
+            return None
+        return stat.st_mtime, stat.st_size
+
+    def reload(self) -> bool:
+        """Reload the file and apply it if valid.
+
+        Returns:
+            True if the new configuration was applied
+        """
+        try:
+            new_config = MCPConfig.from_file(self._path)
+        except (OSError, ValueError) as e:
+            logger.error("Ignoring MCP config file %s, keeping the current configuration: %s", self._path, e)
+            return False
+
+        changes = self._config.update(new_config)
+        if any(changes.values()):
+            logger.info(
+                "Reloaded MCP config from %s: added=%s removed=%s changed=%s",
+                self._path,
+                changes["added"],
+                changes["removed"],
+                changes["changed"],
+            )
+        else:
+            logger.info("Reloaded MCP config from %s: no changes", self._path)
+        return True
+
+    async def run(self) -> None:
+        """Check the file every interval until cancelled."""
+        logger.info("Watching MCP config file %s every %.0fs", self._path, self._interval)
+        while True:
+            await asyncio.sleep(self._interval)
+            signature = self._file_signature()
+            if signature is None or signature == self._signature:
+                continue
+            self._signature = signature
+            self.reload()
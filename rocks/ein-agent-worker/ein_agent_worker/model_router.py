@@ -0,0 +1,205 @@
+"""Model routing configuration for Ein Agent workers.
+
+Workflows request models by stage and tier (e.g. ``ein/pass1/fast``). This module
+resolves those references to concrete LiteLLM model names from environment variables,
+so models can be changed per deployment without touching workflow code. The token
+usage of every call, including the prompt cache hit rate reported by the provider,
+is recorded per stage.
+
+Configuration Format:
+    MODEL_{STAGE}_FAST: Model used first for the stage
+    MODEL_{STAGE}_STRONG: Model used when the fast tier output is escalated
+    MODEL_DEFAULT_FAST: Fast tier fallback for stages without explicit configuration
+    MODEL_DEFAULT_STRONG: Strong tier fallback for stages without explicit configuration
+
+    Stages: PASS1, PASS2, CORRELATION, SINGLE_ALERT
+
+Example:
+    export MODEL_DEFAULT_FAST="gemini/gemini-2.5-flash"
+    export MODEL_DEFAULT_STRONG="gemini/gemini-2.5-pro"
+    export MODEL_PASS1_FAST="gemini/gemini-2.0-flash-exp"
+"""
+
+import logging
+import os
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from agents import Model, ModelProvider, ModelResponse, Usage
+
+from ein_agent_worker.rate_limit import RateLimitedModel, RateLimiter
+from ein_agent_worker.workflows.routing import (
+    STAGE_CORRELATION,
+    STAGE_PASS1,
+    STAGE_PASS2,
+    STAGE_SINGLE_ALERT,
+    TIER_FAST,
+    TIER_STRONG,
+    TIERS,
+    parse_model_ref,
+)
+
+logger = logging.getLogger(__name__)
+
+# Defaults preserve the models the workflows used before routing was configurable
+DEFAULT_MODELS: Dict[Tuple[str, str], str] = {
+    (STAGE_PASS1, TIER_FAST): "gemini/gemini-2.0-flash-exp",
+    (STAGE_PASS1, TIER_STRONG): "gemini/gemini-2.5-pro",
+    (STAGE_PASS2, TIER_FAST): "gemini/gemini-2.0-flash-exp",
+    (STAGE_PASS2, TIER_STRONG): "gemini/gemini-2.5-pro",
+    (STAGE_CORRELATION, TIER_FAST): "gemini/gemini-2.5-flash",
+    (STAGE_CORRELATION, TIER_STRONG): "gemini/gemini-2.5-pro",
+    (STAGE_SINGLE_ALERT, TIER_FAST): "gemini/gemini-2.5-flash",
+    (STAGE_SINGLE_ALERT, TIER_STRONG): "gemini/gemini-2.5-pro",
+}
+
+FALLBACK_MODEL = "gemini/gemini-2.5-flash"
+
+
+class ModelRouterConfig:
+    """Model routing configuration loaded from environment variables."""
+
+    def __init__(self):
+        """Initialize model routing configuration from environment."""
+        self.models: Dict[Tuple[str, str], str] = dict(DEFAULT_MODELS)
+        self._load_from_env()
+
+    def _load_from_env(self) -> None:
+        """Load per-stage and default tier models from environment variables."""
+        defaults = {tier: os.getenv(f"MODEL_DEFAULT_{tier.upper()}") for tier in TIERS}
+
+        for stage, tier in list(self.models):
+            model = os.getenv(f"MODEL_{stage.upper()}_{tier.upper()}") or defaults[tier]
+            if model:
+                self.models[(stage, tier)] = model
+
+        for (stage, tier), model in sorted(self.models.items()):
+            logger.info("Model route: %s/%s -> %s", stage, tier, model)
+
+    def resolve(self, stage: str, tier: str) -> str:
+        """Resolve the concrete model name for a stage and tier."""
+        model = self.models.get((stage, tier))
+        if model:
+            return model
+
+        default = os.getenv(f"MODEL_DEFAULT_{tier.upper()}")
+        if default:
+            return default
+
+        logger.warning("No model configured for %s/%s, using %s", stage, tier, FALLBACK_MODEL)
+        return FALLBACK_MODEL
+
+
+@dataclass
+class StageUsage:
+    """Cumulative token usage of a workflow stage."""
+
+    requests: int = 0
+    input_tokens: int = 0
+    cached_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def cache_hit_rate(self) -> float:
+        """Fraction of input tokens served from the provider's prompt cache."""
+        return self.cached_tokens / self.input_tokens if self.input_tokens else 0.0
+
+
+class UsageRecorder:
+    """Records per-stage token usage and prompt cache hit rates reported through LiteLLM."""
+
+    def __init__(self):
+        self.stages: Dict[str, StageUsage] = {}
+
+    def record(self, stage: str, model_name: str, usage: Usage) -> None:
+        """Add the usage of one model call to its stage."""
+        stats = self.stages.setdefault(stage, StageUsage())
+        cached = usage.input_tokens_details.cached_tokens or 0
+        stats.requests += usage.requests
+        stats.input_tokens += usage.input_tokens
+        stats.cached_tokens += cached
+        stats.output_tokens += usage.output_tokens
+
+        call_hit_rate = cached / usage.input_tokens if usage.input_tokens else 0.0
+        logger.info(
+            "Model usage: stage=%s model=%s input=%d cached=%d hit_rate=%.1f%% (stage total hit_rate=%.1f%% over %d requests)",
+            stage,
+            model_name,
+            usage.input_tokens,
+            cached,
+            call_hit_rate * 100,
+            stats.cache_hit_rate * 100,
+            stats.requests,
+        )
+
+
+class UsageRecordingModel(Model):
+    """Model wrapper that records the usage of each call against its stage."""
+
+    def __init__(self, model: Model, stage: str, model_name: str, recorder: UsageRecorder):
+        self._model = model
+        self._stage = stage
+        self._model_name = model_name
+        self._recorder = recorder
+
+    async def get_response(self, *args, **kwargs) -> ModelResponse:
+        response = await self._model.get_response(*args, **kwargs)
+        self._recorder.record(self._stage, self._model_name, response.usage)
+        return response
+
+    def stream_response(self, *args, **kwargs) -> AsyncIterator[Any]:
+        return self._model.stream_response(*args, **kwargs)
+
+
+def _litellm_provider() -> ModelProvider:
+    # Importing LiteLLM takes seconds, only pay for it when a model is requested
+    from agents.extensions.models.litellm_provider import LitellmProvider
+
+    # The Gemini needs to define GEMINI_API_KEY environment variable
+    return LitellmProvider()
+
+
+class ModelRouterProvider(ModelProvider):
+    """Model provider resolving logical model references before delegating to LiteLLM.
+
+    Model names that are not logical references are passed through unchanged.
+    """
+
+    def __init__(
+        self,
+        config: ModelRouterConfig,
+        provider: Optional[ModelProvider] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        usage_recorder: Optional[UsageRecorder] = None,
+    ):
+        """Initialize the provider.
+
+        Args:
+            config: ModelRouterConfig instance with loaded configuration
+            provider: Provider used for the resolved models (default: LitellmProvider, created
+                on the first model request so workers without model activities never import LiteLLM)
+            rate_limiter: Optional limiter applied to every model call
+            usage_recorder: Recorder for per-stage usage (default: a new UsageRecorder)
+        """
+        self._config = config
+        self._provider = provider
+        self._rate_limiter = rate_limiter
+        self.usage_recorder = usage_recorder or UsageRecorder()
+
+    def get_model(self, model_name: Optional[str]) -> Model:
+        """Get the model for a logical reference or raw model name."""
+        stage = "unrouted"
+        ref = parse_model_ref(model_name)
+        if ref is not None:
+            stage, tier = ref
+            resolved = self._config.resolve(stage, tier)
+            logger.debug("Resolved model %s -> %s", model_name, resolved)
+            model_name = resolved
+
+        if self._provider is None:
+            self._provider = _litellm_provider()
+        model = self._provider.get_model(model_name)
+        model = UsageRecordingModel(model, stage, model_name or "default", self.usage_recorder)
+        if self._rate_limiter:
+            model = RateLimitedModel(model, self._rate_limiter)
+        return model
@@ -0,0 +1,377 @@
+"""Rule-based RCA pre-classifier for known pod failure signatures.
+
+docs/failure-cases/kubepodnotready-rca-spec.md describes decision trees that are
+followed mechanically:
+
+    Scenario A: Pending and not scheduled (FailedScheduling) -> Resource Shortage
+    Scenario B: Pending and scheduled, image cannot be pulled -> Image Pull Failure
+    Scenario C: Container terminated (OOMKilled, probe kills, missing config) -> Container Failure
+
+The pre-classifier fetches the pod and its events through the kubernetes MCP
+server and, when a signature matches with at least the configured confidence,
+builds the Pass 1 report itself, without calling the model. Anything ambiguous
+(pods on an unknown node, network errors that may come from the node, storage
+scheduling issues) is left to the agent.
+
+Configuration Format:
+    PRECLASSIFIER_ENABLED: Enable the pre-classifier (default: true)
+    PRECLASSIFIER_MCP_SERVER: Name of the kubernetes MCP server (default: kubernetes)
+    PRECLASSIFIER_ALERTS: Comma-separated alert names to pre-classify
+        (default: KubePodNotReady,KubePodCrashLooping,KubeContainerWaiting)
+    PRECLASSIFIER_MIN_CONFIDENCE: Minimum confidence of a match to skip the agent (default: 0.9)
+
+Example:
+    export PRECLASSIFIER_ALERTS="KubePodNotReady,KubePodCrashLooping"
+    export PRECLASSIFIER_MIN_CONFIDENCE="0.85"
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from temporalio import activity
+
+from ein_agent_worker.mcp_providers import MCPConfig, build_mcp_server
+from ein_agent_worker.workflows.preclassifier import PRECLASSIFY_ACTIVITY
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ALERTS = "KubePodNotReady,KubePodCrashLooping,KubeContainerWaiting"
+
+# Tools of the kubernetes MCP server (containers/kubernetes-mcp-server)
+POD_TOOL = "pods_get"
+EVENTS_TOOL = "events_list"
+
+CATEGORY_RESOURCE_SHORTAGE = "Resource Shortage"
+CATEGORY_IMAGE_PULL_FAILURE = "Image Pull Failure"
+CATEGORY_CONTAINER_FAILURE = "Container Failure"
+
+_IMAGE_PULL_REASONS = ("ImagePullBackOff", "ErrImagePull", "InvalidImageName", "ErrImageNeverPull")
+
+# (message fragments, root cause, confidence), first match wins
+_SCHEDULING_CAUSES = (
+    (("insufficient cpu", "insufficient memory", "insufficient"), "Insufficient {resources} on every candidate node", 0.95),
+    (("too many pods",), "Every candidate node is at its maximum pod capacity", 0.95),
+    (("didn't match pod's node affinity", "node affinity", "node selector", "didn't match node selector"),
+     "No node matches the pod's node selector or affinity rules", 0.9),
+    (("untolerated taint", "had taint", "had untolerated"), "Every candidate node has a taint the pod does not tolerate", 0.9),
+)
+_PULL_CAUSES = (
+    (("manifest unknown", "not found", "does not exist", "no such image"), "Image {image} does not exist (wrong name or tag)", 0.95),
+    (("pull access denied",), "Image {image} does not exist or requires registry authorization", 0.9),
+    (("unauthorized", "authentication required", "403 forbidden", "denied"),
+     "Registry authentication failed for image {image} (missing or invalid imagePullSecrets)", 0.9),
+    (("toomanyrequests", "rate limit"), "Registry rate limit reached while pulling image {image}", 0.9),
+    # Network errors can come from the node rather than the registry, so the agent should confirm them
+    (("no such host", "i/o timeout", "connection refused", "tls handshake timeout"),
+     "Registry of image {image} cannot be reached from the node", 0.6),
+)
+
+
+class PreclassifierConfig:
+    """RCA pre-classifier configuration loaded from environment variables."""
+
+    def __init__(self):
+        """Initialize pre-classifier configuration from environment."""
+        self.enabled: bool = os.getenv("PRECLASSIFIER_ENABLED", "true").lower() == "true"
+        self.mcp_server: str = os.getenv("PRECLASSIFIER_MCP_SERVER", "kubernetes")
+        self.alerts: List[str] = [
+            name.strip() for name in os.getenv("PRECLASSIFIER_ALERTS", DEFAULT_ALERTS).split(",") if name.strip()
+        ]
+        self.min_confidence: float = float(os.getenv("PRECLASSIFIER_MIN_CONFIDENCE", "0.9"))
+
+
+@dataclass
+class Signature:
+    """A known failure signature matched for a pod.
+
+    Attributes:
+        scenario: Scenario of the RCA spec ('A', 'B' or 'C')
+        name: Short name of the signature (e.g. 'FailedScheduling')
+        category: Root cause category
+        summary: Root cause summary
+        evidence: Pod status fields and events supporting the match
+        confidence: Confidence of the match between 0.0 and 1.0
+    """
+
+    scenario: str
+    name: str
+    category: str
+    summary: str
+    evidence: List[str] = field(default_factory=list)
+    confidence: float = 0.0
+
+
+def _lower_keys(value: Any) -> Any:
+    """Lowercase all mapping keys, so Kubernetes and MCP server field casing does not matter."""
+    if isinstance(value, dict):
+        return {str(k).lower(): _lower_keys(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_lower_keys(v) for v in value]
+    return value
+
+
+def parse_tool_output(text: str) -> Any:
+    """Parse YAML or JSON tool output, skipping up to three lines of leading prose."""
+    lines = text.strip().splitlines()
+    for skip in range(min(4, len(lines))):
+        body = "\n".join(lines[skip:])
+        parsed: Any = None
+        try:
+            parsed = json.loads(body)
+        except ValueError:
+            if yaml is not None:
+                try:
+                    parsed = yaml.safe_load(body)
+                except yaml.YAMLError:
+                    parsed = None
+        if isinstance(parsed, (dict, list)):
+            return _lower_keys(parsed)
+    return None
+
+
+def _pod_events(events: Any, pod_name: str) -> List[Dict[str, Any]]:
+    if isinstance(events, dict):
+        events = events.get("items", [])
+    if not isinstance(events, list):
+        return []
+    return [
+        event for event in events
+        if isinstance(event, dict) and (event.get("involvedobject") or {}).get("name") == pod_name
+    ]
+
+
+def _first_cause(message: str, causes) -> Optional[tuple]:
+    lowered = message.lower()
+    for fragments, summary, confidence in causes:
+        if any(fragment in lowered for fragment in fragments):
+            return summary, confidence
+    return None
+
+
+def _container_statuses(status: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return list(status.get("initcontainerstatuses") or []) + list(status.get("containerstatuses") or [])
+
+
+def _memory_limit(pod: Dict[str, Any], container: str) -> str:
+    spec = pod.get("spec") or {}
+    for c in list(spec.get("initcontainers") or []) + list(spec.get("containers") or []):
+        if c.get("name") == container:
+            return str(((c.get("resources") or {}).get("limits") or {}).get("memory") or "none")
+    return "unknown"
+
+
+def _match_unschedulable(pod: Dict[str, Any], events: List[Dict[str, Any]]) -> Optional[Signature]:
+    """Scenario A: Pending and not scheduled."""
+    status = pod.get("status") or {}
+    if status.get("phase") != "Pending" or (pod.get("spec") or {}).get("nodename"):
+        return None
+    condition = next((c for c in status.get("conditions") or [] if c.get("type") == "PodScheduled"), {})
+    unschedulable = condition.get("status") == "False" and condition.get("reason") == "Unschedulable"
+    failed = [e for e in events if e.get("reason") == "FailedScheduling"]
+    if not unschedulable and not failed:
+        return None
+
+    message = (failed[-1].get("message") if failed else None) or condition.get("message") or ""
+    # Unbound volumes are storage issues, not resource shortage
+    if "persistentvolumeclaim" in message.lower() or "volume" in message.lower():
+        return None
+    cause = _first_cause(message, _SCHEDULING_CAUSES)
+    if cause is None:
+        return Signature("A", "FailedScheduling", CATEGORY_RESOURCE_SHORTAGE, "Pod cannot be scheduled", [message], 0.6)
+
+    summary, confidence = cause
+    resources = [r for r in ("cpu", "memory", "ephemeral-storage") if f"insufficient {r}" in message.lower()]
+    summary = summary.format(resources=" and ".join(resources).upper() if resources else "resources")
+    if not (unschedulable and failed):
+        confidence -= 0.1
+    evidence = ["status.phase: Pending", "spec.nodeName: <unset>"]
+    if unschedulable:
+        evidence.append(f"PodScheduled condition: False (Unschedulable) {condition.get('message', '')}".strip())
+    evidence += [f"Event FailedScheduling: {e.get('message', '')}" for e in failed[-3:]]
+    return Signature("A", "FailedScheduling", CATEGORY_RESOURCE_SHORTAGE, summary, evidence, confidence)
+
+
+def _match_image_pull(pod: Dict[str, Any], events: List[Dict[str, Any]]) -> Optional[Signature]:
+    """Scenario B: scheduled, but the image cannot be pulled."""
+    status = pod.get("status") or {}
+    for container in _container_statuses(status):
+        waiting = (container.get("state") or {}).get("waiting") or {}
+        reason = waiting.get("reason")
+        if reason not in _IMAGE_PULL_REASONS:
+            continue
+        image = container.get("image", "unknown")
+        pull_events = [
+            e.get("message", "") for e in events
+            if e.get("reason") in ("Failed", "BackOff") and "pull" in (e.get("message") or "").lower()
+        ]
+        message = " ".join([waiting.get("message") or ""] + pull_events)
+        evidence = [f"Container {container.get('name')} waiting: {reason} {waiting.get('message', '')}".strip()]
+        evidence += [f"Event: {m}" for m in pull_events[-3:]]
+        if reason == "InvalidImageName":
+            return Signature("B", reason, CATEGORY_IMAGE_PULL_FAILURE, f"Image name {image} is invalid", evidence, 0.95)
+        cause = _first_cause(message, _PULL_CAUSES)
+        if cause is None:
+            return Signature("B", reason, CATEGORY_IMAGE_PULL_FAILURE, f"Image {image} cannot be pulled", evidence, 0.6)
+        summary, confidence = cause
+        return Signature("B", reason, CATEGORY_IMAGE_PULL_FAILURE, summary.format(image=image), evidence, confidence)
+    return None
+
+
+def _match_container_failure(pod: Dict[str, Any], events: List[Dict[str, Any]]) -> Optional[Signature]:
+    """Scenario C: container started but failed."""
+    status = pod.get("status") or {}
+    for container in _container_statuses(status):
+        name = container.get("name")
+        state = container.get("state") or {}
+        waiting = state.get("waiting") or {}
+        if waiting.get("reason") == "CreateContainerConfigError":
+            return Signature(
+                "C", "CreateContainerConfigError", CATEGORY_CONTAINER_FAILURE,
+                f"Container {name} cannot start because of missing configuration: {waiting.get('message', '')}".strip(),
+                [f"Container {name} waiting: CreateContainerConfigError {waiting.get('message', '')}".strip()],
+                0.95,
+            )
+
+        terminated = state.get("terminated") or (container.get("laststate") or {}).get("terminated") or {}
+        reason = terminated.get("reason")
+        exit_code = terminated.get("exitcode")
+        if not reason and exit_code is None:
+            continue
+        evidence = [
+            f"Container {name} terminated: reason={reason} exitCode={exit_code} restartCount={container.get('restartcount', 0)}"
+        ]
+        if reason == "OOMKilled":
+            limit = _memory_limit(pod, name)
+            evidence.append(f"Memory limit: {limit}")
+            return Signature(
+                "C", "OOMKilled", CATEGORY_CONTAINER_FAILURE,
+                f"Container {name} is killed for exceeding its memory limit ({limit}) - OOMKilled",
+                evidence, 0.95,
+            )
+        probe_failures = [
+            e.get("message", "") for e in events
+            if e.get("reason") == "Unhealthy" and "liveness probe failed" in (e.get("message") or "").lower()
+        ]
+        if probe_failures and exit_code in (137, 143):
+            evidence += [f"Event Unhealthy: {m}" for m in probe_failures[-3:]]
+            return Signature(
+                "C", "LivenessProbeFailed", CATEGORY_CONTAINER_FAILURE,
+                f"Container {name} is restarted because its liveness probe fails",
+                evidence, 0.9,
+            )
+        if exit_code not in (None, 0):
+            # The exit code alone does not explain the crash; the logs do
+            return Signature(
+                "C", "ContainerExitError", CATEGORY_CONTAINER_FAILURE,
+                f"Container {name} exits with code {exit_code} ({reason or 'Error'})",
+                evidence, 0.7,
+            )
+    return None
+
+
+def match_signature(pod: Dict[str, Any], events: List[Dict[str, Any]]) -> Optional[Signature]:
+    """Match a pod (with lowercased keys) and its events against the known failure signatures."""
+    if (pod.get("status") or {}).get("phase") == "Unknown":
+        # The node stopped reporting, the pod is likely a symptom
+        return None
+    for matcher in (_match_unschedulable, _match_image_pull, _match_container_failure):
+        signature = matcher(pod, events)
+        if signature is not None:
+            return signature
+    return None
+
+
+def build_report(alert: Dict[str, Any], pod: Dict[str, Any], signature: Signature) -> str:
+    """Pass 1 report for a matched signature."""
+    labels = alert.get("labels", {})
+    node = (pod.get("spec") or {}).get("nodename")
+    return json.dumps({
+        "alert_name": alert.get("alertname", "unknown"),
+        "affected_resource": f"pod/{labels.get('namespace')}/{labels.get('pod')}",
+        "infrastructure_placement": f"node/{node}" if node else "Not scheduled to any node",
+        "root_cause_category": signature.category,
+        "root_cause_summary": signature.summary,
+        "root_cause_details": (
+            f"Matched known failure signature '{signature.name}' (Scenario {signature.scenario} of the "
+            f"KubePodNotReady RCA spec) from the pod status and events. Evidence: " + "; ".join(signature.evidence)
+        ),
+        "is_likely_symptom": False,
+        "suspected_upstream_cause": None,
+        "limitations": None,
+        "confidence": signature.confidence,
+        "source": "preclassifier",
+    }, indent=2)
+
+
+class PreclassifierActivities:
+    """Activities matching alerts against known failure signatures."""
+
+    def __init__(self, config: PreclassifierConfig, mcp_config: MCPConfig):
+        self._config = config
+        # Looked up per alert, the MCP config may be reloaded while the worker runs
+        self._mcp_config = mcp_config
+        server_config = mcp_config.get_server(config.mcp_server)
+        if config.enabled and (server_config is None or not server_config.enabled):
+            logger.info("RCA pre-classifier disabled: MCP server '%s' is not configured", config.mcp_server)
+
+    async def _call_tool(self, server, tool: str, arguments: Dict[str, Any]) -> Any:
+        result = await server.call_tool(tool, arguments)
+        if getattr(result, "isError", False):
+            logger.info("Pre-classifier tool %s failed: %s", tool, result.content)
+            return None
+        text = "\n".join(item.text for item in result.content if getattr(item, "type", None) == "text")
+        return parse_tool_output(text)
+
+    @activity.defn(name=PRECLASSIFY_ACTIVITY)
+    async def preclassify_alert(self, alert: Dict[str, Any], mcp_servers: List[str]) -> Optional[str]:
+        """Pass 1 report of an alert matching a known failure signature, or None to run the agent.
+
+        Args:
+            alert: The alert, with pod and namespace labels
+            mcp_servers: MCP servers the incident is allowed to use
+        """
+        server_config = self._mcp_config.get_server(self._config.mcp_server)
+        if (
+            not self._config.enabled
+            or server_config is None
+            or not server_config.enabled
+            or self._config.mcp_server not in mcp_servers
+            or alert.get("alertname") not in self._config.alerts
+        ):
+            return None
+
+        labels = alert.get("labels", {})
+        namespace, pod_name = labels.get("namespace"), labels.get("pod")
+        server = build_mcp_server(server_config)
+        await server.connect()
+        try:
+            pod = await self._call_tool(server, POD_TOOL, {"namespace": namespace, "name": pod_name})
+            if not isinstance(pod, dict):
+                return None
+            events = _pod_events(await self._call_tool(server, EVENTS_TOOL, {"namespace": namespace}), pod_name)
+        finally:
+            await server.cleanup()
+
+        signature = match_signature(pod, events)
+        if signature is None or signature.confidence < self._config.min_confidence:
+            logger.info(
+                "No confident failure signature for pod %s/%s%s",
+                namespace,
+                pod_name,
+                f" (best: {signature.name} at {signature.confidence})" if signature else "",
+            )
+            return None
+
+        logger.info(
+            "Pod %s/%s matches failure signature %s (Scenario %s, confidence %.2f), skipping the agent",
+            namespace, pod_name, signature.name, signature.scenario, signature.confidence,
+        )
+        return build_report(alert, pod, signature)
@@ -0,0 +1,392 @@
+"""Rate limiting for LLM model calls made by Ein Agent workers.
+
+Model activities acquire capacity from token buckets (requests per minute and
+tokens per minute) before calling the provider, so calls queue smoothly instead
+of failing with provider 429s. Buckets live either in worker memory or in a
+SQLite database shared by all worker replicas on the same volume.
+
+Configuration Format:
+    LLM_RATE_LIMIT_RPM: Max model requests per minute (default: unlimited)
+    LLM_RATE_LIMIT_TPM: Max model tokens per minute (default: unlimited)
+    LLM_RATE_LIMIT_BACKEND: 'memory' (per worker) or 'sqlite' (shared) (default: memory)
+    LLM_RATE_LIMIT_SQLITE_PATH: Database path for the sqlite backend (default: /tmp/ein-agent-rate-limit.db)
+    LLM_RATE_LIMIT_MAX_WAIT: Max seconds a call waits for capacity and retries, in total (default: 30)
+    LLM_RATE_LIMIT_MAX_RETRIES: Retries after a provider rate limit error (default: 3)
+    LLM_CALL_TIMEOUT: Seconds a model call may take, excluding rate limit waits (default: 60)
+
+The model activity timeout is LLM_CALL_TIMEOUT plus, with rate limiting enabled,
+LLM_RATE_LIMIT_MAX_WAIT. Waits and retries stop early when less than
+LLM_CALL_TIMEOUT of the activity would be left for the call itself.
+
+Example:
+    export LLM_RATE_LIMIT_RPM="60"
+    export LLM_RATE_LIMIT_TPM="1000000"
+    export LLM_RATE_LIMIT_BACKEND="sqlite"
+    export LLM_RATE_LIMIT_SQLITE_PATH="/var/lib/ein-agent/rate-limit.db"
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from agents import Model, ModelResponse
+from temporalio import activity
+from temporalio.exceptions import ApplicationError
+
+logger = logging.getLogger(__name__)
+
+REQUESTS_BUCKET = "requests"
+TOKENS_BUCKET = "tokens"
+
+# Rough characters-per-token ratio used to estimate a request before it is sent
+CHARS_PER_TOKEN = 4
+
+
+class RateLimitConfig:
+    """LLM rate limit configuration loaded from environment variables."""
+
+    def __init__(self):
+        """Initialize rate limit configuration from environment."""
+        self.requests_per_minute: Optional[int] = _env_int("LLM_RATE_LIMIT_RPM")
+        self.tokens_per_minute: Optional[int] = _env_int("LLM_RATE_LIMIT_TPM")
+        self.backend: str = os.getenv("LLM_RATE_LIMIT_BACKEND", "memory").lower()
+        self.sqlite_path: str = os.getenv("LLM_RATE_LIMIT_SQLITE_PATH", "/tmp/ein-agent-rate-limit.db")
+        self.max_wait: float = float(os.getenv("LLM_RATE_LIMIT_MAX_WAIT", "30"))
+        self.max_retries: int = int(os.getenv("LLM_RATE_LIMIT_MAX_RETRIES", "3"))
+        self.call_timeout: float = float(os.getenv("LLM_CALL_TIMEOUT", "60"))
+
+        if self.backend not in ("memory", "sqlite"):
+            logger.error("Invalid LLM_RATE_LIMIT_BACKEND '%s' (must be 'memory' or 'sqlite'), using memory", self.backend)
+            self.backend = "memory"
+
+    @property
+    def enabled(self) -> bool:
+        """Whether any rate limit is configured."""
+        return bool(self.requests_per_minute or self.tokens_per_minute)
+
+    @property
+    def activity_timeout(self) -> float:
+        """Start-to-close timeout of model activities: the call plus the rate limit wait budget."""
+        return self.call_timeout + (self.max_wait if self.enabled else 0)
+
+    @property
+    def capacities(self) -> Dict[str, float]:
+        """Per-minute capacity of each configured bucket."""
+        capacities = {}
+        if self.requests_per_minute:
+            capacities[REQUESTS_BUCKET] = float(self.requests_per_minute)
+        if self.tokens_per_minute:
+            capacities[TOKENS_BUCKET] = float(self.tokens_per_minute)
+        return capacities
+
+
+def _env_int(key: str) -> Optional[int]:
+    value = os.getenv(key)
+    if not value:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        logger.error("Invalid %s '%s' (must be an integer), ignoring", key, value)
+        return None
+
+
+class BucketBackend(ABC):
+    """Storage for token bucket state.
+
+    Buckets refill continuously at capacity/60 per second up to their per-minute capacity.
+    """
+
+    @abstractmethod
+    async def try_acquire(self, costs: Dict[str, float], capacities: Dict[str, float]) -> float:
+        """Take `costs` from all buckets atomically.
+
+        Returns:
+            0 if the costs were taken, otherwise seconds to wait before retrying
+        """
+
+    @abstractmethod
+    async def adjust(self, bucket: str, delta: float, capacity: float) -> None:
+        """Add `delta` (may be negative) to a bucket, e.g. to reconcile estimated tokens."""
+
+
+def _refill(tokens: float, updated_at: float, capacity: float, now: float) -> float:
+    return min(capacity, tokens + (now - updated_at) * capacity / 60.0)
+
+
+def _acquire(state: Dict[str, Tuple[float, float]], costs: Dict[str, float], capacities: Dict[str, float], now: float) -> float:
+    """Apply an acquire to bucket state in place. Shared by all backends."""
+    levels = {}
+    wait = 0.0
+    for bucket, cost in costs.items():
+        capacity = capacities[bucket]
+        tokens, updated_at = state.get(bucket, (capacity, now))
+        level = _refill(tokens, updated_at, capacity, now)
+        levels[bucket] = level
+        # Never ask for more than a full bucket or the call could wait forever
+        cost = min(cost, capacity)
+        if level < cost:
+            wait = max(wait, (cost - level) * 60.0 / capacity)
+
+    if wait > 0:
+        for bucket, level in levels.items():
+            state[bucket] = (level, now)
+        return wait
+
+    for bucket, cost in costs.items():
+        state[bucket] = (levels[bucket] - min(cost, capacities[bucket]), now)
+    return 0.0
+
+
+class MemoryBucketBackend(BucketBackend):
+    """Token buckets held in worker memory (limits apply per worker process)."""
+
+    def __init__(self):
+        self._state: Dict[str, Tuple[float, float]] = {}
+        self._lock = asyncio.Lock()
+
+    async def try_acquire(self, costs: Dict[str, float], capacities: Dict[str, float]) -> float:
+        async with self._lock:
+            return _acquire(self._state, costs, capacities, time.time())
+
+    async def adjust(self, bucket: str, delta: float, capacity: float) -> None:
+        async with self._lock:
+            now = time.time()
+            tokens, updated_at = self._state.get(bucket, (capacity, now))
+            self._state[bucket] = (_refill(tokens, updated_at, capacity, now) + delta, now)
+
+
+class SqliteBucketBackend(BucketBackend):
+    """Token buckets stored in a SQLite database shared by all workers that mount it."""
+
+    def __init__(self, path: str):
+        self._path = path
+        conn = self._connect()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated_at REAL NOT NULL)"
+            )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._path, timeout=10, isolation_level=None)
+
+    def _transact(self, buckets, apply) -> Any:
+        conn = self._connect()
+        try:
+            # IMMEDIATE takes the write lock up front so concurrent workers serialize here
+            conn.execute("BEGIN IMMEDIATE")
+            placeholders = ",".join("?" for _ in buckets)
+            rows = conn.execute(
+                f"SELECT name, tokens, updated_at FROM buckets WHERE name IN ({placeholders})", list(buckets)
+            ).fetchall()
+            state = {name: (tokens, updated_at) for name, tokens, updated_at in rows}
+            result = apply(state)
+            conn.executemany(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated_at) VALUES (?, ?, ?)",
+                [(name, tokens, updated_at) for name, (tokens, updated_at) in state.items()],
+            )
+            conn.execute("COMMIT")
+            return result
+        except Exception:
+            # Nothing to roll back if BEGIN itself failed (e.g. database locked)
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    async def try_acquire(self, costs: Dict[str, float], capacities: Dict[str, float]) -> float:
+        return await asyncio.to_thread(
+            self._transact, costs.keys(), lambda state: _acquire(state, costs, capacities, time.time())
+        )
+
+    async def adjust(self, bucket: str, delta: float, capacity: float) -> None:
+        def apply(state):
+            now = time.time()
+            tokens, updated_at = state.get(bucket, (capacity, now))
+            state[bucket] = (_refill(tokens, updated_at, capacity, now) + delta, now)
+
+        await asyncio.to_thread(self._transact, [bucket], apply)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limiter for model calls."""
+
+    def __init__(self, config: RateLimitConfig, backend: BucketBackend):
+        self.config = config
+        self._backend = backend
+
+    @classmethod
+    def from_config(cls, config: RateLimitConfig) -> Optional["RateLimiter"]:
+        """Create a rate limiter, or None if no limits are configured."""
+        if not config.enabled:
+            logger.info("LLM rate limiting disabled")
+            return None
+
+        if config.backend == "sqlite":
+            backend = SqliteBucketBackend(config.sqlite_path)
+        else:
+            backend = MemoryBucketBackend()
+
+        logger.info(
+            "LLM rate limiting enabled: rpm=%s tpm=%s backend=%s",
+            config.requests_per_minute,
+            config.tokens_per_minute,
+            config.backend,
+        )
+        return cls(config, backend)
+
+    def wait_deadline(self) -> float:
+        """Monotonic time until which a model call may wait for capacity or retry.
+
+        At most the configured max wait from now, and inside a model activity early
+        enough to leave the call timeout before the activity times out.
+        """
+        deadline = time.monotonic() + self.config.max_wait
+        if activity.in_activity():
+            info = activity.info()
+            ends = []
+            if info.start_to_close_timeout:
+                ends.append(info.started_time + info.start_to_close_timeout)
+            if info.schedule_to_close_timeout:
+                ends.append(info.scheduled_time + info.schedule_to_close_timeout)
+            if ends:
+                remaining = (min(ends) - datetime.now(timezone.utc)).total_seconds()
+                deadline = min(deadline, time.monotonic() + remaining - self.config.call_timeout)
+        return deadline
+
+    async def acquire(self, estimated_tokens: int, deadline: Optional[float] = None) -> None:
+        """Wait until capacity for one request of `estimated_tokens` is available.
+
+        Args:
+            estimated_tokens: Estimated tokens of the request
+            deadline: Monotonic time to give up waiting at (default: wait_deadline())
+
+        Raises:
+            ApplicationError: If capacity is not available before the deadline
+        """
+        capacities = self.config.capacities
+        costs = {REQUESTS_BUCKET: 1.0, TOKENS_BUCKET: float(estimated_tokens)}
+        costs = {bucket: cost for bucket, cost in costs.items() if bucket in capacities}
+
+        if deadline is None:
+            deadline = self.wait_deadline()
+        while True:
+            wait = await self._backend.try_acquire(costs, capacities)
+            if wait <= 0:
+                return
+            if time.monotonic() + wait > deadline:
+                raise ApplicationError(
+                    "LLM rate limit capacity not available in time "
+                    f"(max wait {self.config.max_wait}s, call timeout {self.config.call_timeout}s)",
+                    type="RateLimitExceeded",
+                )
+            logger.debug("Waiting %.2fs for LLM rate limit capacity", wait)
+            await asyncio.sleep(wait)
+
+    async def reconcile(self, estimated_tokens: int, actual_tokens: int) -> None:
+        """Correct the tokens bucket once the real usage of a call is known."""
+        capacity = self.config.capacities.get(TOKENS_BUCKET)
+        if capacity and actual_tokens and actual_tokens != estimated_tokens:
+            await self._backend.adjust(TOKENS_BUCKET, float(estimated_tokens - actual_tokens), capacity)
+
+    async def penalize(self) -> None:
+        """Drain the request bucket after the provider rejected a call for rate limiting."""
+        capacity = self.config.capacities.get(REQUESTS_BUCKET)
+        if capacity:
+            await self._backend.adjust(REQUESTS_BUCKET, -capacity / 60.0, capacity)
+
+
+def estimate_tokens(system_instructions: Optional[str], input: Any, tools: Any) -> int:
+    """Estimate the prompt tokens of a model call from its serialized size."""
+    size = len(system_instructions or "")
+    size += len(input) if isinstance(input, str) else len(json.dumps(input, default=str))
+    for tool in tools or []:
+        size += len(json.dumps(getattr(tool, "params_json_schema", None) or {}, default=str))
+        size += len(getattr(tool, "description", "") or "")
+    return max(1, size // CHARS_PER_TOKEN)
+
+
+def _is_rate_limit_error(error: Exception) -> bool:
+    # Matches litellm.RateLimitError and openai.RateLimitError without importing either
+    return getattr(error, "status_code", None) == 429 or type(error).__name__ == "RateLimitError"
+
+
+class RateLimitedModel(Model):
+    """Model wrapper that acquires rate limit capacity before each call."""
+
+    def __init__(self, model: Model, limiter: RateLimiter):
+        self._model = model
+        self._limiter = limiter
+
+    async def _retry_after(self, error: Exception, attempt: int, deadline: float) -> bool:
+        """Back off before retrying a call the provider rejected.
+
+        Returns:
+            False if the error is not a rate limit error or no retry is left before the deadline
+        """
+        config = self._limiter.config
+        if not _is_rate_limit_error(error) or attempt > config.max_retries:
+            return False
+        delay = 2 ** attempt
+        if time.monotonic() + delay > deadline:
+            return False
+        logger.warning("Provider rate limited model call, retrying (%d/%d)", attempt, config.max_retries)
+        await self._limiter.penalize()
+        await asyncio.sleep(delay)
+        return True
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs) -> ModelResponse:
+        estimated = estimate_tokens(system_instructions, input, tools)
+        # One wait budget for queueing and retries, within the activity timeout
+        deadline = self._limiter.wait_deadline()
+        attempt = 0
+        while True:
+            await self._limiter.acquire(estimated, deadline)
+            try:
+                response = await self._model.get_response(
+                    system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+                )
+            except Exception as e:
+                attempt += 1
+                if not await self._retry_after(e, attempt, deadline):
+                    raise
+                continue
+
+            await self._limiter.reconcile(estimated, response.usage.total_tokens)
+            return response
+
+    async def stream_response(self, system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs) -> AsyncIterator[Any]:
+        estimated = estimate_tokens(system_instructions, input, tools)
+        deadline = self._limiter.wait_deadline()
+        attempt = 0
+        while True:
+            await self._limiter.acquire(estimated, deadline)
+            streamed = False
+            total_tokens = 0
+            try:
+                async for event in self._model.stream_response(
+                    system_instructions, input, model_settings, tools, output_schema, handoffs, tracing, **kwargs
+                ):
+                    streamed = True
+                    if getattr(event, "type", None) == "response.completed":
+                        usage = getattr(event.response, "usage", None)
+                        total_tokens = getattr(usage, "total_tokens", 0) or 0
+                    yield event
+            except Exception as e:
+                # Events already yielded cannot be taken back, so only retry before the first one
+                attempt += 1
+                if streamed or not await self._retry_after(e, attempt, deadline):
+                    raise
+                continue
+
+            await self._limiter.reconcile(estimated, total_tokens)
+            return
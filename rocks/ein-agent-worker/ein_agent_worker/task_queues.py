@@ -0,0 +1,89 @@
+"""Task queue layout of Ein Agent workers.
+
+By default workflow tasks, model activities and MCP activities share TEMPORAL_QUEUE.
+Model and MCP activities can be sent to their own task queues instead, and each
+worker deployment can serve any subset of the roles, so the model side and the
+I/O-heavy MCP side scale independently from the same image.
+
+Each role served on its own queue runs as a separate Temporal worker in the
+process, with its own slots (see ein_agent_worker.tuning): TEMPORAL_* for the
+workflow queue, TEMPORAL_MODEL_* and TEMPORAL_MCP_* for the activity queues.
+
+Configuration Format:
+    TEMPORAL_QUEUE: Task queue of workflow tasks (default: ein-agent-queue)
+    TEMPORAL_MODEL_QUEUE: Task queue of model activities (default: TEMPORAL_QUEUE)
+    TEMPORAL_MCP_QUEUE: Task queue of MCP activities, including the pre-classifier (default: TEMPORAL_QUEUE)
+    TEMPORAL_WORKER_ROLES: Comma-separated roles served by this worker:
+        workflow, model, mcp (default: all)
+
+Workflows do not read these variables: the queue of their MCP activities comes
+from the ``mcp_queue`` workflow memo, written by the starter (the CLI, from its own
+TEMPORAL_MCP_QUEUE), so a replay always issues the same activity commands whatever
+the replaying worker's configuration. Model activities are scheduled by the
+OpenAI agents plugin on TEMPORAL_MODEL_QUEUE, which all workflow deployments of a
+layout must share.
+
+Example:
+    # Workflow deployment
+    export TEMPORAL_MODEL_QUEUE="ein-agent-model"
+    export TEMPORAL_MCP_QUEUE="ein-agent-mcp"
+    export TEMPORAL_WORKER_ROLES="workflow"
+    # MCP deployment, same queues
+    export TEMPORAL_WORKER_ROLES="mcp"
+    export TEMPORAL_MCP_MAX_CONCURRENT_ACTIVITIES="200"
+"""
+
+import logging
+import os
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+ROLE_WORKFLOW = "workflow"
+ROLE_MODEL = "model"
+ROLE_MCP = "mcp"
+ROLES = (ROLE_WORKFLOW, ROLE_MODEL, ROLE_MCP)
+
+# Environment prefix of the slot configuration of a worker by its main role
+TUNING_PREFIXES = {
+    ROLE_WORKFLOW: "TEMPORAL_",
+    ROLE_MODEL: "TEMPORAL_MODEL_",
+    ROLE_MCP: "TEMPORAL_MCP_",
+}
+
+
+class TaskQueueConfig:
+    """Task queue layout loaded from environment variables."""
+
+    def __init__(self):
+        """Initialize the task queue layout from environment."""
+        self.queue: str = os.getenv("TEMPORAL_QUEUE", "ein-agent-queue")
+        self.model_queue: Optional[str] = os.getenv("TEMPORAL_MODEL_QUEUE") or None
+        self.mcp_queue: Optional[str] = os.getenv("TEMPORAL_MCP_QUEUE") or None
+
+        roles = os.getenv("TEMPORAL_WORKER_ROLES", ",".join(ROLES))
+        self.roles: List[str] = []
+        for role in (role.strip().lower() for role in roles.split(",")):
+            if role in ROLES:
+                self.roles.append(role)
+            elif role:
+                logger.error("Invalid role '%s' in TEMPORAL_WORKER_ROLES (must be one of %s), ignoring", role, ROLES)
+        if not self.roles:
+            logger.error("TEMPORAL_WORKER_ROLES has no valid role, serving all roles")
+            self.roles = list(ROLES)
+
+    def queue_for(self, role: str) -> str:
+        """Task queue of a role."""
+        if role == ROLE_MODEL and self.model_queue:
+            return self.model_queue
+        if role == ROLE_MCP and self.mcp_queue:
+            return self.mcp_queue
+        return self.queue
+
+    def roles_by_queue(self) -> Dict[str, List[str]]:
+        """The roles served by this worker, grouped by task queue."""
+        queues: Dict[str, List[str]] = {}
+        for role in ROLES:
+            if role in self.roles:
+                queues.setdefault(self.queue_for(role), []).append(role)
+        return queues
@@ -0,0 +1,117 @@
+"""Slot tuning for Ein Agent Temporal workers.
+
+By default a worker runs as many workflow tasks, activities and local activities
+at once as the Temporal SDK defaults allow. These limits can be set per replica,
+either as fixed slot counts or through Temporal's resource-based tuner, which
+hands out slots while the process stays below a CPU and memory target.
+
+Configuration Format:
+    TEMPORAL_TUNER: 'fixed' or 'resource' (default: fixed)
+    TEMPORAL_MAX_CONCURRENT_WORKFLOW_TASKS: Workflow task slots (default: SDK default)
+    TEMPORAL_MAX_CONCURRENT_ACTIVITIES: Activity slots, model and MCP calls (default: SDK default)
+    TEMPORAL_MAX_CONCURRENT_LOCAL_ACTIVITIES: Local activity slots, e.g. knowledge lookups (default: SDK default)
+    TEMPORAL_MAX_CONCURRENT_WORKFLOW_TASK_POLLS: Concurrent workflow task polls (default: SDK default)
+    TEMPORAL_MAX_CONCURRENT_ACTIVITY_TASK_POLLS: Concurrent activity task polls (default: SDK default)
+    TEMPORAL_TUNER_TARGET_CPU: Target CPU usage of the resource tuner, 0.0-1.0 (default: 0.8)
+    TEMPORAL_TUNER_TARGET_MEMORY: Target memory usage of the resource tuner, 0.0-1.0 (default: 0.8)
+    TEMPORAL_TUNER_MIN_ACTIVITIES: Activity slots the resource tuner always allows (default: SDK default)
+
+With the resource tuner, the TEMPORAL_MAX_CONCURRENT_* slot counts are the upper
+bounds of each slot type instead of fixed counts.
+
+Example:
+    export TEMPORAL_MAX_CONCURRENT_ACTIVITIES="50"
+    export TEMPORAL_MAX_CONCURRENT_WORKFLOW_TASKS="20"
+    # or let CPU and memory decide, up to 200 activities
+    export TEMPORAL_TUNER="resource"
+    export TEMPORAL_TUNER_TARGET_MEMORY="0.7"
+    export TEMPORAL_MAX_CONCURRENT_ACTIVITIES="200"
+"""
+
+import logging
+import os
+from typing import Any, Dict, Optional
+
+from temporalio.worker import ResourceBasedSlotConfig, WorkerTuner
+
+logger = logging.getLogger(__name__)
+
+TUNER_FIXED = "fixed"
+TUNER_RESOURCE = "resource"
+
+
+class WorkerTuningConfig:
+    """Worker slot configuration loaded from environment variables."""
+
+    def __init__(self, prefix: str = "TEMPORAL_"):
+        """Initialize worker slot configuration from environment.
+
+        Args:
+            prefix: Environment prefix of the variables
+        """
+        self.prefix = prefix
+        self.tuner: str = os.getenv(f"{prefix}TUNER", TUNER_FIXED).lower()
+        self.max_concurrent_workflow_tasks = self._int("MAX_CONCURRENT_WORKFLOW_TASKS")
+        self.max_concurrent_activities = self._int("MAX_CONCURRENT_ACTIVITIES")
+        self.max_concurrent_local_activities = self._int("MAX_CONCURRENT_LOCAL_ACTIVITIES")
+        self.max_concurrent_workflow_task_polls = self._int("MAX_CONCURRENT_WORKFLOW_TASK_POLLS")
+        self.max_concurrent_activity_task_polls = self._int("MAX_CONCURRENT_ACTIVITY_TASK_POLLS")
+        self.target_cpu: float = float(os.getenv(f"{prefix}TUNER_TARGET_CPU", "0.8"))
+        self.target_memory: float = float(os.getenv(f"{prefix}TUNER_TARGET_MEMORY", "0.8"))
+        self.min_activities = self._int("TUNER_MIN_ACTIVITIES")
+
+        if self.tuner not in (TUNER_FIXED, TUNER_RESOURCE):
+            logger.error("Invalid %sTUNER '%s' (must be 'fixed' or 'resource'), using fixed", prefix, self.tuner)
+            self.tuner = TUNER_FIXED
+
+    def _int(self, name: str) -> Optional[int]:
+        key = f"{self.prefix}{name}"
+        value = os.getenv(key)
+        if not value:
+            return None
+        try:
+            number = int(value)
+        except ValueError:
+            logger.error("Invalid %s '%s' (must be an integer), using the default", key, value)
+            return None
+        if number < 1:
+            logger.error("Invalid %s '%s' (must be at least 1), using the default", key, value)
+            return None
+        return number
+
+    def worker_options(self) -> Dict[str, Any]:
+        """Keyword arguments applying this configuration to a temporalio Worker."""
+        options: Dict[str, Any] = {}
+        if self.max_concurrent_workflow_task_polls:
+            options["max_concurrent_workflow_task_polls"] = self.max_concurrent_workflow_task_polls
+        if self.max_concurrent_activity_task_polls:
+            options["max_concurrent_activity_task_polls"] = self.max_concurrent_activity_task_polls
+
+        if self.tuner == TUNER_RESOURCE:
+            # The tuner replaces the max_concurrent_* options, which become its upper bounds
+            options["tuner"] = WorkerTuner.create_resource_based(
+                target_memory_usage=self.target_memory,
+                target_cpu_usage=self.target_cpu,
+                workflow_config=ResourceBasedSlotConfig(maximum_slots=self.max_concurrent_workflow_tasks),
+                activity_config=ResourceBasedSlotConfig(
+                    minimum_slots=self.min_activities,
+                    maximum_slots=self.max_concurrent_activities,
+                ),
+                local_activity_config=ResourceBasedSlotConfig(maximum_slots=self.max_concurrent_local_activities),
+            )
+            logger.info(
+                "Worker slots (%s*) tuned to resources (cpu=%.2f, memory=%.2f, max activities=%s)",
+                self.prefix,
+                self.target_cpu,
+                self.target_memory,
+                self.max_concurrent_activities or "default",
+            )
+            return options
+
+        for key in ("max_concurrent_workflow_tasks", "max_concurrent_activities", "max_concurrent_local_activities"):
+            value = getattr(self, key)
+            if value:
+                options[key] = value
+        if options:
+            logger.info("Worker slot options (%s*): %s", self.prefix, options)
+        return options
@@ -6,71 +6,143 @@ import os
 from datetime import timedelta
 from temporalio.client import Client
 from temporalio.common import RetryPolicy
+from temporalio.converter import DataConverter
 from temporalio.worker import Worker
+from temporalio.worker.workflow_sandbox import SandboxedWorkflowRunner, SandboxRestrictions
 
-from agents.extensions.models.litellm_provider import LitellmProvider
+from ein_agent_worker.codec import build_payload_codec
+from ein_agent_worker.knowledge import KnowledgeActivities, KnowledgeConfig, RcaKnowledgeIndex
 from ein_agent_worker.mcp_providers import MCPConfig, MCPProviderRegistry
+from ein_agent_worker.mcp_reload import MCPConfigWatcher, MCPReloadConfig
+from ein_agent_worker.model_router import ModelRouterConfig, ModelRouterProvider
+from ein_agent_worker.preclassifier import PreclassifierActivities, PreclassifierConfig
+from ein_agent_worker.rate_limit import RateLimitConfig, RateLimiter
+from ein_agent_worker.task_queues import ROLE_MCP, ROLE_WORKFLOW, TUNING_PREFIXES, TaskQueueConfig
+from ein_agent_worker.tuning import WorkerTuningConfig
 from ein_agent_worker.workflows.single_alert_investigation import SingleAlertInvestigationWorkflow
 from ein_agent_worker.workflows.incident_correlation import (
     IncidentCorrelationWorkflow,
     InitialRcaWorkflow,
     CorrectiveRcaWorkflow,
+    RcaShardWorkflow,
 )
 from temporalio.contrib.openai_agents import OpenAIAgentsPlugin, ModelActivityParameters
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Deterministic-safe modules the workflow sandbox takes from the worker instead of
+# re-importing them for every workflow run (agents and openai are passed through by
+# recent SDKs already, listed to not depend on it). See scripts/profile_imports.py.
+SANDBOX_PASSTHROUGH_MODULES = (
+    "agents",
+    "openai",
+    "litellm",
+)
+
 
 async def main():
     """Start the Temporal worker."""
     # Get config from environment (injected by temporal-worker-k8s-operator)
     host = os.getenv("TEMPORAL_HOST", "localhost:7233")
     namespace = os.getenv("TEMPORAL_NAMESPACE", "default")
-    queue = os.getenv("TEMPORAL_QUEUE", "ein-agent-queue")
 
-    # Load MCP configuration from environment
-    mcp_config = MCPConfig()
+    # Task queues of workflows, model activities and MCP activities, and the roles served here
+    queue_config = TaskQueueConfig()
+
+    # Load MCP configuration from environment, or from a file reloaded while running
+    reload_config = MCPReloadConfig()
+    mcp_config = MCPConfig.from_file(reload_config.path) if reload_config.enabled else MCPConfig()
 
     # Get all registered MCP server providers
     mcp_providers = MCPProviderRegistry.get_all_providers(mcp_config)
 
-    # Create Temporal client
+    # Load model routing (stage/tier -> model) from environment
+    model_router_config = ModelRouterConfig()
+
+    # Shared LLM rate limiter (None when no limits are configured)
+    rate_limit_config = RateLimitConfig()
+    rate_limiter = RateLimiter.from_config(rate_limit_config)
+
+    # Past RCA knowledge, served to workflows by local activities (disabled unless configured)
+    knowledge_config = KnowledgeConfig()
+    knowledge = KnowledgeActivities(knowledge_config, RcaKnowledgeIndex.from_config(knowledge_config))
+
+    # Rule-based Pass 1 for known pod failure signatures
+    preclassifier = PreclassifierActivities(PreclassifierConfig(), mcp_config)
+
+    # Create Temporal client. The plugin replaces the payload converter but keeps the codec.
     client = await Client.connect(
         host,
         namespace=namespace,
+        data_converter=DataConverter(payload_codec=build_payload_codec()),
         plugins=[
             OpenAIAgentsPlugin(
                 model_params=ModelActivityParameters(
-                    start_to_close_timeout=timedelta(seconds=60),
+                    # Time for the call, plus the rate limiter's wait for capacity
+                    start_to_close_timeout=timedelta(seconds=rate_limit_config.activity_timeout),
                     # Disable automatic retries - let the AI agent handle failures
                     # This allows the agent to see tool errors and decide whether to
-                    # fix parameters or try a different approach
+                    # fix parameters or try a different approach. Provider rate limits
+                    # are absorbed by the rate limiter inside the activity instead.
                     retry_policy=RetryPolicy(
                         maximum_attempts=1,  # Only try once, no automatic retries
                     ),
+                    task_queue=queue_config.model_queue,
                 ),
-                # The Gemini needs to define GEMINI_API_KEY environment variable
-                model_provider=LitellmProvider(),
+                # Resolves the stage/tier model references used by the workflows
+                model_provider=ModelRouterProvider(model_router_config, rate_limiter=rate_limiter),
                 mcp_server_providers=mcp_providers,
             )
         ],
     )
 
-    # Create worker
-    worker = Worker(
-        client,
-        task_queue=queue,
-        workflows=[
-            SingleAlertInvestigationWorkflow,
-            IncidentCorrelationWorkflow,
-            InitialRcaWorkflow,
-            CorrectiveRcaWorkflow,
-        ],
-    )
+    # Create one worker per task queue served, each with its own slots (from the
+    # environment prefix of its main role). The plugin registers the model and MCP
+    # activities on every worker; only the queues they are scheduled on receive them.
+    workers = []
+    for queue, roles in queue_config.roles_by_queue().items():
+        workflows = []
+        activities = []
+        if ROLE_WORKFLOW in roles:
+            workflows = [
+                SingleAlertInvestigationWorkflow,
+                IncidentCorrelationWorkflow,
+                InitialRcaWorkflow,
+                CorrectiveRcaWorkflow,
+                RcaShardWorkflow,
+            ]
+            # Local activities run on the workflow worker
+            activities += [knowledge.lookup_similar_rcas, knowledge.record_rca]
+        if ROLE_MCP in roles:
+            activities.append(preclassifier.preclassify_alert)
+            if reload_config.enabled:
+                # Serves the MCP servers added to the file after startup
+                activities.append(MCPProviderRegistry.get_dynamic_activity(mcp_config))
+
+        workers.append(Worker(
+            client,
+            task_queue=queue,
+            workflows=workflows,
+            activities=activities,
+            workflow_runner=SandboxedWorkflowRunner(
+                restrictions=SandboxRestrictions.default.with_passthrough_modules(*SANDBOX_PASSTHROUGH_MODULES),
+            ),
+            **WorkerTuningConfig(TUNING_PREFIXES[roles[0]]).worker_options(),
+        ))
+        logger.info("Serving %s on queue: %s", ", ".join(roles), queue)
+
+    watcher_task = None
+    if reload_config.enabled:
+        watcher = MCPConfigWatcher(reload_config.path, mcp_config, interval=reload_config.interval)
+        watcher_task = asyncio.create_task(watcher.run())
 
-    logger.info("Worker started successfully on queue: %s", queue)
-    await worker.run()
+    logger.info("Worker started successfully with %d task queue(s)", len(workers))
+    try:
+        await asyncio.gather(*(worker.run() for worker in workers))
+    finally:
+        if watcher_task is not None:
+            watcher_task.cancel()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,29 @@
+"""Routing of RCA child workflows to cluster-local task queues.
+
+With MCP servers deployed per Kubernetes cluster, each cluster runs its own worker
+pool on its own task queue. The CLI passes a mapping from an alert label value
+(e.g. the `cluster` label) to task queue in the ``cluster_queues`` memo, and the
+incident workflow starts the RCA of each alert on the queue of its cluster, so
+its MCP calls stay next to their targets. Alerts without a mapped label value run
+on the incident workflow's own queue.
+"""
+
+from typing import Any, Dict
+
+from temporalio import workflow
+
+MEMO_KEY = "cluster_queues"
+
+
+def routing_memo() -> Dict[str, Any]:
+    """The routing memo of the current workflow, to pass on to child workflows."""
+    routing = workflow.memo_value(MEMO_KEY, default=None)
+    return {MEMO_KEY: routing} if routing else {}
+
+
+def alert_task_queue(alert: Dict[str, Any]) -> str:
+    """Task queue of the cluster an alert comes from, or the current workflow's queue."""
+    routing = workflow.memo_value(MEMO_KEY, default=None) or {}
+    value = alert.get("labels", {}).get(routing.get("label") or "cluster")
+    queue = routing.get("queues", {}).get(value) if value else None
+    return queue or workflow.info().task_queue
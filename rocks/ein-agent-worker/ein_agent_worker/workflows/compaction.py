@@ -0,0 +1,99 @@
+"""Conversation compaction for long-running agent investigations.
+
+Every model call re-sends the whole conversation, including raw tool results such
+as large ``kubectl get``, Prometheus and Loki outputs. Once the history grows past
+``COMPACTION_TOKEN_THRESHOLD``, older tool results are reduced to their head, tail
+and the lines that look like evidence (errors, failure reasons, exit codes), so the
+per-turn cost stays roughly flat. The most recent tool results are always kept
+verbatim, and the stored history itself is never modified.
+"""
+
+import json
+import re
+from typing import Any, List
+
+from agents import RunConfig
+from agents.run import CallModelData, ModelInputData
+
+# Estimated history size (in tokens) above which older tool results are compacted
+COMPACTION_TOKEN_THRESHOLD = 24000
+
+# Number of most recent tool results that are never compacted
+KEEP_RECENT_TOOL_OUTPUTS = 3
+
+# Shape of a compacted tool result
+HEAD_LINES = 20
+TAIL_LINES = 10
+MAX_EVIDENCE_LINES = 40
+MAX_LINE_CHARS = 400
+MAX_COMPACTED_CHARS = 8000
+
+CHARS_PER_TOKEN = 4
+
+COMPACTED_MARKER = "[compacted tool output"
+
+EVIDENCE_PATTERN = re.compile(
+    r"error|fail|warn|fatal|panic|exception|oomkilled|backoff|evict|notready|not ready|"
+    r"unschedulable|insufficient|exit ?code|reason|denied|forbidden|timeout|refused|killed",
+    re.IGNORECASE,
+)
+
+
+def _estimate_tokens(items: List[Any]) -> int:
+    return len(json.dumps(items, default=str)) // CHARS_PER_TOKEN
+
+
+def _truncate_chars(output: str) -> str:
+    if len(output) <= MAX_COMPACTED_CHARS:
+        return output
+    half = MAX_COMPACTED_CHARS // 2
+    omitted = len(output) - 2 * half
+    return f"{output[:half]}\n{COMPACTED_MARKER}: {omitted} characters omitted]\n{output[-half:]}"
+
+
+def compact_tool_output(output: str) -> str:
+    """Reduce a tool result to its head, tail and evidence lines."""
+    lines = output.splitlines()
+    if len(lines) <= HEAD_LINES + TAIL_LINES + MAX_EVIDENCE_LINES:
+        # Few but long lines (e.g. single-line JSON) are truncated by characters instead
+        return _truncate_chars(output)
+
+    middle = lines[HEAD_LINES:-TAIL_LINES]
+    evidence = [line[:MAX_LINE_CHARS] for line in middle if EVIDENCE_PATTERN.search(line)]
+    evidence = evidence[:MAX_EVIDENCE_LINES]
+
+    parts = [
+        *lines[:HEAD_LINES],
+        f"{COMPACTED_MARKER}: {len(middle)} of {len(lines)} lines omitted, "
+        f"{len(evidence)} evidence lines kept verbatim]",
+        *evidence,
+        "[end of evidence lines]",
+        *lines[-TAIL_LINES:],
+    ]
+    return _truncate_chars("\n".join(parts))
+
+
+def compact_model_input(data: CallModelData[Any]) -> ModelInputData:
+    """call_model_input_filter compacting older tool results once the history is too large."""
+    model_data = data.model_data
+    if _estimate_tokens(model_data.input) <= COMPACTION_TOKEN_THRESHOLD:
+        return model_data
+
+    output_indexes = [
+        i for i, item in enumerate(model_data.input)
+        if isinstance(item, dict) and item.get("type") == "function_call_output"
+    ]
+    compactable = output_indexes[:-KEEP_RECENT_TOOL_OUTPUTS] if KEEP_RECENT_TOOL_OUTPUTS else output_indexes
+
+    items = list(model_data.input)
+    for i in compactable:
+        output = items[i].get("output")
+        if isinstance(output, str):
+            items[i] = {**items[i], "output": compact_tool_output(output)}
+
+    return ModelInputData(input=items, instructions=model_data.instructions)
+
+
+def compacting_run_config() -> RunConfig:
+    """Run configuration applying conversation compaction before each model call."""
+    return RunConfig(call_model_input_filter=compact_model_input)
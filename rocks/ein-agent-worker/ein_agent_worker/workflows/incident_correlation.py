@@ -4,25 +4,74 @@ Incident correlation using a two-pass parallel multi-agent pattern.
 Each agent workflow performs one pass of analysis and returns the result.
 The orchestrator runs Pass 1 in parallel, collects results, then runs Pass 2
 in parallel with the aggregated context from Pass 1.
+
+Large incidents are split into shard workflows of at most MAX_ALERTS_PER_SHARD
+alerts, and the orchestrator continues as new between phases, so the history of
+any single workflow stays bounded as the alert count grows.
+
+Running incidents accept new alerts (`add_alerts` signal) and resolved alerts
+(`resolve_alerts` signal). The RCA child workflows of resolved alerts are
+cancelled and the alerts are reported as transient instead of being correlated.
+
+RCA child workflows report each completed RCA and its token usage to the incident
+workflow, whose `progress` query exposes the phase, per-alert status, usage and the
+RCAs completed so far, so clients can stream findings before the incident completes.
+
+Pod alerts matching a known failure signature get their Pass 1 report from a
+rule-based pre-classifier (see ein_agent_worker.preclassifier). For other alerts,
+Pass 1 starts from the similar past RCAs of the worker's knowledge index, or reuses
+a close enough one as its answer (see ein_agent_worker.knowledge). Accepted Pass 2
+reports are recorded in the index, except those built on a reused answer: recording
+them again would renew an old answer, so it would never reach
+RCA_KNOWLEDGE_CACHE_MAX_AGE and never be investigated afresh.
+
+The incident's search attributes (alert names, fingerprints, severity, alert and
+incident counts, see search_attributes.py) are kept up to date for visibility queries.
+
+RCA child workflows run on the task queue of their alert's cluster when the CLI
+passes a cluster queue mapping (see cluster_queues.py). The knowledge index lives
+on the worker running the RCA, so each cluster's worker pool then has its own index,
+fed and read only by the RCAs of that cluster's alerts.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence, Set
 import asyncio
+import dataclasses
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from temporalio import workflow
-from temporalio.contrib import openai_agents
-from agents import Agent, Runner
-
-# Prompt for the first, independent RCA pass
-PASS_1_RCA_PROMPT = """You are an RCA analyst. Your task is to perform a root cause analysis for the given alert.
+from temporalio.exceptions import ChildWorkflowError
+from agents import Agent, Usage
+
+from ein_agent_worker.workflows.cluster_queues import alert_task_queue, routing_memo
+from ein_agent_worker.workflows.knowledge import (
+    cached_pass1_report,
+    is_cached_report,
+    format_similar_rcas,
+    lookup_similar_rcas,
+    record_rca,
+)
+from ein_agent_worker.workflows.mcp_servers import classify_alert, load_mcp_servers, mcp_queue_memo
+from ein_agent_worker.workflows.preclassifier import can_preclassify, preclassify
+from ein_agent_worker.workflows.routing import (
+    STAGE_CORRELATION,
+    STAGE_PASS1,
+    STAGE_PASS2,
+    escalation_reason,
+    parse_report,
+    run_with_escalation,
+)
+from ein_agent_worker.workflows.search_attributes import INCIDENT_COUNT, alert_updates, upsert_incident_attributes
+from ein_agent_worker.workflows.topology import overlapping_alerts
+
+# Prompts are split into static agent instructions and a dynamic input so that the
+# long, identical instructions form a stable prefix that providers can cache.
+
+# Instructions for the first, independent RCA pass
+PASS_1_RCA_INSTRUCTIONS = """You are an RCA analyst. Your task is to perform a root cause analysis for the alert given in the input.
 You do not have context from other alerts. Do your best and explicitly note any limitations or dependencies.
 
-**Your Primary Alert to Investigate:**
-{primary_alert_summary}
-
----
 ## Investigation & Deliverable
 
 ### Step 1: Identify the Resource and Its Dependencies
@@ -31,7 +80,7 @@ You do not have context from other alerts. Do your best and explicitly note any
 3.  **Identify all resource dependencies**: List ALL infrastructure and application resources this instance depends on.
 
 ### Step 2: Check Dependency Health
-4.  **Check the health of EACH dependency**: For every dependency you identified, verify its current state and health using available tools.
+4.  **Check the health of EACH dependency**: For every dependency you identified, verify its current state and health using available tools. The checks are independent, so request all of them in the same turn - they run in parallel.
 5.  **Document the findings**: Record the state of each dependency.
 
 ### Step 3: Determine Root Cause vs Symptom
@@ -40,37 +89,42 @@ You do not have context from other alerts. Do your best and explicitly note any
     - If ANY dependency is unhealthy or failed, mark `is_likely_symptom: true` and document the specific dependency in `suspected_upstream_cause`.
     - Example: If a workload is not ready AND its host/node is down or degraded, the workload failure is a SYMPTOM of the host failure.
 7.  **If you cannot fully determine the root cause** due to missing context, document this in `limitations`.
+8.  **Rate your confidence** in the root cause as a number between 0.0 and 1.0 in `confidence`.
+9.  **If the input lists similar past RCAs**, treat them as hypotheses: verify them with the available tools before relying on them, as the same alert can have a different cause this time.
 
 ### Step 4: Produce Report
-8.  **CRITICAL**: Return ONLY a single, valid JSON object for your report.
+10. **CRITICAL**: Return ONLY a single, valid JSON object for your report.
 
 ```json
-{{
-  "alert_name": "{alertname}",
+{
+  "alert_name": "The alertname of the alert under investigation",
   "affected_resource": "Specific resource identifier with type prefix",
   "infrastructure_placement": "For workloads, specify where it runs (e.g., which node/host)",
+  "root_cause_category": "Resource Shortage, Image Pull Failure, Container Failure, Node Failure, Storage, Network, Configuration or Other",
   "root_cause_summary": "Brief summary of the immediate cause for THIS specific resource instance",
   "root_cause_details": "Detailed analysis including: 1) resource placement, 2) dependency health checks, 3) causal reasoning",
   "is_likely_symptom": false,
   "suspected_upstream_cause": "null OR specific upstream resource that failed",
-  "limitations": "null or description of missing context needed for definitive RCA"
-}}
+  "limitations": "null or description of missing context needed for definitive RCA",
+  "confidence": 0.0
+}
 ```
 """
 
-# Prompt for the second, corrective RCA pass, triggered by a signal
-PASS_2_RCA_PROMPT = """You are a senior analyst who has just received new intelligence from your team.
-Your task is to review your own initial findings in light of this new context and produce a final, definitive RCA report.
+PASS_1_RCA_INPUT = """**Your Primary Alert to Investigate:**
+{primary_alert_summary}
+"""
 
-**Your Initial Draft Report:**
-```json
-{draft_rca}
-```
+SIMILAR_RCAS_INPUT = """
+**Similar Past RCAs (unverified for this alert):**
+{similar_rcas}
+"""
 
-**New Intelligence (Context from all other agents):**
-{all_other_draft_rcas}
+# Instructions for the second, corrective RCA pass
+PASS_2_RCA_INSTRUCTIONS = """You are a senior analyst who has just received new intelligence from your team.
+Your task is to review your own initial findings (your draft report in the input) in light of the new context
+(the draft reports of all other agents in the input) and produce a final, definitive RCA report.
 
----
 ## Your Task
 1.  **Analyze the New Context:** Review all other agents' reports to identify potential causal relationships **specific to your resource instance**.
 2.  **Check for Resource-Specific Dependencies:**
@@ -90,6 +144,7 @@ Your task is to review your own initial findings in light of this new context an
     - If no other agent's report is relevant to your specific resource instance, maintain your independent root cause assessment.
 5.  **Form a Final Conclusion:** Synthesize your draft with the new intelligence to produce a definitive, causally-accurate RCA.
 6.  **Produce the FINAL Report:** Create the final report with explicit causal attribution.
+7.  **Rate your confidence** in the final conclusion as a number between 0.0 and 1.0 in `confidence`.
 
 ---
 ## Deliverable Format
@@ -97,22 +152,115 @@ Provide the **final, corrected** RCA report in JSON format.
 **CRITICAL**: Return ONLY valid JSON.
 
 ```json
-{{
-  "alert_name": "{alertname}",
+{
+  "alert_name": "Same alertname from draft",
   "affected_resource": "Same specific resource identifier from draft",
   "infrastructure_placement": "Same infrastructure placement from draft",
   "is_symptom": false,
   "caused_by_alert": "null or the specific alert instance that caused this one (include affected_resource for clarity)",
   "caused_by_resource": "null or the specific resource that failed and caused this symptom (e.g., the node name)",
+  "root_cause_category": "Resource Shortage, Image Pull Failure, Container Failure, Node Failure, Storage, Network, Configuration or Other",
   "root_cause_summary": "Final summary with causal attribution if applicable",
   "root_cause_details": "Final details incorporating cross-agent context and explicit causal reasoning for THIS specific resource",
   "evidence": [],
   "affected_resources": [],
-  "limitations": "null if fully resolved"
-}}
+  "limitations": "null if fully resolved",
+  "confidence": 0.0
+}
 ```
 """
 
+PASS_2_RCA_INPUT = """**Your Initial Draft Report:**
+```json
+{draft_rca}
+```
+
+**New Intelligence (Context from all other agents):**
+{all_other_draft_rcas}
+"""
+
+# Fields a report must contain to be accepted without escalating to a stronger model
+PASS_1_REQUIRED_FIELDS = ("alert_name", "affected_resource", "root_cause_summary", "is_likely_symptom")
+PASS_2_REQUIRED_FIELDS = ("alert_name", "affected_resource", "root_cause_summary", "is_symptom")
+CORRELATION_REQUIRED_FIELDS = ("total_alerts", "total_incidents", "incidents")
+
+# Alerts handled by one workflow per pass before the pass is split into shard workflows
+MAX_ALERTS_PER_SHARD = 20
+
+# Orchestration phases, separated by continue-as-new
+PHASE_PASS1 = "pass1"
+PHASE_PASS2 = "pass2"
+PHASE_CORRELATION = "correlation"
+PHASE_COMPLETED = "completed"
+
+
+@dataclass
+class IncidentCorrelationState:
+    """Progress carried across continue-as-new between orchestration phases.
+
+    Attributes:
+        phase: Phase to run next
+        draft_rcas: Pass 1 reports, in alert order
+        final_rcas: Pass 2 reports, in alert order
+        rerun_indexes: Alerts whose Pass 2 report changed in this round (None for all alerts)
+        correlation_report: Correlation report of the previous round, updated incrementally
+        pending_alerts: Alerts added by signal that are not investigated yet
+        resolved_fingerprints: Alerts that resolved during the investigation
+        events: Completed RCAs in completion order, as {phase, index, alertname, fingerprint}
+        usage: Token usage of the whole incident so far
+        round: Number of completed correlation rounds
+    """
+
+    phase: str = PHASE_PASS1
+    draft_rcas: List[str] = field(default_factory=list)
+    final_rcas: List[str] = field(default_factory=list)
+    rerun_indexes: Optional[List[int]] = None
+    correlation_report: Optional[str] = None
+    pending_alerts: List[Dict[str, Any]] = field(default_factory=list)
+    resolved_fingerprints: List[str] = field(default_factory=list)
+    events: List[Dict[str, Any]] = field(default_factory=list)
+    usage: Dict[str, int] = field(default_factory=dict)
+    round: int = 0
+
+
+@dataclass
+class RcaCompletion:
+    """A completed RCA reported by a child workflow to its incident workflow.
+
+    Attributes:
+        phase: PHASE_PASS1 or PHASE_PASS2
+        index: Index of the alert in the incident
+        report: The RCA report
+        usage: Token usage of the child workflow
+    """
+
+    phase: str
+    index: int
+    report: str
+    usage: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass
+class RcaShardInput:
+    """Input of a shard workflow running one pass for a slice of the alerts.
+
+    Attributes:
+        phase: PHASE_PASS1 or PHASE_PASS2
+        alerts: The alerts of this shard
+        indexes: Index of each alert of this shard in the incident
+        id_prefix: Workflow ID prefix of the RCA child workflows
+        draft_rcas: All Pass 1 drafts of the incident (Pass 2 only)
+        resolved_fingerprints: Alerts already resolved, which are not investigated
+    """
+
+    phase: str
+    alerts: List[Dict[str, Any]]
+    indexes: List[int]
+    id_prefix: str
+    draft_rcas: List[str] = field(default_factory=list)
+    resolved_fingerprints: List[str] = field(default_factory=list)
+
+
 @workflow.defn
 class InitialRcaWorkflow:
     """Performs the first-pass, independent RCA for a single alert."""
@@ -120,24 +268,50 @@ class InitialRcaWorkflow:
     @workflow.run
     async def run(self, alert: Dict[str, Any]) -> str:
         """Runs Pass 1: Independent RCA and returns the result."""
-        workflow.logger.info(f"Starting Pass 1 RCA for {alert.get('alertname', 'unknown')}")
+        category = classify_alert(alert)
+        workflow.logger.info(f"Starting Pass 1 RCA for {alert.get('alertname', 'unknown')} (tool profile: {category})")
+
+        # Known failure signatures are classified from live cluster state without the model
+        if can_preclassify(alert, category):
+            output = await preclassify(alert)
+            if output is not None:
+                workflow.logger.info(f"Pre-classified {alert.get('alertname', 'unknown')} from a known failure signature")
+                await _report_completion(PHASE_PASS1, output, Usage())
+                return output
+
+        lookup = await lookup_similar_rcas(alert)
+        if lookup.cached is not None:
+            workflow.logger.info(
+                f"Reusing a past RCA of {alert.get('alertname', 'unknown')} (similarity {lookup.cached.score})"
+            )
+            output = cached_pass1_report(lookup.cached, alert)
+            await _report_completion(PHASE_PASS1, output, Usage())
+            return output
 
-        prompt = PASS_1_RCA_PROMPT.format(
-            primary_alert_summary=_format_alert_summary(alert),
-            alertname=alert.get("alertname", "unknown")
-        )
+        prompt = PASS_1_RCA_INPUT.format(primary_alert_summary=_format_alert_summary(alert))
+        if lookup.matches:
+            prompt += SIMILAR_RCAS_INPUT.format(similar_rcas=format_similar_rcas(lookup.matches))
 
-        mcp_servers = _load_mcp_servers()
+        mcp_servers = load_mcp_servers(tool_profile=category)
         agent = Agent(
             name="InitialRCAAnalyst",
-            instructions="You are an RCA analyst.",
-            model="gemini/gemini-2.0-flash-exp",
+            instructions=PASS_1_RCA_INSTRUCTIONS,
             mcp_servers=mcp_servers,
         )
 
-        result = await Runner.run(agent, input=prompt)
+        usage = Usage()
+        # Missing context from the other alerts is expected here and resolved by Pass 2
+        output = await run_with_escalation(
+            agent,
+            STAGE_PASS1,
+            prompt,
+            required_fields=PASS_1_REQUIRED_FIELDS,
+            usage=usage,
+            escalate_on_limitations=False,
+        )
         workflow.logger.info(f"Completed Pass 1 RCA for {alert.get('alertname', 'unknown')}")
-        return result.final_output
+        await _report_completion(PHASE_PASS1, output, usage)
+        return output
 
 
 @workflow.defn
@@ -150,114 +324,549 @@ class CorrectiveRcaWorkflow:
         alertname = alert.get("alertname", "unknown")
         workflow.logger.info(f"Starting Pass 2 RCA for {alertname}")
 
-        prompt = PASS_2_RCA_PROMPT.format(
+        prompt = PASS_2_RCA_INPUT.format(
             draft_rca=draft_rca,
             all_other_draft_rcas=all_other_draft_rcas,
-            alertname=alertname,
         )
 
-        mcp_servers = _load_mcp_servers()
+        mcp_servers = load_mcp_servers(tool_profile=classify_alert(alert))
         agent = Agent(
             name="CorrectiveRCAAnalyst",
-            instructions="You are an RCA analyst.",
-            model="gemini/gemini-2.0-flash-exp",
+            instructions=PASS_2_RCA_INSTRUCTIONS,
             mcp_servers=mcp_servers,
         )
 
-        result = await Runner.run(agent, input=prompt)
+        usage = Usage()
+        output = await run_with_escalation(
+            agent, STAGE_PASS2, prompt, required_fields=PASS_2_REQUIRED_FIELDS, usage=usage
+        )
         workflow.logger.info(f"Completed Pass 2 RCA for {alertname}")
-        return result.final_output
+        # Only reports accepted without limitations become knowledge for future incidents,
+        # and reports built on a reused answer would only renew it
+        if escalation_reason(output, PASS_2_REQUIRED_FIELDS) is None and not is_cached_report(draft_rca):
+            await record_rca(alert, output)
+        await _report_completion(PHASE_PASS2, output, usage)
+        return output
 
 
-def _load_mcp_servers() -> List[Any]:
-    """Load MCP servers from workflow memo."""
-    mcp_servers = []
-    for name in workflow.memo_value("mcp_servers", default=[]):
-        try:
-            mcp_servers.append(openai_agents.workflow.stateless_mcp_server(name))
-        except Exception as e:
-            workflow.logger.warning(f"Failed to load MCP server '{name}': {e}")
-    return mcp_servers
+@workflow.defn
+class RcaShardWorkflow:
+    """Runs one RCA pass for a bounded slice of the alerts of a large incident."""
+
+    @workflow.init
+    def __init__(self, shard: RcaShardInput) -> None:
+        incident_workflow_id = workflow.memo_value("incident_workflow_id", default=workflow.info().workflow_id)
+        self._children = _RcaChildren(incident_workflow_id, shard.resolved_fingerprints)
+
+    @workflow.signal
+    async def resolve_alerts(self, fingerprints: List[str]) -> None:
+        """Cancels the RCAs of alerts that resolved."""
+        await self._children.resolve(fingerprints)
+
+    @workflow.run
+    async def run(self, shard: RcaShardInput) -> List[str]:
+        workflow.logger.info(f"Running {shard.phase} for {len(shard.alerts)} alerts")
+        reports = await self._children.run(shard.phase, shard.alerts, shard.indexes, shard.id_prefix, shard.draft_rcas)
+        await workflow.wait_condition(workflow.all_handlers_finished)
+        return reports
+
 
 @workflow.defn
 class IncidentCorrelationWorkflow:
-    """Orchestrates two-pass parallel RCA agents for incident correlation."""
+    """Orchestrates two-pass parallel RCA agents for incident correlation.
+
+    Alerts that fire during the investigation can be added with the `add_alerts`
+    signal. They get a Pass 1 run, only the existing alerts sharing a resource with
+    them get Pass 2 again, and the correlation report is updated incrementally.
+
+    Alerts that resolve during the investigation can be reported with the
+    `resolve_alerts` signal. Their running RCAs are cancelled and they are left
+    out of the correlation as transient alerts.
+
+    The `progress` query reports the phase, per-alert status, token usage and the
+    RCAs completed since a given event cursor.
+    """
+
+    @workflow.init
+    def __init__(self, alerts: List[Dict[str, Any]], state: Optional[IncidentCorrelationState] = None) -> None:
+        self._alerts: List[Dict[str, Any]] = list(alerts)
+        self._state = state or IncidentCorrelationState()
+        self._pending_alerts: List[Dict[str, Any]] = list(self._state.pending_alerts)
+        self._children = _RcaChildren(workflow.info().workflow_id, self._state.resolved_fingerprints)
+        self._phase = self._state.phase
+        self._events: List[Dict[str, Any]] = list(self._state.events)
+        self._usage: Dict[str, int] = dict(self._state.usage)
+        self._correlation_report = self._state.correlation_report
+        # Reports completed in this run, by "{phase}:{index}"
+        self._live_reports: Dict[str, str] = {}
+
+    @workflow.signal
+    def add_alerts(self, alerts: List[Dict[str, Any]]) -> None:
+        """Adds alerts that fired while the incident is being investigated."""
+        known = {a.get("fingerprint") for a in self._alerts + self._pending_alerts if a.get("fingerprint")}
+        added = 0
+        for alert in alerts:
+            fingerprint = alert.get("fingerprint")
+            if fingerprint and fingerprint in known:
+                continue
+            self._pending_alerts.append(alert)
+            if fingerprint:
+                known.add(fingerprint)
+            added += 1
+        workflow.logger.info(f"Received {len(alerts)} alerts by signal, {added} new")
+
+    @workflow.signal
+    async def resolve_alerts(self, fingerprints: List[str]) -> None:
+        """Cancels the RCAs of alerts that resolved and drops them from the correlation."""
+        workflow.logger.info(f"Received {len(fingerprints)} resolved alerts by signal")
+        await self._children.resolve(fingerprints)
+
+    @workflow.signal
+    def rca_completed(self, completion: RcaCompletion) -> None:
+        """Records an RCA completed by a child workflow."""
+        self._live_reports[f"{completion.phase}:{completion.index}"] = completion.report
+        alert = self._alert(completion.index)
+        self._events.append({
+            "phase": completion.phase,
+            "index": completion.index,
+            "alertname": alert.get("alertname", "unknown"),
+            "fingerprint": alert.get("fingerprint", ""),
+        })
+        self._add_usage(completion.usage)
+
+    @workflow.query
+    def progress(self, since: int = 0) -> Dict[str, Any]:
+        """Phase, per-alert status, token usage and the RCAs completed since event `since`."""
+        alerts = self._alerts + self._pending_alerts
+        return {
+            "phase": self._phase,
+            "round": self._state.round,
+            "alerts": [
+                {
+                    "index": i,
+                    "alertname": alert.get("alertname", "unknown"),
+                    "fingerprint": alert.get("fingerprint", ""),
+                    "status": self._alert_status(i, alert),
+                }
+                for i, alert in enumerate(alerts)
+            ],
+            "usage": self._usage,
+            "completed": [
+                {**event, "report": self._report(event["phase"], event["index"])}
+                for event in self._events[since:]
+            ],
+            "next": len(self._events),
+            "correlation_report": self._correlation_report,
+        }
+
+    @workflow.query
+    def alert_fingerprints(self) -> Dict[str, List[str]]:
+        """Fingerprints of the alerts of the incident and of those that resolved."""
+        alerts = self._alerts + self._pending_alerts
+        return {
+            "alerts": [a["fingerprint"] for a in alerts if a.get("fingerprint")],
+            "resolved": sorted(self._children.resolved),
+        }
 
     @workflow.run
-    async def run(self, alerts: List[Dict[str, Any]]) -> str:
-        alert_count = len(alerts)
-        workflow.logger.info(f"Orchestrating {alert_count} RCA agents in two passes.")
-
-        # --- Pass 1: Run all initial RCA workflows in parallel ---
-        workflow.logger.info("Starting Pass 1: Independent RCA for all alerts...")
-        pass1_workflows = []
-        for i, alert in enumerate(alerts):
-            workflow_id = f"{workflow.info().workflow_id}-pass1-{i}"
-            pass1_workflows.append(
-                workflow.execute_child_workflow(
-                    InitialRcaWorkflow.run,
-                    args=[alert],
-                    id=workflow_id,
-                    task_queue=workflow.info().task_queue,
-                    memo={"mcp_servers": workflow.memo_value("mcp_servers", default=[])},
-                )
+    async def run(self, alerts: List[Dict[str, Any]], state: Optional[IncidentCorrelationState] = None) -> str:
+        state = self._state
+        id_prefix = workflow.info().workflow_id if state.round == 0 else f"{workflow.info().workflow_id}-r{state.round}"
+
+        # --- Pass 1: Run initial RCA workflows in parallel for alerts without a draft ---
+        if state.phase == PHASE_PASS1:
+            if state.round == 0:
+                workflow.logger.info(f"Orchestrating {len(self._alerts)} RCA agents in two passes.")
+            workflow.logger.info("Starting Pass 1: Independent RCA for all alerts...")
+            draft_rcas = list(state.draft_rcas)
+            # Alerts added while Pass 1 runs join this round
+            while self._take_pending_alerts() or len(draft_rcas) < len(self._alerts):
+                new_indexes = list(range(len(draft_rcas), len(self._alerts)))
+                draft_rcas += await self._run_pass(PHASE_PASS1, new_indexes, id_prefix)
+            workflow.logger.info(f"Pass 1 complete. Collected {len(draft_rcas)} initial RCA reports.")
+            # Start the next phase with a fresh history
+            await workflow.wait_condition(workflow.all_handlers_finished)
+            workflow.continue_as_new(args=[self._alerts, self._next_state(state, PHASE_PASS2, draft_rcas=draft_rcas)])
+
+        # --- Pass 2: Run corrective RCA workflows in parallel with context ---
+        if state.phase == PHASE_PASS2:
+            rerun_indexes = self._pass2_indexes(len(state.final_rcas))
+            workflow.logger.info(
+                f"Starting Pass 2: Corrective RCA with cross-agent context for {len(rerun_indexes)} alerts..."
             )
-
-        # Wait for all Pass 1 workflows to complete
-        draft_rcas: List[str] = await asyncio.gather(*pass1_workflows)
-        workflow.logger.info(f"Pass 1 complete. Collected {len(draft_rcas)} initial RCA reports.")
-
-        # --- Pass 2: Run all corrective RCA workflows in parallel with context ---
-        workflow.logger.info("Starting Pass 2: Corrective RCA with cross-agent context...")
-        pass2_workflows = []
-        for i, alert in enumerate(alerts):
-            # Prepare context: all other draft RCAs (excluding this agent's own draft)
-            other_drafts = [rca for j, rca in enumerate(draft_rcas) if i != j]
-            all_other_context = "\n---\n".join(other_drafts)
-
-            workflow_id = f"{workflow.info().workflow_id}-pass2-{i}"
-            pass2_workflows.append(
-                workflow.execute_child_workflow(
-                    CorrectiveRcaWorkflow.run,
-                    args=[alert, draft_rcas[i], all_other_context],
-                    id=workflow_id,
-                    task_queue=workflow.info().task_queue,
-                    memo={"mcp_servers": workflow.memo_value("mcp_servers", default=[])},
-                )
+            reports = await self._run_pass(PHASE_PASS2, rerun_indexes, id_prefix, state.draft_rcas)
+            final_rcas = state.final_rcas + [""] * (len(self._alerts) - len(state.final_rcas))
+            for i, report in zip(rerun_indexes, reports):
+                final_rcas[i] = report
+            workflow.logger.info(f"Pass 2 complete. Collected {len(reports)} final RCA reports.")
+            await workflow.wait_condition(workflow.all_handlers_finished)
+            workflow.continue_as_new(
+                args=[
+                    self._alerts,
+                    self._next_state(
+                        state,
+                        PHASE_CORRELATION,
+                        final_rcas=final_rcas,
+                        # The first round correlates all reports
+                        rerun_indexes=rerun_indexes if state.correlation_report else None,
+                    ),
+                ]
             )
 
-        # Wait for all Pass 2 workflows to complete
-        final_rcas: List[str] = await asyncio.gather(*pass2_workflows)
-        workflow.logger.info(f"Pass 2 complete. Collected {len(final_rcas)} final RCA reports.")
-
         # --- Final Correlation ---
-        return await self._run_final_correlation(final_rcas, alert_count)
+        report = await self._run_final_correlation(state.final_rcas, state.correlation_report, state.rerun_indexes)
+        self._correlation_report = report
+        parsed_report = parse_report(report)
+        if parsed_report and isinstance(parsed_report.get("total_incidents"), int):
+            upsert_incident_attributes([INCIDENT_COUNT.value_set(parsed_report["total_incidents"])])
+        await workflow.wait_condition(workflow.all_handlers_finished)
+
+        # Alerts added in the meantime start a new, incremental round
+        if self._pending_alerts:
+            workflow.logger.info(
+                f"{len(self._pending_alerts)} alerts added during the investigation, "
+                f"starting correlation round {state.round + 1}"
+            )
+            workflow.continue_as_new(
+                args=[
+                    self._alerts,
+                    IncidentCorrelationState(
+                        phase=PHASE_PASS1,
+                        draft_rcas=state.draft_rcas,
+                        final_rcas=state.final_rcas,
+                        correlation_report=report,
+                        pending_alerts=self._pending_alerts,
+                        resolved_fingerprints=sorted(self._children.resolved),
+                        events=self._events,
+                        usage=self._usage,
+                        round=state.round + 1,
+                    ),
+                ]
+            )
+        self._phase = PHASE_COMPLETED
+        return report
+
+    def _alert(self, index: int) -> Dict[str, Any]:
+        alerts = self._alerts + self._pending_alerts
+        return alerts[index] if index < len(alerts) else {}
+
+    def _report(self, phase: str, index: int) -> Optional[str]:
+        """Report of an alert for a phase, from this run or from the carried state."""
+        report = self._live_reports.get(f"{phase}:{index}")
+        if report is not None:
+            return report
+        reports = self._state.draft_rcas if phase == PHASE_PASS1 else self._state.final_rcas
+        return reports[index] if index < len(reports) and reports[index] else None
+
+    def _alert_status(self, index: int, alert: Dict[str, Any]) -> str:
+        if self._children.is_resolved(alert):
+            return "resolved"
+        if self._report(PHASE_PASS2, index):
+            return "final"
+        if self._report(PHASE_PASS1, index):
+            return "draft"
+        return "investigating" if index < len(self._alerts) and self._phase == PHASE_PASS1 else "pending"
+
+    def _add_usage(self, usage: Dict[str, int]) -> None:
+        for key, value in usage.items():
+            self._usage[key] = self._usage.get(key, 0) + value
+
+    def _take_pending_alerts(self) -> bool:
+        """Moves the alerts added by signal into the incident. Returns whether there were any."""
+        pending, self._pending_alerts = self._pending_alerts, []
+        self._alerts.extend(pending)
+        if pending:
+            upsert_incident_attributes(alert_updates(self._alerts))
+        return bool(pending)
+
+    def _next_state(self, state: IncidentCorrelationState, phase: str, **changes: Any) -> IncidentCorrelationState:
+        """State for the next phase of the current round."""
+        return dataclasses.replace(
+            state,
+            phase=phase,
+            pending_alerts=self._pending_alerts,
+            resolved_fingerprints=sorted(self._children.resolved),
+            events=self._events,
+            usage=self._usage,
+            **changes,
+        )
 
-    async def _run_final_correlation(self, final_rcas: List[str], alert_count: int) -> str:
-        """Runs the final correlation step on the corrected RCAs."""
+    def _pass2_indexes(self, correlated_count: int) -> List[int]:
+        """Alerts needing Pass 2: all alerts in the first round, new and overlapping alerts afterwards."""
+        if correlated_count == 0:
+            return list(range(len(self._alerts)))
+        new_alerts = self._alerts[correlated_count:]
+        overlapping = overlapping_alerts(self._alerts[:correlated_count], new_alerts)
+        workflow.logger.info(
+            f"{len(new_alerts)} new alerts overlap with {len(overlapping)} already investigated alerts"
+        )
+        return overlapping + list(range(correlated_count, len(self._alerts)))
+
+    async def _run_pass(
+        self, phase: str, indexes: List[int], id_prefix: str, draft_rcas: Optional[List[str]] = None
+    ) -> List[str]:
+        """Runs one pass for the given alerts, directly for small sets or through shard workflows for large ones."""
+        alerts = [self._alerts[i] for i in indexes]
+        draft_rcas = draft_rcas or []
+        if len(alerts) <= MAX_ALERTS_PER_SHARD:
+            return await self._children.run(phase, alerts, indexes, id_prefix, draft_rcas)
+
+        shard_workflows = []
+        for start in range(0, len(alerts), MAX_ALERTS_PER_SHARD):
+            shard = RcaShardInput(
+                phase=phase,
+                alerts=alerts[start:start + MAX_ALERTS_PER_SHARD],
+                indexes=indexes[start:start + MAX_ALERTS_PER_SHARD],
+                id_prefix=id_prefix,
+                draft_rcas=draft_rcas,
+                resolved_fingerprints=sorted(self._children.resolved),
+            )
+            shard_workflows.append(self._children.run_shard(shard, f"{id_prefix}-{phase}-shard-{shard.indexes[0]}"))
+        workflow.logger.info(f"Split {phase} into {len(shard_workflows)} shards of up to {MAX_ALERTS_PER_SHARD} alerts")
+
+        results: List[List[str]] = await asyncio.gather(*shard_workflows)
+        return [rca for shard_rcas in results for rca in shard_rcas]
+
+    async def _run_final_correlation(
+        self,
+        final_rcas: List[str],
+        previous_report: Optional[str] = None,
+        updated_indexes: Optional[List[int]] = None,
+    ) -> str:
+        """Runs the final correlation step on the corrected RCAs.
+
+        When a previous report is given, only the reports of `updated_indexes` are sent
+        and the agent updates the previous report instead of starting from scratch.
+        Alerts that resolved during the investigation are only listed as transient.
+        """
         workflow.logger.info("--- Starting Final Correlation ---")
+        incremental = previous_report is not None and updated_indexes is not None
+        transient = [
+            i for i, alert in enumerate(self._alerts[:len(final_rcas)])
+            if self._children.is_resolved(alert) or _is_transient(final_rcas[i])
+        ]
+        indexes = [i for i in (updated_indexes if incremental else range(len(final_rcas))) if i not in transient]
+        alert_count = len(final_rcas) - len(transient)
+        transient_alerts = ", ".join(
+            f"{self._alerts[i].get('alertname', 'unknown')} ({self._alerts[i].get('fingerprint', '-')})"
+            for i in transient
+        ) or "None"
+        if transient:
+            workflow.logger.info(f"Leaving {len(transient)} resolved alerts out of the correlation")
+
         # Format the final reports for the prompt
         final_rca_reports = []
-        for i, rca_str in enumerate(final_rcas):
-            try:
-                rca_json = json.loads(rca_str)
+        for i in indexes:
+            rca_str = final_rcas[i]
+            rca_json = parse_report(rca_str)
+            if rca_json is not None:
                 final_rca_reports.append(f"RCA Report {i+1}:\n{json.dumps(rca_json, indent=2)}")
-            except (json.JSONDecodeError, TypeError):
+            else:
                 final_rca_reports.append(f"RCA Report {i+1} (Raw):\n{rca_str}")
-        
-        mcp_servers = _load_mcp_servers()
+
+        mcp_servers = load_mcp_servers()
         correlation_agent = Agent(
             name="FinalCorrelationAnalyst",
-            instructions="You are a lead SRE creating the final incident report from a set of cross-validated RCAs.",
-            model="gemini/gemini-2.5-pro",
+            instructions=CORRELATION_INSTRUCTIONS,
             mcp_servers=mcp_servers,
         )
-        # For simplicity, reusing a prompt template fragment. A dedicated one would be cleaner.
-        result = await Runner.run(correlation_agent, input=CORRELATION_PROMPT_TEMPLATE.format(
-            final_rca_reports="\n\n".join(final_rca_reports),
-            alert_count=alert_count
-        ))
-        return result.final_output
+        if incremental:
+            workflow.logger.info(f"Updating the previous correlation with {len(final_rca_reports)} RCA reports")
+            prompt = CORRELATION_UPDATE_INPUT.format(
+                previous_report=previous_report,
+                updated_rca_reports="\n\n".join(final_rca_reports),
+                alert_count=alert_count,
+                transient_alerts=transient_alerts,
+            )
+        else:
+            prompt = CORRELATION_INPUT.format(
+                final_rca_reports="\n\n".join(final_rca_reports),
+                alert_count=alert_count,
+                transient_alerts=transient_alerts,
+            )
+        usage = Usage()
+        report = await run_with_escalation(
+            correlation_agent, STAGE_CORRELATION, prompt, required_fields=CORRELATION_REQUIRED_FIELDS, usage=usage
+        )
+        self._add_usage(_usage_dict(usage))
+        return report
+
+
+class _RcaChildren:
+    """Runs RCA child workflows and cancels those of alerts that resolve while they run.
+
+    Used by both the orchestrator and the shard workflows. Alerts resolved before
+    their child starts are not investigated at all.
+    """
+
+    def __init__(self, incident_workflow_id: str, resolved_fingerprints: Sequence[str] = ()) -> None:
+        self.incident_workflow_id = incident_workflow_id
+        self.resolved: Set[str] = set(resolved_fingerprints)
+        self._running: Dict[str, List[workflow.ChildWorkflowHandle]] = {}
+        self._shards: List[workflow.ChildWorkflowHandle] = []
+
+    def is_resolved(self, alert: Dict[str, Any]) -> bool:
+        """Whether the alert resolved during the investigation."""
+        return alert.get("fingerprint") in self.resolved
+
+    async def resolve(self, fingerprints: List[str]) -> None:
+        """Marks alerts as resolved, cancelling their running child workflows and forwarding to shards."""
+        new = [fp for fp in fingerprints if fp and fp not in self.resolved]
+        self.resolved.update(new)
+        for fingerprint in new:
+            for handle in self._running.pop(fingerprint, []):
+                if not handle.done():
+                    workflow.logger.info(f"Alert {fingerprint} resolved, cancelling {handle.id}")
+                    handle.cancel()
+
+        running_shards = [shard for shard in self._shards if not shard.done()]
+        if new and running_shards:
+            # A shard may complete before the signal is delivered
+            await asyncio.gather(
+                *(shard.signal(RcaShardWorkflow.resolve_alerts, new) for shard in running_shards),
+                return_exceptions=True,
+            )
+
+    async def run(
+        self,
+        phase: str,
+        alerts: List[Dict[str, Any]],
+        indexes: List[int],
+        id_prefix: str,
+        draft_rcas: List[str],
+    ) -> List[str]:
+        """Runs the RCA child workflows of one pass for a set of alerts, in parallel.
+
+        Args:
+            phase: PHASE_PASS1 or PHASE_PASS2
+            alerts: The alerts to investigate
+            indexes: Index of each alert in the incident, used for child workflow IDs and Pass 2 context
+            id_prefix: Workflow ID prefix of the child workflows
+            draft_rcas: All Pass 1 drafts of the incident (Pass 2 only)
+
+        Returns:
+            The reports in the order of `alerts`, with a transient report for resolved alerts
+        """
+        # Children report completed RCAs to the incident workflow (see _report_completion)
+        memo = {
+            "mcp_servers": workflow.memo_value("mcp_servers", default=[]),
+            "incident_workflow_id": self.incident_workflow_id,
+            **routing_memo(),
+        }
+        active = [(i, alert) for i, alert in zip(indexes, alerts) if not self.is_resolved(alert)]
+
+        starts = []
+        for i, alert in active:
+            if phase == PHASE_PASS1:
+                starts.append(
+                    workflow.start_child_workflow(
+                        InitialRcaWorkflow.run,
+                        args=[alert],
+                        id=f"{id_prefix}-pass1-{i}",
+                        task_queue=alert_task_queue(alert),
+                        memo={**memo, **mcp_queue_memo(alert_task_queue(alert)), "alert_index": i},
+                    )
+                )
+            else:
+                # Prepare context: all other draft RCAs (excluding this agent's own draft and resolved alerts)
+                all_other_context = "\n---\n".join(
+                    rca for j, rca in enumerate(draft_rcas) if i != j and not _is_transient(rca)
+                )
+                starts.append(
+                    workflow.start_child_workflow(
+                        CorrectiveRcaWorkflow.run,
+                        args=[alert, draft_rcas[i], all_other_context],
+                        id=f"{id_prefix}-pass2-{i}",
+                        task_queue=alert_task_queue(alert),
+                        memo={**memo, **mcp_queue_memo(alert_task_queue(alert)), "alert_index": i},
+                    )
+                )
+        handles = await asyncio.gather(*starts)
+
+        results = {}
+        for (i, alert), handle in zip(active, handles):
+            fingerprint = alert.get("fingerprint")
+            if fingerprint:
+                self._running.setdefault(fingerprint, []).append(handle)
+            # The alert may have resolved while the child was starting
+            if self.is_resolved(alert):
+                handle.cancel()
+            results[i] = self._result(alert, handle)
+
+        reports = await asyncio.gather(*results.values())
+        by_index = dict(zip(results.keys(), reports))
+        return [by_index[i] if i in by_index else _transient_report(alert) for i, alert in zip(indexes, alerts)]
+
+    async def run_shard(self, shard: "RcaShardInput", workflow_id: str) -> List[str]:
+        """Runs a shard workflow, forwarding resolved alerts to it while it runs."""
+        handle = await workflow.start_child_workflow(
+            RcaShardWorkflow.run,
+            shard,
+            id=workflow_id,
+            task_queue=workflow.info().task_queue,
+            memo={
+                "mcp_servers": workflow.memo_value("mcp_servers", default=[]),
+                "incident_workflow_id": self.incident_workflow_id,
+                **routing_memo(),
+                **mcp_queue_memo(workflow.info().task_queue),
+            },
+        )
+        self._shards.append(handle)
+        return await handle
+
+    async def _result(self, alert: Dict[str, Any], handle: workflow.ChildWorkflowHandle) -> str:
+        try:
+            return await handle
+        except (ChildWorkflowError, asyncio.CancelledError):
+            if not self.is_resolved(alert):
+                raise
+            workflow.logger.info(f"RCA for resolved alert {alert.get('alertname', 'unknown')} cancelled")
+            return _transient_report(alert)
+
+
+async def _report_completion(phase: str, report: str, usage: Usage) -> None:
+    """Reports a completed RCA and its token usage to the incident workflow that started it, if any."""
+    incident_workflow_id = workflow.memo_value("incident_workflow_id", default=None)
+    if incident_workflow_id is None:
+        return
+    completion = RcaCompletion(
+        phase=phase,
+        index=workflow.memo_value("alert_index", default=0),
+        report=report,
+        usage=_usage_dict(usage),
+    )
+    try:
+        await workflow.get_external_workflow_handle(incident_workflow_id).signal(
+            IncidentCorrelationWorkflow.rca_completed, completion
+        )
+    except Exception as e:
+        # Progress reporting must never fail the RCA itself
+        workflow.logger.warning(f"Failed to report {phase} RCA to {incident_workflow_id}: {e}")
+
+
+def _usage_dict(usage: Usage) -> Dict[str, int]:
+    return {
+        "requests": usage.requests,
+        "input_tokens": usage.input_tokens,
+        "output_tokens": usage.output_tokens,
+        "total_tokens": usage.total_tokens,
+    }
+
+
+def _transient_report(alert: Dict[str, Any]) -> str:
+    """Report standing in for the RCA of an alert that resolved during the investigation."""
+    return json.dumps({
+        "alert_name": alert.get("alertname", "unknown"),
+        "fingerprint": alert.get("fingerprint", ""),
+        "transient": True,
+        "root_cause_summary": "Alert resolved during the investigation, RCA cancelled.",
+    })
+
+
+def _is_transient(report: str) -> bool:
+    parsed = parse_report(report)
+    return bool(parsed and parsed.get("transient"))
+
 
 # Util for formatting a single alert summary
 def _format_alert_summary(alert: Dict[str, Any]) -> str:
@@ -277,13 +886,9 @@ def _format_alert_summary(alert: Dict[str, Any]) -> str:
         summary_lines.append(f"- **Summary:** {annotations['summary']}")
     return "\n".join(summary_lines)
 
-# Final Correlation Prompt (for reuse in final step)
-CORRELATION_PROMPT_TEMPLATE = """You are a lead SRE creating the final incident report. You have received a set of high-quality, cross-validated RCA reports from your team. Your task is to group them into incidents based on causal relationships.
-
-**Final RCA Reports:**
-{final_rca_reports}
+# Instructions for the final correlation step
+CORRELATION_INSTRUCTIONS = """You are a lead SRE creating the final incident report. You have received a set of high-quality, cross-validated RCA reports from your team in the input. Your task is to group them into incidents based on causal relationships.
 
----
 ## Your Task
 1.  **Examine Each Alert Individually:** Review the `affected_resource`, `infrastructure_placement`, `is_symptom`, `caused_by_alert`, and `caused_by_resource` fields for each report.
 2.  **Identify Causal Chains:**
@@ -300,14 +905,23 @@ CORRELATION_PROMPT_TEMPLATE = """You are a lead SRE creating the final incident
     - For incidents with causal chains, use the `causal_chain` field to explicitly describe how the primary alert caused the secondary alerts, referencing specific resource identifiers and the infrastructure dependency.
     - For independent incidents, set `causal_chain: "Independent failure"`.
 
+## Incremental Updates
+If the input contains a previous incident report, new alerts have fired since it was written. Update that report with the new or updated RCA reports in the input instead of starting over:
+- Keep incidents that are not affected by the new or updated reports unchanged.
+- Add new alerts to an existing incident only if there is a causal relationship; otherwise create a new incident.
+- Always return the complete, updated report for all alerts.
+
+## Transient Alerts
+Alerts listed as transient resolved while they were being investigated and have no RCA report. Do not create incidents for them and do not count them in `total_alerts`. If a previous incident report includes them, remove them from it.
+
 ## Deliverable Format
 **CRITICAL**: Return ONLY valid JSON.
 
-{{
-  "total_alerts": {alert_count},
+{
+  "total_alerts": <Total number of alerts given in the input>,
   "total_incidents": <Number of distinct incidents - one per independent root cause>,
   "incidents": [
-    {{
+    {
       "incident_id": 1,
       "primary_alert": "The root cause alert (is_symptom: false)",
       "secondary_alerts": ["Alerts where caused_by_alert references the primary alert"],
@@ -319,7 +933,26 @@ CORRELATION_PROMPT_TEMPLATE = """You are a lead SRE creating the final incident
       "incident_severity": "...",
       "affected_services": [],
       "recommended_actions": ["Actions specific to THIS incident"]
-    }}
+    }
   ]
-}}
+}
+"""
+
+CORRELATION_INPUT = """**Total Alerts:** {alert_count}
+
+**Transient Alerts (resolved during the investigation, not analyzed):** {transient_alerts}
+
+**Final RCA Reports:**
+{final_rca_reports}
+"""
+
+CORRELATION_UPDATE_INPUT = """**Total Alerts:** {alert_count}
+
+**Transient Alerts (resolved during the investigation, not analyzed):** {transient_alerts}
+
+**Previous Incident Report:**
+{previous_report}
+
+**New or Updated RCA Reports:**
+{updated_rca_reports}
 """
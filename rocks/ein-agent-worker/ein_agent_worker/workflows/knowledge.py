@@ -0,0 +1,128 @@
+"""Workflow side of the RCA knowledge index (see ein_agent_worker.knowledge).
+
+The index lives on the worker, so workflows reach it through local activities.
+Lookups and recordings never fail an RCA: if the index is unavailable, the agent
+simply runs without prior knowledge.
+"""
+
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+import json
+
+from temporalio import workflow
+from temporalio.common import RetryPolicy
+from temporalio.exceptions import ActivityError
+
+from ein_agent_worker.workflows.routing import parse_report
+
+LOOKUP_ACTIVITY = "lookup_similar_rcas"
+RECORD_ACTIVITY = "record_rca"
+
+# `source` of Pass 1 reports reused from the index, see cached_pass1_report
+CACHE_SOURCE = "knowledge_cache"
+
+_TIMEOUT = timedelta(seconds=30)
+_RETRY_POLICY = RetryPolicy(maximum_attempts=2)
+
+
+@dataclass
+class KnowledgeMatch:
+    """A past final RCA similar to the alert under investigation.
+
+    Attributes:
+        alertname: Alert name of the past RCA
+        resource: Resource key of the past RCA (e.g. 'deployment:ns/name')
+        category: Root cause category of the past RCA
+        summary: Root cause summary of the past RCA
+        report: The past final RCA report (JSON)
+        score: Similarity between 0.0 and 1.0
+        age_hours: Hours since the past RCA was recorded
+    """
+
+    alertname: str
+    resource: str
+    category: str
+    summary: str
+    report: str
+    score: float
+    age_hours: float
+
+
+@dataclass
+class KnowledgeLookup:
+    """Result of a knowledge index lookup.
+
+    Attributes:
+        matches: The top-k similar past RCAs, most similar first
+        cached: Match close enough to be reused as the answer, if any
+    """
+
+    matches: List[KnowledgeMatch] = field(default_factory=list)
+    cached: Optional[KnowledgeMatch] = None
+
+
+async def lookup_similar_rcas(alert: Dict[str, Any]) -> KnowledgeLookup:
+    """Look up past RCAs similar to an alert. Returns an empty lookup on failure."""
+    try:
+        return await workflow.execute_local_activity(
+            LOOKUP_ACTIVITY,
+            alert,
+            result_type=KnowledgeLookup,
+            start_to_close_timeout=_TIMEOUT,
+            retry_policy=_RETRY_POLICY,
+        )
+    except ActivityError as e:
+        workflow.logger.warning(f"RCA knowledge lookup failed, continuing without it: {e.cause or e}")
+        return KnowledgeLookup()
+
+
+async def record_rca(alert: Dict[str, Any], report: str) -> None:
+    """Record a final RCA in the knowledge index. Failures are only logged."""
+    try:
+        await workflow.execute_local_activity(
+            RECORD_ACTIVITY,
+            args=[alert, report],
+            start_to_close_timeout=_TIMEOUT,
+            retry_policy=_RETRY_POLICY,
+        )
+    except ActivityError as e:
+        workflow.logger.warning(f"Recording the RCA in the knowledge index failed: {e.cause or e}")
+
+
+def format_similar_rcas(matches: List[KnowledgeMatch]) -> str:
+    """Format past RCAs as agent input."""
+    sections = []
+    for i, match in enumerate(matches, 1):
+        sections.append(
+            f"Past RCA {i} (similarity {match.score:.2f}, {match.age_hours:.0f}h ago, "
+            f"{match.alertname} on {match.resource or 'unknown resource'}, category: {match.category or 'unknown'}):\n"
+            f"{match.report}"
+        )
+    return "\n\n".join(sections)
+
+
+def cached_pass1_report(match: KnowledgeMatch, alert: Dict[str, Any]) -> str:
+    """Build a Pass 1 report for an alert from a past final RCA of the same resource."""
+    past = parse_report(match.report) or {}
+    return json.dumps({
+        "alert_name": alert.get("alertname", match.alertname),
+        "affected_resource": past.get("affected_resource"),
+        "infrastructure_placement": past.get("infrastructure_placement"),
+        "root_cause_category": match.category or None,
+        "root_cause_summary": past.get("root_cause_summary"),
+        "root_cause_details": (
+            f"Reused from a past RCA of the same resource ({match.age_hours:.0f}h ago, "
+            f"similarity {match.score:.2f}), not re-investigated. {past.get('root_cause_details', '')}"
+        ),
+        "is_likely_symptom": bool(past.get("is_symptom", False)),
+        "suspected_upstream_cause": past.get("caused_by_resource"),
+        "limitations": None,
+        "confidence": past.get("confidence"),
+        "source": CACHE_SOURCE,
+    }, indent=2)
+
+
+def is_cached_report(report: str) -> bool:
+    """Whether a Pass 1 report was reused from the index instead of investigated."""
+    return (parse_report(report) or {}).get("source") == CACHE_SOURCE
@@ -0,0 +1,98 @@
+"""MCP server references and alert-category tool profiles for agent workflows.
+
+Agents only need the tools relevant to the alert they investigate. Workflows
+classify each alert into a category from its labels and pass the category to the
+worker as the MCP server factory argument. The worker then exposes only the tools
+of the matching profile (see ``MCP_{SERVER}_PROFILE_{CATEGORY}_TOOLS``), so the
+tool schemas resent on every model call stay small.
+
+Server health is handled by the worker: while a server's circuit breaker is open
+(see ``ein_agent_worker.mcp_health``), its reference lists no tools, so agents
+created during the outage run without it instead of waiting on timeouts.
+
+MCP activities run on the task queue in the ``mcp_queue`` memo, written by the
+workflow starter (see ``ein_agent_worker.task_queues``), otherwise on the workflow's
+own queue. The memo, not the worker's environment, decides, so replays schedule
+the same activities whichever worker replays them.
+"""
+
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+from temporalio import workflow
+from temporalio.contrib import openai_agents
+
+MCP_QUEUE_MEMO_KEY = "mcp_queue"
+
+# Alert categories with their own tool profile
+CATEGORY_POD = "pod"
+CATEGORY_NODE = "node"
+CATEGORY_STORAGE = "storage"
+CATEGORY_GENERAL = "general"
+
+_STORAGE_LABELS = ("persistentvolumeclaim", "persistentvolume", "storageclass", "volume")
+_STORAGE_ALERT_KEYWORDS = ("volume", "disk", "filesystem", "storage")
+_POD_LABELS = ("pod", "container", "deployment", "statefulset", "daemonset", "replicaset", "job")
+_POD_ALERT_PREFIXES = ("kubepod", "kubecontainer", "kubedeployment", "kubestatefulset", "kubedaemonset", "kubejob")
+_NODE_ALERT_PREFIXES = ("kubenode", "node", "kubelet")
+
+
+def classify_alert(alert: Dict[str, Any]) -> str:
+    """Classify an alert into a tool profile category from its name and labels."""
+    labels = alert.get("labels", {})
+    alertname = (alert.get("alertname") or labels.get("alertname") or "").lower()
+
+    if any(labels.get(key) for key in _STORAGE_LABELS) or any(k in alertname for k in _STORAGE_ALERT_KEYWORDS):
+        return CATEGORY_STORAGE
+    if alertname.startswith(_POD_ALERT_PREFIXES) or any(labels.get(key) for key in _POD_LABELS):
+        return CATEGORY_POD
+    if alertname.startswith(_NODE_ALERT_PREFIXES) or labels.get("node"):
+        return CATEGORY_NODE
+    return CATEGORY_GENERAL
+
+
+def mcp_activity_config() -> Dict[str, Any]:
+    """Activity options of MCP calls: the stateless reference defaults, on the MCP task queue."""
+    config: Dict[str, Any] = {"start_to_close_timeout": timedelta(minutes=1)}
+    task_queue = workflow.memo_value(MCP_QUEUE_MEMO_KEY, default=None)
+    if task_queue:
+        config["task_queue"] = task_queue
+    return config
+
+
+def mcp_queue_memo(child_task_queue: str) -> Dict[str, Any]:
+    """The MCP queue memo to pass to a child workflow running on `child_task_queue`.
+
+    Children routed to another queue (e.g. a cluster's worker pool) run their MCP
+    activities on their own queue, served by that pool.
+    """
+    task_queue = workflow.memo_value(MCP_QUEUE_MEMO_KEY, default=None)
+    if task_queue and child_task_queue == workflow.info().task_queue:
+        return {MCP_QUEUE_MEMO_KEY: task_queue}
+    return {}
+
+
+def load_mcp_servers(tool_profile: Optional[str] = None) -> List[Any]:
+    """Load MCP servers from workflow memo.
+
+    Args:
+        tool_profile: Optional alert category whose tool profile the worker should apply
+
+    Returns:
+        List of stateless MCP server references
+    """
+    factory_argument = {"tool_profile": tool_profile} if tool_profile else None
+    config = mcp_activity_config()
+
+    mcp_servers = []
+    for name in workflow.memo_value("mcp_servers", default=[]):
+        try:
+            # The tool list does not change during a run, so avoid a list-tools activity per turn
+            mcp_servers.append(
+                openai_agents.workflow.stateless_mcp_server(
+                    name, config=config, cache_tools_list=True, factory_argument=factory_argument
+                )
+            )
+        except Exception as e:
+            workflow.logger.warning(f"Failed to load MCP server '{name}': {e}")
+    return mcp_servers
@@ -0,0 +1,41 @@
+"""Workflow side of the rule-based RCA pre-classifier (see ein_agent_worker.preclassifier).
+
+Pod alerts are first checked against the known failure signatures of
+docs/failure-cases/kubepodnotready-rca-spec.md. A match produces the Pass 1 report
+directly, without running the agent. The pre-classifier never fails an RCA: on
+any error, the agent investigates as usual.
+"""
+
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+from temporalio import workflow
+from temporalio.common import RetryPolicy
+from temporalio.exceptions import ActivityError
+
+from ein_agent_worker.workflows.mcp_servers import CATEGORY_POD, mcp_activity_config
+
+PRECLASSIFY_ACTIVITY = "preclassify_alert"
+
+
+def can_preclassify(alert: Dict[str, Any], category: str) -> bool:
+    """Whether an alert names a single pod the pre-classifier can inspect."""
+    labels = alert.get("labels", {})
+    return category == CATEGORY_POD and bool(labels.get("pod")) and bool(labels.get("namespace"))
+
+
+async def preclassify(alert: Dict[str, Any]) -> Optional[str]:
+    """Pass 1 report of an alert matching a known failure signature, or None."""
+    try:
+        # Runs next to the MCP servers it calls
+        return await workflow.execute_activity(
+            PRECLASSIFY_ACTIVITY,
+            args=[alert, workflow.memo_value("mcp_servers", default=[])],
+            result_type=Optional[str],
+            task_queue=mcp_activity_config().get("task_queue"),
+            start_to_close_timeout=timedelta(seconds=60),
+            retry_policy=RetryPolicy(maximum_attempts=2),
+        )
+    except ActivityError as e:
+        workflow.logger.warning(f"RCA pre-classification failed, running the agent: {e.cause or e}")
+        return None
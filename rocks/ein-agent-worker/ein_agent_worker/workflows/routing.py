@@ -0,0 +1,172 @@
+"""Tiered model routing for agent workflows.
+
+Workflows never reference concrete model names. Each agent asks for a logical
+model reference made of a stage and a tier (e.g. ``ein/pass1/fast``) which the
+worker resolves from its environment (see ``ein_agent_worker.model_router``).
+
+Every stage runs on the fast tier first. The output is only re-run on the
+strong tier when it fails schema validation, reports ``limitations`` or has a
+self-reported ``confidence`` below ``CONFIDENCE_THRESHOLD``. Pass 1 reports are not
+escalated for ``limitations``: Pass 1 runs without the other alerts' context and is
+asked to note what it lacks, which Pass 2 resolves.
+
+Agents may request several tool calls in one turn (``parallel_tool_calls``). The
+runner executes them together, so independent MCP activities run concurrently,
+bounded per server by the worker (``MCP_{SERVER}_MAX_CONCURRENCY``).
+"""
+
+import json
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from temporalio import workflow
+from agents import Agent, ModelSettings, RunConfig, Runner, Usage
+
+from ein_agent_worker.workflows.compaction import compacting_run_config
+
+MODEL_REF_PREFIX = "ein"
+
+# Workflow stages that can be routed independently
+STAGE_PASS1 = "pass1"
+STAGE_PASS2 = "pass2"
+STAGE_CORRELATION = "correlation"
+STAGE_SINGLE_ALERT = "single_alert"
+
+# Model tiers, cheapest first
+TIER_FAST = "fast"
+TIER_STRONG = "strong"
+TIERS = (TIER_FAST, TIER_STRONG)
+
+# Reports with a self-reported confidence below this value are escalated
+CONFIDENCE_THRESHOLD = 0.6
+
+_UNSET_VALUES = ("", "null", "none", "n/a", "not applicable")
+
+
+def model_ref(stage: str, tier: str) -> str:
+    """Build the logical model reference for a stage and tier."""
+    return f"{MODEL_REF_PREFIX}/{stage}/{tier}"
+
+
+def parse_model_ref(model_name: Optional[str]) -> Optional[Tuple[str, str]]:
+    """Split a logical model reference into (stage, tier).
+
+    Returns None if the name is not a logical reference (e.g. a raw LiteLLM model name).
+    """
+    if not model_name:
+        return None
+    parts = model_name.split("/")
+    if len(parts) != 3 or parts[0] != MODEL_REF_PREFIX:
+        return None
+    return parts[1], parts[2]
+
+
+def parse_report(output: Any) -> Optional[Dict[str, Any]]:
+    """Parse a JSON report from agent output, tolerating markdown code fences."""
+    if isinstance(output, dict):
+        return output
+    if not isinstance(output, str):
+        return None
+    start = output.find("{")
+    end = output.rfind("}")
+    if start == -1 or end < start:
+        return None
+    try:
+        report = json.loads(output[start:end + 1])
+    except json.JSONDecodeError:
+        return None
+    return report if isinstance(report, dict) else None
+
+
+def _has_limitations(limitations: Any) -> bool:
+    """Whether a `limitations` value lists any, ignoring placeholders like "None identified." or []."""
+    if isinstance(limitations, (list, tuple)):
+        return any(_has_limitations(item) for item in limitations)
+    if isinstance(limitations, dict):
+        return any(_has_limitations(value) for value in limitations.values())
+    if limitations is None or limitations is False:
+        return False
+    text = str(limitations).strip().lower().rstrip(".!")
+    if text in _UNSET_VALUES or text.startswith("none"):
+        return False
+    # "No limitations", "No significant limitations identified", but not "No access to node logs"
+    return not (text.startswith("no ") and "limitation" in text)
+
+
+def escalation_reason(
+    output: Any,
+    required_fields: Optional[Sequence[str]],
+    escalate_on_limitations: bool = True,
+) -> Optional[str]:
+    """Return why an output should be escalated to a stronger model, or None if it is acceptable.
+
+    Args:
+        output: The agent's final output
+        required_fields: Fields the JSON report must contain. None disables schema validation.
+        escalate_on_limitations: Whether reported `limitations` make the output unacceptable
+    """
+    if not output or not str(output).strip():
+        return "empty output"
+    if required_fields is None:
+        return None
+
+    report = parse_report(output)
+    if report is None:
+        return "output is not a valid JSON report"
+
+    missing = [field for field in required_fields if field not in report]
+    if missing:
+        return f"report is missing fields: {', '.join(missing)}"
+
+    if escalate_on_limitations and _has_limitations(report.get("limitations")):
+        return "report lists limitations"
+
+    confidence = report.get("confidence")
+    if isinstance(confidence, (int, float)) and confidence < CONFIDENCE_THRESHOLD:
+        return f"confidence {confidence} below {CONFIDENCE_THRESHOLD}"
+
+    return None
+
+
+async def run_with_escalation(
+    agent: Agent,
+    stage: str,
+    input: str,
+    required_fields: Optional[Sequence[str]] = None,
+    run_config: Optional[RunConfig] = None,
+    usage: Optional[Usage] = None,
+    escalate_on_limitations: bool = True,
+) -> str:
+    """Run an agent on the fast tier and escalate to stronger tiers when the output is not acceptable.
+
+    Args:
+        agent: The agent to run. Its model is replaced with the routed model reference.
+        stage: Workflow stage used to resolve the model on the worker
+        input: The agent input
+        required_fields: Fields the JSON report must contain. None disables schema validation.
+        run_config: Optional run configuration passed to the runner (default: conversation compaction)
+        usage: Optional accumulator the token usage of all tiers that ran is added to
+        escalate_on_limitations: Whether reported `limitations` trigger escalation
+
+    Returns:
+        The final output of the last tier that ran
+    """
+    run_config = run_config or compacting_run_config()
+    # Let the model batch independent tool calls, unless the agent decided otherwise
+    model_settings = agent.model_settings
+    if model_settings.parallel_tool_calls is None:
+        model_settings = model_settings.resolve(ModelSettings(parallel_tool_calls=True))
+
+    output = None
+    for tier in TIERS:
+        routed_agent = agent.clone(model=model_ref(stage, tier), model_settings=model_settings)
+        result = await Runner.run(routed_agent, input=input, run_config=run_config)
+        output = result.final_output
+        if usage is not None:
+            usage.add(result.context_wrapper.usage)
+
+        reason = escalation_reason(output, required_fields, escalate_on_limitations)
+        if reason is None:
+            break
+        if tier != TIERS[-1]:
+            workflow.logger.info(f"Escalating {stage} from '{tier}' tier: {reason}")
+    return output
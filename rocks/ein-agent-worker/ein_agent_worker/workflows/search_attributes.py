@@ -0,0 +1,60 @@
+"""Search attributes indexing incident workflows for visibility queries.
+
+The CLI sets them when it starts an incident workflow, and the workflow keeps them
+up to date as alerts are added and once the correlation report is known, so past
+incidents can be listed and filtered without fetching their results.
+
+Keep in sync with ein_agent_cli/search_attributes.py.
+
+The attributes must be registered in the namespace first:
+    temporal operator search-attribute create --name EinAlertNames --type KeywordList
+    temporal operator search-attribute create --name EinFingerprints --type KeywordList
+    temporal operator search-attribute create --name EinSeverity --type Keyword
+    temporal operator search-attribute create --name EinCluster --type Keyword
+    temporal operator search-attribute create --name EinAlertCount --type Int
+    temporal operator search-attribute create --name EinIncidentCount --type Int
+
+Workflows only update them when they were set at start, so workflows started
+without search attributes (e.g. in an unprepared namespace) keep working.
+"""
+
+from typing import Any, Dict, List, Sequence
+
+from temporalio import workflow
+from temporalio.common import SearchAttributeKey, SearchAttributeUpdate
+
+ALERT_NAMES = SearchAttributeKey.for_keyword_list("EinAlertNames")
+FINGERPRINTS = SearchAttributeKey.for_keyword_list("EinFingerprints")
+SEVERITY = SearchAttributeKey.for_keyword("EinSeverity")
+CLUSTER = SearchAttributeKey.for_keyword("EinCluster")
+ALERT_COUNT = SearchAttributeKey.for_int("EinAlertCount")
+INCIDENT_COUNT = SearchAttributeKey.for_int("EinIncidentCount")
+
+# Most severe first
+SEVERITY_ORDER = ("critical", "error", "warning", "info", "none")
+
+
+def highest_severity(alerts: Sequence[Dict[str, Any]]) -> str:
+    """Most severe `severity` label of the alerts ('none' if no alert has a known one)."""
+    severities = {alert.get("labels", {}).get("severity", "none").lower() for alert in alerts}
+    return next((s for s in SEVERITY_ORDER if s in severities), "none")
+
+
+def alert_updates(alerts: Sequence[Dict[str, Any]]) -> List[SearchAttributeUpdate]:
+    """Search attribute updates describing the alerts of an incident."""
+    return [
+        ALERT_NAMES.value_set(sorted({alert.get("alertname", "unknown") for alert in alerts})),
+        FINGERPRINTS.value_set(sorted({alert["fingerprint"] for alert in alerts if alert.get("fingerprint")})),
+        SEVERITY.value_set(highest_severity(alerts)),
+        ALERT_COUNT.value_set(len(alerts)),
+    ]
+
+
+def upsert_incident_attributes(updates: List[SearchAttributeUpdate]) -> None:
+    """Upserts search attributes if the workflow was started with them.
+
+    Must be called from workflow code.
+    """
+    if workflow.info().typed_search_attributes.get(ALERT_COUNT) is None:
+        return
+    workflow.upsert_search_attributes(updates)
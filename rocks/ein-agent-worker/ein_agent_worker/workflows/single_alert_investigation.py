@@ -1,8 +1,10 @@
 """Single alert investigation workflow for RCA."""
 
 from temporalio import workflow
-from temporalio.contrib import openai_agents
-from agents import Agent, Runner
+from agents import Agent
+
+from ein_agent_worker.workflows.mcp_servers import load_mcp_servers
+from ein_agent_worker.workflows.routing import STAGE_SINGLE_ALERT, run_with_escalation
 
 
 # Agent instructions for single alert investigation
@@ -26,7 +28,7 @@ Investigation Principles:
 - Gather evidence from multiple sources (events, logs, metrics, traces)
 - Consider time ranges - incidents may be historical, not real-time
 - Perform READ-ONLY operations only - never modify infrastructure or application resources
-- Be thorough but efficient - prioritize high-signal data sources
+- Be thorough but efficient - prioritize high-signal data sources, and request independent tool calls in the same turn so they run in parallel
 - Adapt investigation approach based on alert type and available tools
 
 Output Requirements:
@@ -55,28 +57,16 @@ class SingleAlertInvestigationWorkflow:
             The agent's response
         """
         # Dynamically reference MCP servers that were registered with the worker
-        # Get the list of configured servers from workflow memo
-        mcp_server_names = workflow.memo_value("mcp_servers", default=[])
-
-        mcp_servers = []
-        if mcp_server_names:
-            for mcp_server_name in mcp_server_names:
-                try:
-                    # Reference the MCP server by name (case-sensitive)
-                    server = openai_agents.workflow.stateless_mcp_server(mcp_server_name)
-                    mcp_servers.append(server)
-                    workflow.logger.info("Loaded MCP server: %s", mcp_server_name)
-                except Exception as e:
-                    workflow.logger.warning("Failed to load MCP server '%s': %s", mcp_server_name, e)
+        # The prompt is free-form, so the agent gets every tool (no alert category profile)
+        mcp_servers = load_mcp_servers()
 
         agent = Agent(
             name="Assistant",
             instructions=AGENT_INSTRUCTIONS,
-            # model="gemini/gemini-2.5-pro",
-            model="gemini/gemini-2.5-flash",
             mcp_servers=mcp_servers,
         )
 
-        result = await Runner.run(agent, input=prompt)
+        # Free-form report, so only empty output is escalated to the strong tier
+        output = await run_with_escalation(agent, STAGE_SINGLE_ALERT, prompt)
         workflow.logger.info("SingleAlertInvestigationWorkflow completed")
-        return result.final_output
+        return output
@@ -0,0 +1,43 @@
+"""Alert topology used to decide which RCAs are affected by newly arrived alerts.
+
+An alert's topology is the set of Kubernetes resources named in its labels.
+Namespaced resources are qualified by namespace, so two pods with the same name
+in different namespaces do not overlap. The namespace alone is deliberately not
+part of the topology, as most alerts of a cluster share a handful of namespaces.
+"""
+
+from typing import Any, Dict, FrozenSet, List, Sequence, Tuple
+
+_CLUSTER_RESOURCE_LABELS = ("node", "instance", "persistentvolume", "storageclass")
+_NAMESPACED_RESOURCE_LABELS = (
+    "pod",
+    "deployment",
+    "statefulset",
+    "daemonset",
+    "replicaset",
+    "job",
+    "service",
+    "persistentvolumeclaim",
+)
+
+
+def alert_topology(alert: Dict[str, Any]) -> FrozenSet[Tuple[str, str]]:
+    """Return the set of (resource kind, name) an alert refers to."""
+    labels = alert.get("labels", {})
+    namespace = labels.get("namespace", "")
+    resources = set()
+    for key in _CLUSTER_RESOURCE_LABELS:
+        if labels.get(key):
+            resources.add((key, labels[key]))
+    for key in _NAMESPACED_RESOURCE_LABELS:
+        if labels.get(key):
+            resources.add((key, f"{namespace}/{labels[key]}"))
+    return frozenset(resources)
+
+
+def overlapping_alerts(alerts: Sequence[Dict[str, Any]], new_alerts: Sequence[Dict[str, Any]]) -> List[int]:
+    """Return the indexes of the alerts sharing a resource with any of the new alerts."""
+    new_resources = set()
+    for alert in new_alerts:
+        new_resources |= alert_topology(alert)
+    return [i for i, alert in enumerate(alerts) if alert_topology(alert) & new_resources]
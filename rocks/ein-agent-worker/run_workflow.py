@@ -1,5 +1,6 @@
 from temporallib.client import Client, Options
 import asyncio
+import os
 
 async def main():
     client_opt = Options(
@@ -77,13 +78,17 @@ For each affected pod, provide a clear root cause analysis with:
 Provide a summary at the end with the total number of affected pods and common patterns if any.
 """
 
+    memo = {"mcp_servers": enabled_server_names}
+    if os.getenv("TEMPORAL_MCP_QUEUE"):
+        memo["mcp_queue"] = os.getenv("TEMPORAL_MCP_QUEUE")
+
     await client.execute_workflow(
         workflow_name,
         # prompt,
         "please tell me a joke",
         id=workflow_id,
         task_queue="ein-agent-queue",
-        memo={"mcp_servers": enabled_server_names},
+        memo=memo,
     )
 
 
@@ -0,0 +1,116 @@
+"""Import-time profile of the Ein Agent worker.
+
+Reports two costs:
+
+- startup: modules imported when the worker starts (`python -X importtime`),
+  summed per top-level package.
+- workflow: modules the workflow sandbox re-imports for every workflow run,
+  i.e. on the first workflow task of each run. Third-party modules listed here
+  are candidates for SANDBOX_PASSTHROUGH_MODULES in ein_agent_worker.worker.
+
+Usage (from rocks/ein-agent-worker):
+    PYTHONPATH=. python scripts/profile_imports.py [--top 15]
+"""
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+
+def profile_startup(top: int) -> None:
+    """Print the import time of the worker module, per top-level package."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import ein_agent_worker.worker"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    per_package: Dict[str, int] = defaultdict(int)
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        per_package[name.strip().split(".")[0]] += int(self_us)
+        total += int(self_us)
+
+    print(f"Worker startup imports: {total / 1e6:.2f}s")
+    for package, micros in sorted(per_package.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {micros / 1e6:8.3f}s  {package}")
+
+
+def profile_workflows(top: int) -> None:
+    """Print the modules the sandbox imports for a run of each workflow."""
+    from temporalio import workflow
+    from temporalio.worker.workflow_sandbox import SandboxedWorkflowRunner, SandboxRestrictions, _importer
+
+    from ein_agent_worker.worker import (
+        SANDBOX_PASSTHROUGH_MODULES,
+        CorrectiveRcaWorkflow,
+        IncidentCorrelationWorkflow,
+        InitialRcaWorkflow,
+        RcaShardWorkflow,
+        SingleAlertInvestigationWorkflow,
+    )
+
+    # Same restrictions as the worker, plus the passthrough the agents plugin adds
+    runner = SandboxedWorkflowRunner(
+        restrictions=SandboxRestrictions.default.with_passthrough_modules(*SANDBOX_PASSTHROUGH_MODULES, "mcp"),
+    )
+
+    imports: List[Tuple[float, str]] = []
+    original_import = _importer.Importer._import
+
+    def timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        full_name = _importer._resolve_module_name(name, globals, level)
+        fresh = full_name not in sys.modules
+        started = time.perf_counter()
+        try:
+            return original_import(self, name, globals, locals, fromlist, level)
+        finally:
+            if fresh:
+                imports.append((time.perf_counter() - started, full_name))
+
+    _importer.Importer._import = timed_import
+
+    async def prepare_all() -> None:
+        for workflow_class in (
+            IncidentCorrelationWorkflow,
+            RcaShardWorkflow,
+            InitialRcaWorkflow,
+            CorrectiveRcaWorkflow,
+            SingleAlertInvestigationWorkflow,
+        ):
+            imports.clear()
+            started = time.perf_counter()
+            runner.prepare_workflow(workflow._Definition.must_from_class(workflow_class))
+            elapsed = time.perf_counter() - started
+            third_party = sorted({name.split(".")[0] for _, name in imports} - {"ein_agent_worker", "temporalio"})
+            print(f"{workflow_class.__name__}: {elapsed * 1000:.1f}ms, {len(imports)} module(s) re-imported per run")
+            for seconds, name in sorted(imports, reverse=True)[:top]:
+                print(f"  {seconds * 1000:8.1f}ms  {name}")
+            if third_party:
+                print(f"  passthrough candidates: {', '.join(third_party)}")
+
+    try:
+        asyncio.run(prepare_all())
+    finally:
+        _importer.Importer._import = original_import
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--top", type=int, default=15, help="Entries shown per section")
+    args = parser.parse_args()
+
+    profile_startup(args.top)
+    print()
+    profile_workflows(args.top)
+
+
+if __name__ == "__main__":
+    main()